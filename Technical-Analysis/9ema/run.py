@@ -1,23 +1,29 @@
 import ccxt
 import pandas as pd
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from marketdata.candle_store import store as candle_store
+from indicators import kernels
 
 def calculate_ema(series, period=9):
-    return series.ewm(span=period, adjust=False).mean()
+    return kernels.ema(series.to_numpy(dtype=float), period)
 
 def get_ohlcv_df(exchange, symbol, timeframe='1d', limit=100):
-    data = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-    if not data:
+    df = candle_store.ohlcv(exchange, symbol, timeframe, limit=limit)
+    if df.empty:
         return pd.DataFrame()
-    df = pd.DataFrame(data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df = df.rename(columns={'ts': 'timestamp'})
     df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
     df.set_index('timestamp', inplace=True)
     return df
 
 def get_trend_strength_and_direction(df, short_ema=9, long_ema=21):
     # Calculate short and long EMAs for trend determination.
-    df['short_ema'] = df['close'].ewm(span=short_ema, adjust=False).mean()
-    df['long_ema'] = df['close'].ewm(span=long_ema, adjust=False).mean()
+    df['short_ema'] = calculate_ema(df['close'], short_ema)
+    df['long_ema'] = calculate_ema(df['close'], long_ema)
     latest_short = df.iloc[-1]['short_ema']
     latest_long = df.iloc[-1]['long_ema']
     if latest_short > latest_long:
@@ -18,13 +18,17 @@ WEIGHTS = dict(A=w_vals[0], B=w_vals[1], C=w_vals[2], D=w_vals[3])
 
 
 # ---------- SET-UP ----------
-import ccxt, pandas as pd, numpy as np, datetime as dt, requests, math
+import ccxt, pandas as pd, numpy as np, datetime as dt, requests, math, sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from marketdata.candle_store import store as candle_store
+from indicators import kernels
 exch = ccxt.kraken({'enableRateLimit': True})
 
-# ---------- EMA helper (pure pandas) ----------
+# ---------- EMA helper (NumPy kernel) ----------
 def ema(series, length):
-    """Exponential Moving Average via pandas; TA-Lib not required."""
-    return series.ewm(span=length, adjust=False).mean()
+    """Exponential Moving Average (pandas ewm adjust=False definition); TA-Lib not required."""
+    return pd.Series(kernels.ema(series.to_numpy(dtype=float), length), index=series.index)
 
 # ---------- HELPERS ----------
 STABLES = {'USDT', 'USDC', 'FDUSD', 'DAI', 'BUSD', 'TUSD'}
@@ -44,11 +48,11 @@ def top_volume_pairs(limit=10):
 
 
 def ohlcv_df(sym, since_ms):
-    data = exch.fetch_ohlcv(sym, TF, since=since_ms)
-    if not data or len(data) == 0:
+    df = candle_store.ohlcv(exch, sym, TF, since=since_ms)
+    if df.empty:
         # Return empty DataFrame with expected columns if no data
         return pd.DataFrame(columns=['ts', 'open', 'high', 'low', 'close', 'vol'])
-    df = pd.DataFrame(data, columns=['ts', 'open', 'high', 'low', 'close', 'vol'])
+    df = df.rename(columns={'volume': 'vol'})
     df['ts'] = pd.to_datetime(df['ts'], unit='ms', utc=True)
     return df
 
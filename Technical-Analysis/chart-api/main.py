@@ -1,6 +1,27 @@
 #!/usr/bin/env python3
+"""
+Render chart-img TradingView charts to PNG files.
+
+    python main.py                                        # TOKEN on 1h, 4h, 1D
+    python main.py --watchlist coins.txt --intervals 1h 4h 1D --concurrency 8
+
+A watchlist has one symbol per line ("WLD" means BINANCE:WLDUSDT, anything
+with a ":" is used as is; "#" starts a comment). Charts are rendered
+concurrently on one pooled keep-alive session. A rate-limit response pauses
+every worker for the full Retry-After the API sends; 5xx and connection
+errors are retried with backoff. Charts already saved during the current
+candle are skipped unless --force is given.
+
+A single-symbol run without --watchlist keeps the original file names
+(chart-1h.png, chart-4h.png, chart-1d.png); watchlist runs write
+chart-<EXCHANGE>_<SYMBOL>-<interval>.png so symbols do not overwrite each other.
+"""
 from dotenv import load_dotenv
-import os, sys, requests
+import argparse, calendar, os, random, sys, threading, time, requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 
 # ─── Load .env ────────────────────────────────────────────────────────────────
 load_dotenv()  # pip install python-dotenv
@@ -11,11 +32,14 @@ if not API_KEY:
 
 # ─── Config ───────────────────────────────────────────────────────────────────
 TOKEN = "WLD"
-intervals = {
-    "1h": {"symbol": f"BINANCE:{TOKEN}USDT", "interval": "1h"},
-    "4h": {"symbol": f"BINANCE:{TOKEN}USDT", "interval": "4h"},
-    "1d": {"symbol": f"BINANCE:{TOKEN}USDT", "interval": "1D"},
-}
+INTERVALS = ["1h", "4h", "1D"]
+CONCURRENCY = 8          # charts rendered at once
+MAX_ATTEMPTS = 4         # per chart, for rate limits, 5xx and connection errors
+BACKOFF_SEC = 2.0        # first retry wait when the API gives no Retry-After
+BACKOFF_MAX_SEC = 30.0   # cap for backoff; a Retry-After from the API is honoured in full
+API_URL = "https://api.chart-img.com/v2/tradingview/advanced-chart"
+LEGACY_NAMES = {"1D": "1d"}    # single-symbol file names, as before batch mode
+INTERVAL_SEC = {"m": 60, "h": 3600, "D": 86400, "d": 86400, "W": 7 * 86400, "w": 7 * 86400}
 
 COMMON = {
     "width": 800,
@@ -61,25 +85,175 @@ COMMON = {
 }
 
 OUT_DIR = "charts"
-os.makedirs(OUT_DIR, exist_ok=True)
 
-def fetch_and_save(name, params):
-    url = "https://api.chart-img.com/v2/tradingview/advanced-chart"
-    headers = {
-        "x-api-key": API_KEY,
-        "Content-Type": "application/json",
-    }
-    payload = {**COMMON, **params}
-    resp = requests.post(url, headers=headers, json=payload, timeout=15)
-    resp.raise_for_status()
-    path = os.path.join(OUT_DIR, f"chart-{name}.png")
-    with open(path, "wb") as f:
-        f.write(resp.content)
-    print(f"✅ {name} → {path}")
+
+def to_symbol(entry: str) -> str:
+    entry = entry.strip().upper()
+    return entry if ":" in entry else f"BINANCE:{entry}USDT"
+
+
+def read_watchlist(path: str) -> list:
+    symbols = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                symbols.append(to_symbol(line))
+    return list(dict.fromkeys(symbols))
+
+
+def chart_path(out_dir: str, symbol: str, interval: str, legacy: bool = False) -> str:
+    if legacy:
+        return os.path.join(out_dir, f"chart-{LEGACY_NAMES.get(interval, interval)}.png")
+    return os.path.join(out_dir, f"chart-{symbol.replace(':', '_')}-{interval}.png")
+
+
+def next_close(interval: str, ts: float) -> float:
+    """Epoch seconds at which the `interval` candle containing `ts` closes (UTC sessions)."""
+    count, unit = int(interval[:-1] or 1), interval[-1]
+    if unit == "M":
+        dt = datetime.fromtimestamp(ts, timezone.utc)
+        month = dt.year * 12 + dt.month - 1 + count
+        return float(calendar.timegm((month // 12, month % 12 + 1, 1, 0, 0, 0)))
+    step = count * INTERVAL_SEC[unit]
+    offset = 4 * 86400 if unit in "Ww" else 0     # the epoch was a Thursday; weeks start on Monday
+    return (ts - offset) // step * step + step + offset
+
+
+def is_current(path: str, interval: str) -> bool:
+    """True if `path` was written during the candle that is open now."""
+    try:
+        return next_close(interval, os.path.getmtime(path)) > time.time()
+    except OSError:
+        return False
+
+
+def retry_after(resp: requests.Response):
+    """Seconds the API asks us to wait (delta or HTTP date), or None."""
+    value = resp.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_SEC * 2 ** attempt))
+
+
+class ChartRenderer:
+    """
+    Renders charts on a shared keep-alive session. A 429 from any worker
+    pauses all of them until the API's Retry-After has passed, so the
+    workers do not keep hitting the limit one after another.
+    """
+    def __init__(self, concurrency: int = CONCURRENCY):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.headers = {
+            "x-api-key": API_KEY,
+            "Content-Type": "application/json",
+        }
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+
+    def _wait_turn(self):
+        # loop, as another worker may extend the pause while this one sleeps
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _pause(self, seconds: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+            self.rate_limited += 1
+
+    def render(self, symbol: str, interval: str) -> bytes:
+        payload = {**COMMON, "symbol": symbol, "interval": interval}
+        for attempt in range(MAX_ATTEMPTS):
+            self._wait_turn()
+            last = attempt == MAX_ATTEMPTS - 1
+            try:
+                resp = self.session.post(API_URL, headers=self.headers, json=payload, timeout=(5, 15))
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+                time.sleep(backoff(attempt))
+                continue
+            if resp.status_code == 429 and not last:
+                wait = retry_after(resp)
+                self._pause(wait if wait is not None else backoff(attempt))
+                continue
+            if resp.status_code >= 500 and not last:
+                time.sleep(backoff(attempt))
+                continue
+            resp.raise_for_status()
+            return resp.content
+
+    def save(self, symbol: str, interval: str, path: str) -> str:
+        data = self.render(symbol, interval)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return path
+
+
+def render_batch(symbols, intervals, out_dir: str = OUT_DIR, concurrency: int = CONCURRENCY,
+                 force: bool = False, legacy_names: bool = False) -> int:
+    """Render every symbol × interval; returns the number of failed charts."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(s, i, chart_path(out_dir, s, i, legacy_names)) for s in symbols for i in intervals]
+    todo = [job for job in jobs if force or not is_current(job[2], job[1])]
+    skipped = len(jobs) - len(todo)
+    renderer = ChartRenderer(concurrency)
+    failed = 0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(renderer.save, s, i, path): (s, i) for s, i, path in todo}
+        for future in as_completed(futures):
+            symbol, interval = futures[future]
+            try:
+                print(f"✅ {symbol} {interval} → {future.result()}")
+            except requests.HTTPError as e:
+                failed += 1
+                print(f"❌ {symbol} {interval} failed: {e} – {e.response.text}", file=sys.stderr)
+            except (requests.RequestException, OSError) as e:
+                failed += 1
+                print(f"❌ {symbol} {interval} failed: {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    rendered = len(todo) - failed
+    print(f"{rendered} rendered, {skipped} already current, {failed} failed in {elapsed:.1f}s "
+          f"({rendered / elapsed if elapsed > 0 else 0:.1f} charts/s, "
+          f"{renderer.rate_limited} rate-limit pauses)")
+    return failed
+
 
 if __name__ == "__main__":
-    for name, p in intervals.items():
-        try:
-            fetch_and_save(name, p)
-        except requests.HTTPError as e:
-            print(f"❌ {name} failed: {e} – {e.response.text}", file=sys.stderr)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watchlist", "-w", help="file with one symbol per line (default: TOKEN)")
+    parser.add_argument("--intervals", "-i", nargs="+", default=INTERVALS, help="e.g. 1h 4h 1D")
+    parser.add_argument("--concurrency", "-c", type=int, default=CONCURRENCY)
+    parser.add_argument("--out-dir", "-o", default=OUT_DIR)
+    parser.add_argument("--force", action="store_true", help="re-render charts already saved this candle")
+    args = parser.parse_args()
+    for interval in args.intervals:
+        if interval[-1] not in INTERVAL_SEC and interval[-1] != "M":
+            parser.error(f"unknown interval {interval!r}")
+
+    symbols = read_watchlist(args.watchlist) if args.watchlist else [to_symbol(TOKEN)]
+    failed = render_batch(symbols, args.intervals, args.out_dir, args.concurrency, args.force,
+                          legacy_names=not args.watchlist)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Equivalence check and timing of indicators/kernels.py against the pandas
+(and, when installed, pandas_ta) code the tools used before.
+
+    python indicators/benchmark.py                  # 1k, 10k, 100k, 1M bars
+    python indicators/benchmark.py --sizes 1000 5000 --repeat 5
+
+Each kernel is compared with its reference on a random-walk series; the run
+exits non-zero if any differs by more than --rtol.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from indicators import kernels
+from indicators.streaming import RSI
+
+try:
+    import pandas_ta as ta
+except ImportError:      # the pandas reproductions below stand in for it
+    ta = None
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+SIZES        = (1_000, 10_000, 100_000, 1_000_000)
+REPEAT       = 3
+RTOL         = 1e-9
+LOOP_MAX     = 100_000     # the per-candle Python RSI reference is skipped above this
+
+
+# ── pandas references (the definitions the tools relied on) ────────────────
+def pd_ema(close: pd.Series, n: int) -> pd.Series:
+    return close.ewm(span=n, adjust=False).mean()
+
+def pd_ema_sma_seed(close: pd.Series, n: int) -> pd.Series:
+    if ta is not None:
+        return ta.ema(close, length=n)
+    seeded = close.copy()
+    seeded.iloc[:n - 1] = np.nan
+    seeded.iloc[n - 1] = close.iloc[:n].mean()
+    return seeded.ewm(span=n, adjust=False).mean()
+
+def pd_rma(x: pd.Series, n: int) -> pd.Series:
+    return x.ewm(alpha=1.0 / n, adjust=True, min_periods=n).mean()
+
+def pd_stochrsi_k(close: pd.Series, n: int = 14) -> pd.Series:
+    if ta is not None:
+        return ta.stochrsi(close, length=n, rsi_length=n, k=3, d=3).iloc[:, 0]
+    delta = close.diff()
+    up, down = pd_rma(delta.clip(lower=0), n), pd_rma(-delta.clip(upper=0), n)
+    r = 100 * up / (up + down)
+    lo, hi = r.rolling(n).min(), r.rolling(n).max()
+    span = (hi - lo).replace(0, kernels.EPS)
+    return (100 * (r - lo) / span).rolling(3).mean()
+
+def pd_atr(df: pd.DataFrame, n: int = 14) -> pd.Series:
+    if ta is not None:
+        return ta.atr(df["high"], df["low"], df["close"], length=n)
+    prev = df["close"].shift(1)
+    hl = (df["high"] - df["low"]).replace(0, kernels.EPS)
+    tr = pd.concat([hl, (df["high"] - prev).abs(), (prev - df["low"]).abs()], axis=1).max(axis=1)
+    tr.iloc[0] = np.nan
+    return pd_rma(tr.iloc[1:], n).reindex(df.index)
+
+def loop_rsi(close: np.ndarray, n: int = 14) -> np.ndarray:
+    """Per-candle Wilder RSI, as rsi.compute_rsi used to run."""
+    rsi, out = RSI(n), np.full(len(close), np.nan)
+    for i, c in enumerate(close.tolist()):
+        value = rsi.update(c)
+        out[i] = np.nan if value is None else value
+    return out
+
+
+def random_walk(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    return pd.DataFrame({"high": close + spread, "low": close - spread, "close": close})
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0, result
+
+
+def max_rel_diff(a, b) -> float:
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if not np.array_equal(np.isnan(a), np.isnan(b)):
+        return float("inf")
+    ok = ~np.isnan(a)
+    if not ok.any():
+        return 0.0
+    # relative to the series' scale, so values crossing zero do not blow it up
+    return float(np.max(np.abs(a[ok] - b[ok])) / max(np.max(np.abs(b[ok])), 1e-12))
+
+
+def cases(df: pd.DataFrame):
+    """(name, kernel call, reference call, reference label) for one series."""
+    close, arr = df["close"], df["close"].to_numpy()
+    high, low = df["high"].to_numpy(), df["low"].to_numpy()
+    label = "pandas_ta" if ta is not None else "pandas"
+    yield "ema(9)",        lambda: kernels.ema(arr, 9),                  lambda: pd_ema(close, 9),            "pandas"
+    yield "ema(200)",      lambda: kernels.ema(arr, 200),                lambda: pd_ema(close, 200),          "pandas"
+    yield "ema(200, sma)", lambda: kernels.ema(arr, 200, sma_seed=True), lambda: pd_ema_sma_seed(close, 200), label
+    yield "rma(14)",       lambda: kernels.rma(arr, 14),                 lambda: pd_rma(close, 14),           "pandas"
+    yield "stochrsi(14)",  lambda: kernels.stochrsi(arr)[0],             lambda: pd_stochrsi_k(close),        label
+    yield "atr(14)",       lambda: kernels.atr(high, low, arr),          lambda: pd_atr(df),                  label
+    if len(df) <= LOOP_MAX:
+        yield "rsi(14)",   lambda: kernels.rsi(arr),                     lambda: loop_rsi(arr),               "loop"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--rtol", type=float, default=RTOL)
+    args = parser.parse_args()
+
+    print(f"{'bars':>9}  {'indicator':<14} {'kernel ms':>10} {'ref ms':>10} {'speedup':>8}  {'max rel diff':>12}  ref")
+    failed = False
+    for n in args.sizes:
+        df = random_walk(n)
+        for name, kernel, reference, label in cases(df):
+            k_ms, k_out = timed(kernel, args.repeat)
+            r_ms, r_out = timed(reference, args.repeat)
+            diff = max_rel_diff(k_out, r_out)
+            failed |= diff > args.rtol
+            flag = "" if diff <= args.rtol else "  MISMATCH"
+            print(f"{n:>9}  {name:<14} {k_ms:>10.2f} {r_ms:>10.2f} {r_ms / k_ms:>7.1f}x  {diff:>12.2e}  {label}{flag}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
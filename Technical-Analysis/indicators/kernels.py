@@ -0,0 +1,204 @@
+"""
+Vectorized indicator kernels on contiguous float64 arrays.
+
+Same definitions as indicators/streaming.py, computed over whole series at
+once without building DataFrames:
+
+    ema(x, n)                 pandas  x.ewm(span=n, adjust=False).mean()
+    ema(x, n, sma_seed=True)  pandas_ta  ta.ema(x, length=n)
+    rma(x, n)                 pandas_ta  ta.rma(x, length=n)
+    rsi(close, n)             Wilder RSI seeded with a simple mean (TradingView)
+    stochrsi(close, ...)      pandas_ta  ta.stochrsi(close, n, n, 3, 3) → (k, d)
+    atr(high, low, close, n)  pandas_ta  ta.atr(high, low, close, length=n)
+
+Every function returns an array as long as its input, NaN while warming up.
+The exponential recursions are evaluated in closed form per block (see
+_linear_filter), so there is no per-element Python loop.
+perp-scanner/tests/test_indicator_kernels.py checks them against pandas,
+rsi.compute_rsi and indicators/streaming.py; `python -m indicators.benchmark`
+times them.
+"""
+import sys
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+EPS = sys.float_info.epsilon   # pandas_ta's non_zero_range nudge
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+BLOCK_GROWTH = 1e8    # largest decay**-k allowed inside one block; bounds the rounding error
+
+
+def _f64(x) -> np.ndarray:
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def _linear_filter(x: np.ndarray, decay: float, gain: float = 1.0, init: float = 0.0) -> np.ndarray:
+    """
+    y[t] = decay * y[t-1] + gain * x[t], with y[-1] = init.
+
+    The series is cut into blocks short enough that decay**-len stays below
+    BLOCK_GROWTH; within a block y is a scaled cumulative sum, and each
+    block's start value is the previous block's end carried over with
+    decay**len (≤ 1/BLOCK_GROWTH), so only a few carry terms are significant.
+    """
+    n = len(x)
+    if n == 0 or decay == 0.0:
+        return gain * x
+    block = int(min(n, max(1.0, np.log(BLOCK_GROWTH) / -np.log(decay))))
+    nblocks = -(-n // block)
+    local = np.zeros(nblocks * block)
+    local[:n] = x
+    local = local.reshape(nblocks, block)
+
+    powers = decay ** np.arange(1, block + 1)               # decay**1 .. decay**block
+    local /= powers
+    np.cumsum(local, axis=1, out=local)
+    local *= powers * gain
+
+    # end of block b = sum_j factor**j * (local end of block b-j), with
+    # factor = decay**block; lags beyond EPS**2 cannot change a float64
+    ends, factor = local[:, -1], powers[-1]
+    carry, term = ends.copy(), ends
+    for _ in range(min(nblocks, _decay_span(factor, nblocks)) - 1):
+        term = np.concatenate(([0.0], term[:-1])) * factor
+        carry += term
+    local[1:] += powers * carry[:-1, None]
+
+    y = local.ravel()[:n]
+    if init:
+        head = _decay_span(decay, n)
+        y[:head] += init * decay ** np.arange(1, head + 1)
+    return y
+
+
+def _decay_span(decay: float, n: int) -> int:
+    """How many of decay**1 .. decay**n are still above EPS**2 (the rest cannot matter)."""
+    if decay <= 0.0:
+        return 0
+    return min(n, int(np.ceil(2 * np.log(EPS) / np.log(decay))) + 1)
+
+
+def sma(x, length: int) -> np.ndarray:
+    """Simple moving average over `length`; NaN until full or while a NaN is in the window."""
+    x = _f64(x)
+    out = np.full(len(x), np.nan)
+    if len(x) >= length:
+        out[length - 1:] = sliding_window_view(x, length).sum(axis=1) / length
+    return out
+
+
+def _rolling(x: np.ndarray, length: int, op) -> np.ndarray:
+    """
+    Rolling min/max (op = np.minimum / np.maximum) over `length`: windows are
+    doubled in log2(length) passes, then two overlapping ones cover `length`.
+    A NaN anywhere in the window gives NaN, as pandas does with a full window.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < length:
+        return out
+    span, acc = 1, x                      # acc[i] = op over x[i : i + span]
+    while span * 2 <= length:
+        acc = op(acc[:-span], acc[span:])
+        span *= 2
+    out[length - 1:] = op(acc[:n - length + 1], acc[length - span:n - span + 1])
+    return out
+
+
+def ema(x, length: int, sma_seed: bool = False) -> np.ndarray:
+    """
+    Exponential moving average, alpha = 2 / (length + 1). By default the first
+    value is the first input (pandas ewm adjust=False); with sma_seed=True the
+    first length-1 values are NaN and the seed is the mean of the first
+    `length` inputs (pandas_ta).
+    """
+    x = _f64(x)
+    alpha = 2.0 / (length + 1)
+    if not sma_seed:
+        return _linear_filter(x, 1.0 - alpha, alpha, init=x[0]) if len(x) else x.copy()
+    out = np.full(len(x), np.nan)
+    if len(x) >= length:
+        seed = x[:length].mean()
+        out[length - 1] = seed
+        out[length:] = _linear_filter(x[length:], 1.0 - alpha, alpha, init=seed)
+    return out
+
+
+def rma(x, length: int) -> np.ndarray:
+    """
+    Wilder moving average as pandas_ta computes it:
+    ewm(alpha=1/length, adjust=True, min_periods=length), i.e. a decayed sum
+    over the decayed weight sum.
+    """
+    x = _f64(x)
+    decay = 1.0 - 1.0 / length
+    # decayed weight sum (1 - decay**t) / (1 - decay), constant once decay**t vanishes
+    weights = np.full(len(x), 1.0 / (1.0 - decay))
+    head = _decay_span(decay, len(x))
+    weights[:head] = (1.0 - decay ** np.arange(1, head + 1)) / (1.0 - decay)
+    out = _linear_filter(x, decay) / weights
+    out[:length - 1] = np.nan
+    return out
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI as rsi.compute_rsi / TradingView: the first average gain/loss
+    is the simple mean of the first `period` deltas, then
+    avg = (avg * (period - 1) + x) / period. 100 where there are no losses.
+    """
+    close = _f64(close)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    delta = np.diff(close)
+    gain, loss = np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
+    decay = (period - 1) / period
+    avg_gain = np.empty(len(delta) - period + 1)
+    avg_loss = np.empty_like(avg_gain)
+    avg_gain[0] = gain[:period].sum() / period
+    avg_loss[0] = loss[:period].sum() / period
+    avg_gain[1:] = _linear_filter(gain[period:], decay, 1.0 / period, init=avg_gain[0])
+    avg_loss[1:] = _linear_filter(loss[period:], decay, 1.0 / period, init=avg_loss[0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[period:] = np.where(avg_loss == 0, 100.0, value)
+    return out
+
+
+def stochrsi(close, length: int = 14, rsi_length: int = 14, k: int = 3, d: int = 3):
+    """
+    pandas_ta stochrsi: RSI from RMA-smoothed gains/losses, stochastic of the
+    RSI over `length`, then SMA(k) and SMA(d). Returns the (k, d) arrays.
+    """
+    close = _f64(close)
+    nan = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return nan, nan.copy()
+    delta = np.diff(close)
+    up = rma(np.maximum(delta, 0.0), rsi_length)
+    down = rma(np.maximum(-delta, 0.0), rsi_length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.concatenate(([np.nan], 100.0 * up / (up + down)))
+        lo, hi = _rolling(r, length, np.minimum), _rolling(r, length, np.maximum)
+        span = hi - lo
+        stoch = 100.0 * (r - lo) / np.where(span == 0, EPS, span)
+    stoch_k = sma(stoch, k)
+    return stoch_k, sma(stoch_k, d)
+
+
+def atr(high, low, close, length: int = 14) -> np.ndarray:
+    """
+    pandas_ta atr (mamode="rma"): true range against the previous close,
+    smoothed with RMA; the first candle has no previous close.
+    """
+    high, low, close = _f64(high), _f64(low), _f64(close)
+    out = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return out
+    prev, h, l = close[:-1], high[1:], low[1:]
+    hl = h - l
+    tr = np.maximum.reduce([np.where(hl == 0, EPS, hl), np.abs(h - prev), np.abs(prev - l)])
+    out[1:] = rma(tr, length)
+    return out
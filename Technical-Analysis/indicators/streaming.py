@@ -0,0 +1,239 @@
+"""
+Stateful streaming indicators: seed from history once, then update in
+constant time per candle.
+
+Each indicator reproduces the batch definition the tools already use:
+
+    EMA(n)              pandas  close.ewm(span=n, adjust=False).mean()      (9ema, bounce)
+    EMA(n, sma_seed=True)  pandas_ta  ta.ema(close, length=n)               (scanner)
+    RSI(n)              Wilder RSI seeded with a simple mean, as compute_rsi / TradingView
+    StochRSI(n, n, 3, 3)   pandas_ta  ta.stochrsi(close, n, n, 3, 3)        (scanner)
+    ATR(n)              pandas_ta  ta.atr(high, low, close, length=n)       (scanner)
+
+`update()` consumes one closed candle and returns the new value (None while
+warming up). `peek()` returns what the value would be for a still-open
+candle without changing the state. `to_dict()` / `from_dict()` round-trip
+the state through JSON-safe dicts, so it can be stored next to the candles.
+"""
+import sys
+from collections import deque
+
+EPS = sys.float_info.epsilon   # pandas_ta's non_zero_range nudge
+
+
+class StreamingIndicator:
+    """Base class: serialization and peek() on top of update()."""
+    kind = None
+
+    def update(self, *candle):
+        raise NotImplementedError
+
+    def seed(self, *series):
+        """Feed a history of closed candles (one sequence per update() argument)."""
+        value = None
+        for candle in zip(*series):
+            value = self.update(*candle)
+        return value
+
+    def peek(self, *candle):
+        """Value for a candle that has not closed yet; the state is left untouched."""
+        return self.from_dict(self.to_dict()).update(*candle)
+
+    def to_dict(self) -> dict:
+        state = {"kind": self.kind}
+        for key, value in vars(self).items():
+            if isinstance(value, StreamingIndicator):
+                value = value.to_dict()
+            elif isinstance(value, deque):
+                value = {"deque": list(value), "maxlen": value.maxlen}
+            state[key] = value
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        kind = INDICATORS[state["kind"]]
+        obj = kind.__new__(kind)
+        for key, value in state.items():
+            if key == "kind":
+                continue
+            if isinstance(value, dict) and "kind" in value:
+                value = StreamingIndicator.from_dict(value)
+            elif isinstance(value, dict) and "deque" in value:
+                value = deque(value["deque"], maxlen=value["maxlen"])
+            setattr(obj, key, value)
+        return obj
+
+
+class EMA(StreamingIndicator):
+    """
+    Exponential moving average, alpha = 2 / (length + 1).
+    Default seeding follows pandas ewm(adjust=False): the first value is the
+    first input. With sma_seed=True it follows pandas_ta: None for the first
+    length-1 inputs, then the simple mean of the first `length` as the seed.
+    """
+    kind = "ema"
+
+    def __init__(self, length: int, sma_seed: bool = False):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.sma_seed = sma_seed
+        self.count = 0
+        self.total = 0.0
+        self.value = None
+
+    def update(self, x: float):
+        self.count += 1
+        if self.value is not None:
+            self.value += self.alpha * (x - self.value)
+        elif not self.sma_seed:
+            self.value = x
+        else:
+            self.total += x
+            if self.count == self.length:
+                self.value = self.total / self.length
+        return self.value
+
+
+class RMA(StreamingIndicator):
+    """
+    Wilder moving average as pandas_ta computes it:
+    ewm(alpha=1/length, adjust=True, min_periods=length). The adjusted mean is
+    kept as a decayed weighted sum over a decayed weight sum, so each step is O(1).
+    """
+    kind = "rma"
+
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.num = 0.0
+        self.den = 0.0
+        self.count = 0
+
+    def update(self, x: float):
+        self.num = self.num * self.decay + x
+        self.den = self.den * self.decay + 1.0
+        self.count += 1
+        return self.num / self.den if self.count >= self.length else None
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average over the last `length` inputs; None until full."""
+    kind = "sma"
+
+    def __init__(self, length: int):
+        self.length = length
+        self.window = deque(maxlen=length)
+        self.total = 0.0
+
+    def update(self, x: float):
+        if len(self.window) == self.length:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        return self.total / self.length if len(self.window) == self.length else None
+
+
+class RSI(StreamingIndicator):
+    """
+    Wilder RSI as in rsi.compute_rsi (and TradingView): the first average
+    gain/loss is the simple mean of the first `period` deltas, after which
+    avg = (avg * (period - 1) + x) / period. Available once `period` deltas
+    have been seen; 100 when there have been no losses.
+    """
+    kind = "rsi"
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.n = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, close: float):
+        if self.prev is None:
+            self.prev = close
+            return None
+        delta = close - self.prev
+        self.prev = close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.n += 1
+        if self.n <= self.period:
+            # accumulate the simple-mean seed
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            if self.n < self.period:
+                return None
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        return self.value
+
+    @property
+    def value(self):
+        if self.n < self.period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class StochRSI(StreamingIndicator):
+    """
+    pandas_ta stochrsi: RSI from RMA-smoothed gains/losses, stochastic of the
+    RSI over `length`, then SMA(k) and SMA(d). update() returns (k, d), with
+    None for components still warming up.
+    """
+    kind = "stochrsi"
+
+    def __init__(self, length: int = 14, rsi_length: int = 14, k: int = 3, d: int = 3):
+        self.prev = None
+        self.gain = RMA(rsi_length)
+        self.loss = RMA(rsi_length)
+        self.rsi_window = deque(maxlen=length)
+        self.k = SMA(k)
+        self.d = SMA(d)
+
+    def update(self, close: float):
+        if self.prev is None:
+            self.prev = close
+            return None, None
+        delta = close - self.prev
+        self.prev = close
+        up = self.gain.update(max(delta, 0.0))
+        down = self.loss.update(max(-delta, 0.0))
+        if up is None or up + down == 0:
+            return None, None
+        rsi = 100.0 * up / (up + down)
+
+        self.rsi_window.append(rsi)
+        if len(self.rsi_window) < self.rsi_window.maxlen:
+            return None, None
+        lo, hi = min(self.rsi_window), max(self.rsi_window)
+        stoch = 100.0 * (rsi - lo) / ((hi - lo) or EPS)
+
+        k = self.k.update(stoch)
+        d = self.d.update(k) if k is not None else None
+        return k, d
+
+
+class ATR(StreamingIndicator):
+    """
+    pandas_ta atr (mamode="rma"): true range against the previous close,
+    smoothed with RMA. The first candle has no previous close and is skipped,
+    as in the batch version.
+    """
+    kind = "atr"
+
+    def __init__(self, length: int = 14):
+        self.prev_close = None
+        self.rma = RMA(length)
+
+    def update(self, high: float, low: float, close: float):
+        prev, self.prev_close = self.prev_close, close
+        if prev is None:
+            return None
+        tr = max((high - low) or EPS, abs(high - prev), abs(prev - low))
+        return self.rma.update(tr)
+
+
+INDICATORS = {cls.kind: cls for cls in (EMA, RMA, SMA, RSI, StochRSI, ATR)}
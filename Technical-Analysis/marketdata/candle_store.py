@@ -0,0 +1,203 @@
+"""
+Shared on-disk OHLCV store for the Technical-Analysis tools.
+
+Candles are kept in one SQLite file keyed by (exchange, symbol, timeframe, ts).
+`ohlcv()` tops a series up from the exchange, fetching only candles at or
+after the last stored one (that candle may still have been open), and then
+serves the requested window from disk, so repeat scans cost one small request
+per symbol instead of the full history.
+
+    from marketdata.candle_store import store
+    df = store.ohlcv(exchange, "BTC/USD", "1h", limit=500)       # pandas
+    a  = store.arrays(exchange.id, "BTC/USD", "1h", limit=500)   # NumPy columns
+
+Tools outside this directory add Technical-Analysis/ to sys.path to import it.
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+STORE_PATH       = Path(os.getenv("CANDLE_STORE_PATH", Path.home() / "Total" / ".candles" / "ohlcv.sqlite"))
+REFRESH_MIN_SEC  = 10       # a series synced this recently is served without touching the network
+PAGE_LIMIT       = 720      # candles per incremental request (Kraken's OHLC page size)
+MAX_PAGES        = 20       # stop paging a stale series after this many requests
+COLUMNS          = ["ts", "open", "high", "low", "close", "volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    exchange  TEXT    NOT NULL,
+    symbol    TEXT    NOT NULL,
+    timeframe TEXT    NOT NULL,
+    ts        INTEGER NOT NULL,
+    open      REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (exchange, symbol, timeframe, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS series (
+    exchange    TEXT    NOT NULL,
+    symbol      TEXT    NOT NULL,
+    timeframe   TEXT    NOT NULL,
+    covered_from INTEGER NOT NULL,   -- earliest ts a full fetch has asked the exchange for
+    synced_at   REAL    NOT NULL,    -- wall-clock time of the last sync
+    PRIMARY KEY (exchange, symbol, timeframe)
+) WITHOUT ROWID;
+"""
+
+
+class CandleStore:
+    """
+    SQLite-backed OHLCV store. One connection per thread, WAL journal, so the
+    tools' thread pools can sync different symbols concurrently.
+    """
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._key_locks_guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    # ── reads ────────────────────────────────────────────────────────────────
+    def bounds(self, exchange_id: str, symbol: str, timeframe: str):
+        """(first_ts, last_ts, count) of a stored series; Nones and 0 when empty."""
+        return self._conn().execute(
+            "SELECT MIN(ts), MAX(ts), COUNT(*) FROM candles WHERE exchange=? AND symbol=? AND timeframe=?",
+            (exchange_id, symbol, timeframe),
+        ).fetchone()
+
+    def arrays(self, exchange_id: str, symbol: str, timeframe: str,
+               limit: int = None, since: int = None) -> dict:
+        """
+        Stored candles as {"ts": int64[], "open": float64[], ...}, oldest first.
+        `since` (ms) keeps candles at or after it; `limit` keeps the newest N.
+        """
+        sql = ("SELECT ts, open, high, low, close, volume FROM candles "
+               "WHERE exchange=? AND symbol=? AND timeframe=? AND ts>=? ORDER BY ts DESC")
+        args = [exchange_id, symbol, timeframe, since or 0]
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        rows = self._conn().execute(sql, args).fetchall()[::-1]
+        data = np.array(rows, dtype=float).reshape(-1, len(COLUMNS))
+        out = {"ts": data[:, 0].astype(np.int64)}
+        for i, col in enumerate(COLUMNS[1:], start=1):
+            out[col] = data[:, i]
+        return out
+
+    def frame(self, exchange_id: str, symbol: str, timeframe: str,
+              limit: int = None, since: int = None) -> pd.DataFrame:
+        """Same as arrays() as a DataFrame with an integer-ms `ts` column."""
+        return pd.DataFrame(self.arrays(exchange_id, symbol, timeframe, limit, since), columns=COLUMNS)
+
+    # ── writes ───────────────────────────────────────────────────────────────
+    def upsert(self, exchange_id: str, symbol: str, timeframe: str, candles) -> int:
+        """Insert or replace ccxt-style [ts, o, h, l, c, v] rows; returns how many were written."""
+        rows = [(exchange_id, symbol, timeframe, int(c[0]), *c[1:6]) for c in candles]
+        if rows:
+            with self._conn() as conn:
+                conn.executemany("INSERT OR REPLACE INTO candles VALUES (?,?,?,?,?,?,?,?,?)", rows)
+        return len(rows)
+
+    def _mark_synced(self, exchange_id, symbol, timeframe, covered_from):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO series VALUES (?,?,?,?,?) ON CONFLICT(exchange, symbol, timeframe) "
+                "DO UPDATE SET covered_from=MIN(covered_from, excluded.covered_from), synced_at=excluded.synced_at",
+                (exchange_id, symbol, timeframe, covered_from, time.time()),
+            )
+
+    def _truncate_before(self, exchange_id, symbol, timeframe, ts: int):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM candles WHERE exchange=? AND symbol=? AND timeframe=? AND ts<?",
+                         (exchange_id, symbol, timeframe, ts))
+            conn.execute("UPDATE series SET covered_from=? WHERE exchange=? AND symbol=? AND timeframe=?",
+                         (ts, exchange_id, symbol, timeframe))
+
+    def _series(self, exchange_id, symbol, timeframe):
+        return self._conn().execute(
+            "SELECT covered_from, synced_at FROM series WHERE exchange=? AND symbol=? AND timeframe=?",
+            (exchange_id, symbol, timeframe),
+        ).fetchone()
+
+    # ── sync ─────────────────────────────────────────────────────────────────
+    def sync(self, exchange, symbol: str, timeframe: str, limit: int = None, since: int = None) -> int:
+        """
+        Bring the stored series up to date for a window of `limit` candles or
+        starting at `since` (ms). Returns the number of candles downloaded.
+
+        If the store already covers the window start, only candles from the
+        last stored one onwards are requested; otherwise the whole window is
+        fetched once and remembered, so young listings with short history are
+        not refetched on every call.
+        """
+        tf_ms = exchange.parse_timeframe(timeframe) * 1000
+        now_ms = int(time.time() * 1000)
+        if since is None:
+            since = (now_ms // tf_ms - (limit or PAGE_LIMIT) + 1) * tf_ms
+        key = (exchange.id, symbol, timeframe)
+
+        with self._key_lock(key):
+            series = self._series(*key)
+            first_ts, last_ts, _ = self.bounds(*key)
+            if series and series[0] <= since and last_ts is not None:
+                if time.time() - series[1] < REFRESH_MIN_SEC:
+                    return 0
+                fetched = self._fetch_from(exchange, symbol, timeframe, last_ts, tf_ms)
+                self._mark_synced(*key, series[0])
+                return fetched
+
+            candles = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+            self.upsert(*key, candles)
+            fetched = len(candles)
+            if candles and candles[-1][0] < now_ms - tf_ms:
+                # the window was longer than one response: page forward to now
+                fetched += self._fetch_from(exchange, symbol, timeframe, candles[-1][0], tf_ms)
+            self._mark_synced(*key, since)
+            return fetched
+
+    def _fetch_from(self, exchange, symbol, timeframe, start_ts: int, tf_ms: int) -> int:
+        """Page forward from `start_ts` (inclusive) until the open candle is stored."""
+        fetched = 0
+        for page in range(MAX_PAGES):
+            candles = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=start_ts, limit=PAGE_LIMIT)
+            if page == 0 and candles and candles[0][0] > start_ts + tf_ms:
+                # the exchange no longer serves candles that far back; drop the
+                # stored ones rather than keep a series with a hole in it
+                self._truncate_before(exchange.id, symbol, timeframe, candles[0][0])
+            self.upsert(exchange.id, symbol, timeframe, candles)
+            fetched += len(candles)
+            if not candles or candles[-1][0] <= start_ts or candles[-1][0] >= time.time() * 1000 - tf_ms:
+                break
+            start_ts = candles[-1][0]
+        return fetched
+
+    def ohlcv(self, exchange, symbol: str, timeframe: str, limit: int = None, since: int = None) -> pd.DataFrame:
+        """
+        sync() then frame(): the `limit` newest candles, or all from `since`,
+        as a DataFrame with columns ts (ms), open, high, low, close, volume.
+        """
+        self.sync(exchange, symbol, timeframe, limit=limit, since=since)
+        return self.frame(exchange.id, symbol, timeframe, limit=limit, since=since)
+
+
+# process-wide store, opened on first import
+store = CandleStore()
@@ -0,0 +1,152 @@
+"""
+Higher-timeframe candles derived locally from a finer stored series.
+
+Kraken (like most venues) builds its 4h and 1d bars from the same trades as
+its 1h bars, so once a series' history is in the candle store its new 4h/1d
+bars can be produced from the 1h sync instead of separate requests:
+
+    from marketdata.resample import ohlcv
+    df = ohlcv(exchange, "BTC/USD", "4h", limit=500)   # same frame as store.ohlcv()
+
+The first call for a series still fetches natively, because one 1h page does
+not reach back far enough for long higher-timeframe histories; that native
+fetch is also compared bar for bar with the 1h resample, and a series that
+does not match (other session boundaries, missing hours) keeps being fetched
+natively. After that only the 1h series touches the network.
+"""
+import threading
+import time
+
+import numpy as np
+
+from marketdata.candle_store import store as default_store, COLUMNS, REFRESH_MIN_SEC
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+RESAMPLE_FROM     = {"4h": "1h", "1d": "1h"}   # target timeframe → base it is derived from
+SESSION_OFFSET_MS = {"kraken": 0}             # where an exchange's 4h/1d bars start after UTC midnight
+VERIFY_BARS       = 24                         # closed bars compared against a native fetch
+PRICE_RTOL        = 1e-9
+VOLUME_RTOL       = 1e-6                       # volumes are summed, allow for float rounding
+
+# (exchange id, symbol, timeframe) → whether the 1h resample matched the native bars
+_verified = {}
+_verified_lock = threading.Lock()
+
+
+def resample(arrays: dict, base_ms: int, target_ms: int, offset_ms: int = 0, now_ms: int = None) -> dict:
+    """
+    Aggregate candle arrays ({"ts": ..., "open": ..., ...}, oldest first, one
+    row per `base_ms`) into `target_ms` bars starting at `offset_ms` past each
+    target boundary. Only bars built from every base candle are returned,
+    plus the still-open last bar, which has the base candles seen so far.
+    """
+    ts = np.asarray(arrays["ts"], dtype=np.int64)
+    if not len(ts):
+        return {col: np.asarray(arrays[col])[:0] for col in COLUMNS}
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    bucket = (ts - offset_ms) // target_ms * target_ms + offset_ms
+    starts, first, counts = np.unique(bucket, return_index=True, return_counts=True)
+    last = first + counts - 1
+
+    out = {
+        "ts":     starts,
+        "open":   np.asarray(arrays["open"], dtype=float)[first],
+        "high":   np.maximum.reduceat(np.asarray(arrays["high"], dtype=float), first),
+        "low":    np.minimum.reduceat(np.asarray(arrays["low"], dtype=float), first),
+        "close":  np.asarray(arrays["close"], dtype=float)[last],
+        "volume": np.add.reduceat(np.asarray(arrays["volume"], dtype=float), first),
+    }
+    is_open = starts + target_ms > now_ms
+    keep = (counts == target_ms // base_ms) | (is_open & (np.arange(len(starts)) == len(starts) - 1))
+    return {col: values[keep] for col, values in out.items()}
+
+
+def _matches(native: dict, derived: dict) -> bool:
+    """True when every closed native bar also present in `derived` is identical."""
+    common, ni, di = np.intersect1d(native["ts"], derived["ts"], return_indices=True)
+    if not len(common):
+        return False
+    ni, di = ni[-VERIFY_BARS:], di[-VERIFY_BARS:]
+    prices = all(np.allclose(native[c][ni], derived[c][di], rtol=PRICE_RTOL, atol=0)
+                 for c in ("open", "high", "low", "close"))
+    return prices and np.allclose(native["volume"][ni], derived["volume"][di], rtol=VOLUME_RTOL)
+
+
+def verify(exchange, symbol: str, timeframe: str, store=default_store) -> bool:
+    """
+    Compare the stored native `timeframe` bars with the resampled base series
+    (syncing the base first) and remember the result for ohlcv().
+    """
+    base = RESAMPLE_FROM[timeframe]
+    base_ms = exchange.parse_timeframe(base) * 1000
+    target_ms = exchange.parse_timeframe(timeframe) * 1000
+    now_ms = int(time.time() * 1000)
+
+    store.sync(exchange, symbol, base)
+    derived = resample(store.arrays(exchange.id, symbol, base), base_ms, target_ms,
+                       SESSION_OFFSET_MS.get(exchange.id, 0), now_ms)
+    native = store.arrays(exchange.id, symbol, timeframe, since=now_ms - (VERIFY_BARS + 1) * target_ms)
+    closed = native["ts"] + target_ms <= now_ms
+    ok = _matches({c: v[closed] for c, v in native.items()}, derived)
+    with _verified_lock:
+        _verified[(exchange.id, symbol, timeframe)] = ok
+    return ok
+
+
+def ohlcv(exchange, symbol: str, timeframe: str, limit: int = None, since: int = None, store=default_store):
+    """
+    Drop-in for CandleStore.ohlcv(): `timeframe` bars for `symbol`, with new
+    4h/1d bars derived from the 1h series once that has been verified, and
+    a native fetch whenever the stored history does not reach the window or
+    the 1h series cannot fill the gap since the last stored bar.
+    """
+    base = RESAMPLE_FROM.get(timeframe)
+    key = (exchange.id, symbol, timeframe)
+    if base is None or exchange.id not in SESSION_OFFSET_MS:
+        return store.ohlcv(exchange, symbol, timeframe, limit=limit, since=since)
+
+    target_ms = exchange.parse_timeframe(timeframe) * 1000
+    now_ms = int(time.time() * 1000)
+    window_from = since if since is not None else (now_ms // target_ms - (limit or 1) + 1) * target_ms
+    series = store._series(*key)
+    _, last_ts, _ = store.bounds(*key)
+    if not series or series[0] > window_from or last_ts is None:
+        # cold (or too short) history: only a native fetch can provide it
+        df = store.ohlcv(exchange, symbol, timeframe, limit=limit, since=since)
+        verify(exchange, symbol, timeframe, store)
+        return df
+
+    with _verified_lock:
+        ok = _verified.get(key)
+    if ok is None:
+        ok = verify(exchange, symbol, timeframe, store)
+    if not ok or not _derive_tail(exchange, symbol, timeframe, base, last_ts, series, store):
+        return store.ohlcv(exchange, symbol, timeframe, limit=limit, since=since)
+    return store.frame(exchange.id, symbol, timeframe, limit=limit, since=since)
+
+
+def _derive_tail(exchange, symbol, timeframe, base, last_ts, series, store) -> bool:
+    """
+    Rebuild the stored `timeframe` bars from `last_ts` (possibly still open
+    when stored) onwards out of the base series. False when the base series
+    does not reach back to `last_ts`, so the caller fetches natively.
+    """
+    if time.time() - series[1] < REFRESH_MIN_SEC:
+        return True
+    base_ms = exchange.parse_timeframe(base) * 1000
+    target_ms = exchange.parse_timeframe(timeframe) * 1000
+    offset = SESSION_OFFSET_MS[exchange.id]
+
+    store.sync(exchange, symbol, base, since=last_ts)
+    bars = store.arrays(exchange.id, symbol, base, since=last_ts)
+    if not len(bars["ts"]) or bars["ts"][0] != last_ts:
+        return False
+    derived = resample(bars, base_ms, target_ms, offset)
+    if not len(derived["ts"]) or derived["ts"][0] != last_ts:
+        return False
+    # a gap in the base series would leave the derived bars with a hole
+    if np.any(np.diff(derived["ts"]) != target_ms):
+        return False
+    store.upsert(exchange.id, symbol, timeframe, zip(*(derived[c].tolist() for c in COLUMNS)))
+    store._mark_synced(exchange.id, symbol, timeframe, series[0])
+    return True
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Kraken REST endpoints the scanners poll:
+
+    spot     GET /0/public/AssetPairs
+             GET /0/public/Ticker?pair=A,B,...
+    futures  GET /derivatives/api/v3/tickers
+             GET /derivatives/api/v3/tickers/{symbol}
+
+The universe size, response latency (plus jitter), and the share of 5xx
+errors and Kraken rate-limit responses are configurable, so scan cycles can
+be benchmarked and load-tested without touching the exchange.
+
+    python bench/fake_kraken.py --port 8811 --symbols 5000 --latency-ms 40
+    # then point service.scanners.SPOT_API_BASE / FUTURES_API_BASE at it:
+    #   http://127.0.0.1:8811/0/public   http://127.0.0.1:8811/derivatives/api/v3
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SPOT_PREFIX    = "/0/public"
+FUTURES_PREFIX = "/derivatives/api/v3"
+
+
+class FakeKraken:
+    """
+    Market state and responses for `symbols` USD pairs (spot C{i}/USD,
+    futures perpetual C{i}:USD). Prices drift slowly with wall-clock time so
+    consecutive scans see changing percentages.
+    """
+    def __init__(self, symbols: int = 1000, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: int = 1):
+        self.symbols = symbols
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+        base = random.Random(seed)
+        self.open = [base.uniform(0.01, 50_000) for _ in range(symbols)]
+        self.volume = [base.uniform(1e2, 1e7) for _ in range(symbols)]
+        self.phase = [base.uniform(0, 2 * math.pi) for _ in range(symbols)]
+        self.pairs = {
+            f"X{i}ZUSD": {"altname": f"C{i}USD", "wsname": f"C{i}/USD", "quote": "ZUSD", "status": "online"}
+            for i in range(symbols)
+        }
+        self.index = {code: i for i, code in enumerate(self.pairs)}
+
+    # ── market state ─────────────────────────────────────────────────────────
+    def last(self, i: int) -> float:
+        """Price of symbol i: up to ±25% around its open, drifting over minutes."""
+        return self.open[i] * (1 + 0.25 * math.sin(self.phase[i] + time.time() / 300))
+
+    def spot_ticker(self, i: int) -> dict:
+        o, c = self.open[i], self.last(i)
+        return {
+            "c": [f"{c:.8g}", "1"], "o": f"{o:.8g}",
+            "v": ["0", f"{self.volume[i]:.4f}"],
+            "h": ["0", f"{max(o, c) * 1.02:.8g}"], "l": ["0", f"{min(o, c) * 0.98:.8g}"],
+        }
+
+    def futures_ticker(self, i: int) -> dict:
+        o, c = self.open[i], self.last(i)
+        return {
+            "symbol": f"PF_C{i}USD", "tag": "perpetual", "pair": f"C{i}:USD",
+            "last": c, "change24h": (c - o) / o * 100, "vol24h": self.volume[i],
+            "high24h": max(o, c) * 1.005, "low24h": min(o, c) * 0.98,
+        }
+
+    # ── request handling ─────────────────────────────────────────────────────
+    def _roll(self):
+        """(status, body) for an injected failure, or None to answer normally."""
+        with self._lock:
+            self.requests += 1
+            r = self.rng.random()
+        if r < self.error_rate:
+            return 503, {"error": ["EService:Unavailable"]}
+        if r < self.error_rate + self.rate_limit_rate:
+            return 200, None
+        return None
+
+    def respond(self, path: str, query: dict):
+        """(status, JSON body) for one GET."""
+        delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+        failure = self._roll()
+        futures = path.startswith(FUTURES_PREFIX)
+        if failure:
+            status, body = failure
+            if body is None:   # rate limited, in each API's own error shape
+                body = {"result": "error", "error": "apiLimitExceeded"} if futures \
+                    else {"error": ["EAPI:Rate limit exceeded"]}
+            return status, body
+
+        if path == f"{SPOT_PREFIX}/AssetPairs":
+            return 200, {"error": [], "result": self.pairs}
+        if path == f"{SPOT_PREFIX}/Ticker":
+            codes = query.get("pair", [""])[0].split(",")
+            unknown = [c for c in codes if c not in self.index]
+            if unknown:
+                return 200, {"error": ["EQuery:Unknown asset pair"]}
+            return 200, {"error": [], "result": {c: self.spot_ticker(self.index[c]) for c in codes}}
+        if path == f"{FUTURES_PREFIX}/tickers":
+            server_time = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+            return 200, {"result": "success", "serverTime": server_time,
+                         "tickers": [self.futures_ticker(i) for i in range(self.symbols)]}
+        if path.startswith(f"{FUTURES_PREFIX}/tickers/"):
+            symbol = path.rsplit("/", 1)[1]
+            i = int(symbol[4:-3]) if symbol.startswith("PF_C") and symbol[4:-3].isdigit() else -1
+            if not 0 <= i < self.symbols:
+                return 404, {"result": "error", "error": "contractNotFound"}
+            return 200, {"result": "success", "ticker": self.futures_ticker(i)}
+        return 404, {"error": ["EGeneral:Unknown method"]}
+
+
+def _handler(fake: FakeKraken):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"      # keep-alive, as the exchange does
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            status, body = fake.respond(url.path, parse_qs(url.query))
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+    return Handler
+
+
+def serve(fake: FakeKraken, host: str = "127.0.0.1", port: int = 0):
+    """Start `fake` on a daemon thread; returns the server (server.server_port is the bound port)."""
+    server = ThreadingHTTPServer((host, port), _handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-kraken", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Kraken spot/futures REST server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8811)
+    parser.add_argument("--symbols", type=int, default=1000, help="USD pairs in the universe (default: 1000)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform random extra latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="share of requests answered with a Kraken rate-limit error")
+    args = parser.parse_args()
+    fake = FakeKraken(args.symbols, args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    server = ThreadingHTTPServer((args.host, args.port), _handler(fake))
+    server.daemon_threads = True
+    print(f"fake Kraken with {args.symbols} symbols on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Benchmark / load test of the scan pipeline against bench/fake_kraken.py.
+
+For each universe size it times
+    cycle.spot, cycle.futures   a full SpotScanner / FuturesScanner cycle over
+                                HTTP: fetch_snapshot() + process_snapshot()
+    state.spot, state.futures   AlertStateEngine.update() on synthetic snapshots
+    render                      AlertTableModel.apply_rows() plus a forced
+                                repaint of the table view (offscreen Qt)
+and writes a JSON report, so runs on different commits can be compared.
+
+    python bench/run_bench.py                                      # 100, 1000, 10000 symbols
+    python bench/run_bench.py --symbols 1000 --latency-ms 30 --error-rate 0.02 --out base.json
+    python bench/run_bench.py --symbols 1000 --latency-ms 30 --error-rate 0.02 --compare base.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+from fake_kraken import FakeKraken, serve, SPOT_PREFIX, FUTURES_PREFIX
+from service import scanners
+from service.replay import make_engine
+from utils.metrics.scan_metrics import metrics
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+SIZES           = (100, 1_000, 10_000)
+CYCLES          = 10           # timed scan cycles per scanner and size
+WARMUP          = 1            # untimed cycles first (connection setup, pair lists)
+STATE_SNAPSHOTS = 200          # synthetic snapshots per state-engine benchmark
+RENDER_CYCLES   = 20           # table renders per size
+PERCENTILES     = (50, 90, 99)
+
+
+# ── helpers ──────────────────────────────────────────────────────────────────
+def summarize(samples_ms) -> dict:
+    values = np.asarray(samples_ms, dtype=float)
+    out = {"n": int(len(values))}
+    if len(values):
+        out["mean"] = float(values.mean())
+        for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            out[f"p{p}"] = float(v)
+        out["max"] = float(values.max())
+    return out
+
+
+def git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def synthetic_snapshots(n: int, count: int, seed: int = 3):
+    """
+    `count` snapshots of `n` symbols whose 24h change random-walks across the
+    alert thresholds, as (symbol, pct, volume, price, high, low) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    symbol = np.array([f"C{i}/USD" for i in range(n)], dtype=str)
+    pct = rng.normal(0, 6, n)
+    volume = rng.uniform(1e2, 1e7, n)
+    open_ = rng.uniform(0.01, 50_000, n)
+    for _ in range(count):
+        pct = pct + rng.normal(0, 0.8, n)
+        volume = volume * np.exp(rng.normal(0, 0.02, n))
+        price = open_ * (1 + pct / 100)
+        high = np.maximum(open_, price) * (1 + rng.uniform(0, 0.02, n))
+        low = np.minimum(open_, price) * (1 - rng.uniform(0, 0.02, n))
+        yield symbol, pct, volume, price, high, low
+
+
+# ── benchmarks ───────────────────────────────────────────────────────────────
+def bench_cycles(make_scanner, cycles: int, warmup: int) -> dict:
+    """Time fetch_snapshot() + process_snapshot() cycles of one scanner."""
+    scanner = make_scanner()
+    samples, rows, empty = [], [], 0
+    try:
+        for i in range(warmup + cycles):
+            scanner._rate_limited = False
+            t0 = time.perf_counter()
+            data = scanner.fetch_snapshot()
+            if data:
+                scanner.process_snapshot(data)
+            dt = (time.perf_counter() - t0) * 1000.0
+            if i < warmup:
+                continue
+            samples.append(dt)
+            rows.append(len(data or ()))
+            empty += not data
+    finally:
+        scanner.engine.close()
+    result = summarize(samples)
+    result["rows_mean"] = float(np.mean(rows)) if rows else 0.0
+    result["empty_cycles"] = empty
+    return result
+
+
+def bench_state(market: str, n: int, count: int) -> dict:
+    engine = make_engine(market, scanners.PERCENT_THRESHOLD, scanners.DEVIATION_THRESHOLD)
+    samples, alerts = [], []
+    for columns in synthetic_snapshots(n, count):
+        t0 = time.perf_counter()
+        engine.update(*columns)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        alerts.append(len(engine))
+    result = summarize(samples)
+    result["alerts_mean"] = float(np.mean(alerts))
+    return result
+
+
+def bench_render(n: int, count: int):
+    """
+    Time AlertTableModel.apply_rows() plus a synchronous repaint. Every
+    symbol alerts (threshold 0), so the table holds all `n` rows: the worst
+    case for the GUI. Returns None when PyQt5 is not available.
+    """
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication, QTableView
+        from utils.ui.alert_table_model import AlertTableModel
+    except ImportError:
+        return None
+    app = QApplication.instance() or QApplication([])
+    model = AlertTableModel()
+    view = QTableView()
+    view.setModel(model)
+    view.setSortingEnabled(True)
+    view.resize(1200, 800)
+    view.show()
+    app.processEvents()
+
+    engine = make_engine("spot", 0.0, scanners.DEVIATION_THRESHOLD)
+    engine.top_n = None
+    samples = []
+    for columns in synthetic_snapshots(n, count):
+        rows = engine.update(*columns).rows
+        t0 = time.perf_counter()
+        model.apply_rows(rows)
+        view.viewport().repaint()
+        app.processEvents()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    view.close()
+    result = summarize(samples)
+    result["rows"] = model.rowCount()
+    return result
+
+
+def run_size(n: int, args) -> dict:
+    fake = FakeKraken(n, args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    server = serve(fake)
+    base = f"http://127.0.0.1:{server.server_port}"
+    scanners.SPOT_API_BASE = base + SPOT_PREFIX
+    scanners.FUTURES_API_BASE = base + FUTURES_PREFIX
+    results = {}
+    try:
+        for market, cls in (("spot", scanners.SpotScanner), ("futures", scanners.FuturesScanner)):
+            metrics.reset()
+
+            def make_scanner():
+                scanner = cls()
+                scanner.alerts = make_engine(market, scanners.PERCENT_THRESHOLD, scanners.DEVIATION_THRESHOLD)
+                return scanner
+
+            results[f"cycle.{market}"] = bench_cycles(make_scanner, args.cycles, args.warmup)
+            # per-stage breakdown recorded by the scanner itself (fetch, state, emit, ...)
+            stages = metrics.snapshot()
+            results[f"cycle.{market}"]["stages_p50_ms"] = {
+                name: stat["p50"] for name, stat in stages["timings_ms"].items()
+                if name.startswith(market + ".") and "p50" in stat
+            }
+            results[f"cycle.{market}"]["counters"] = stages["counters"]
+        results["requests"] = fake.requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for market in ("spot", "futures"):
+        results[f"state.{market}"] = bench_state(market, n, args.state_snapshots)
+    if not args.skip_gui:
+        render = bench_render(n, args.render_cycles)
+        if render is not None:
+            results["render"] = render
+    return results
+
+
+# ── reporting ────────────────────────────────────────────────────────────────
+def print_report(report: dict, base: dict = None):
+    print(f"{'symbols':>8}  {'benchmark':<16} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'mean ms':>10}"
+          + ("  {:>9}".format("Δp50") if base else ""))
+    for size, results in report["results"].items():
+        for name, stat in results.items():
+            if not isinstance(stat, dict) or "p50" not in stat:
+                continue
+            line = (f"{size:>8}  {name:<16} {stat['p50']:>10.2f} {stat['p90']:>10.2f} "
+                    f"{stat['p99']:>10.2f} {stat['mean']:>10.2f}")
+            before = (base or {}).get("results", {}).get(size, {}).get(name)
+            if before and before.get("p50"):
+                line += f"  {(stat['p50'] / before['p50'] - 1) * 100:>+8.1f}%"
+            print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, nargs="+", default=SIZES, help="universe sizes to run")
+    parser.add_argument("--cycles", type=int, default=CYCLES)
+    parser.add_argument("--warmup", type=int, default=WARMUP)
+    parser.add_argument("--state-snapshots", type=int, default=STATE_SNAPSHOTS)
+    parser.add_argument("--render-cycles", type=int, default=RENDER_CYCLES)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake server latency per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform random extra latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="share of requests answered with a Kraken rate-limit error")
+    parser.add_argument("--skip-gui", action="store_true", help="skip the table render benchmark")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to print p50 deltas against")
+    args = parser.parse_args()
+
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    report = {
+        "meta": {
+            "ts": time.time(), "git": git_rev(), "python": platform.python_version(),
+            "platform": platform.platform(), "cpus": os.cpu_count(), "params": params,
+        },
+        "results": {},
+    }
+    for n in args.symbols:
+        print(f"running {n} symbols ...", file=sys.stderr)
+        report["results"][str(n)] = run_size(n, args)
+
+    base = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            base = json.load(fh)
+        if base.get("meta", {}).get("params") != params:
+            print(f"note: {args.compare} was run with different parameters", file=sys.stderr)
+    print_report(report, base)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Headless perp-scanner: runs the spot and/or futures scanners without the GUI
+and sends their output to JSONL, a log file, Telegram and desktop notifications.
+
+    python daemon.py                                  # both markets, JSONL on stdout
+    python daemon.py --markets futures --jsonl alerts.jsonl --log-file scanner.log
+    python daemon.py --telegram --interval 30 --stream
+    python daemon.py --metrics-file metrics.json --metrics-every 30
+    python daemon.py --record-dir ~/snapshots         # columnar history of every scan, for replay.py
+"""
+import argparse
+import signal
+import threading
+import time
+
+from service import scanners
+from service.runner import ScannerService, SCANNERS
+from service.sinks import JsonlSink, LogSink, TelegramSink, DesktopSink
+from service.recorder import ColumnarRecorder
+from utils.metrics.scan_metrics import metrics
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the Kraken spot/futures scanners headless")
+    parser.add_argument("--markets", nargs="+", choices=list(SCANNERS), default=list(SCANNERS),
+                        help="markets to scan (default: all)")
+    parser.add_argument("--jsonl", default="-",
+                        help="JSON-lines output file, '-' for stdout, '' to disable (default: -)")
+    parser.add_argument("--tables", action="store_true",
+                        help="also write the full alert table after every scan")
+    parser.add_argument("--log-file", default=None, help="append scanner log lines to this file")
+    parser.add_argument("--record-dir", default=None,
+                        help="append every raw ticker snapshot to a columnar store in this directory, for replay.py")
+    parser.add_argument("--telegram", action="store_true", help="send new alerts to Telegram")
+    parser.add_argument("--desktop", action="store_true", help="show desktop notifications")
+    parser.add_argument("--interval", type=float, default=scanners.SCAN_INTERVAL_SEC,
+                        help=f"seconds between REST scans (default: {scanners.SCAN_INTERVAL_SEC})")
+    parser.add_argument("--spot-interval", type=float, default=None, help="override --interval for spot")
+    parser.add_argument("--futures-interval", type=float, default=None, help="override --interval for futures")
+    parser.add_argument("--stream", action="store_true", help="use the WebSocket ticker feeds instead of polling")
+    parser.add_argument("--metrics-file", default=None,
+                        help="write latency/error metrics as JSON to this file (rewritten periodically and on exit)")
+    parser.add_argument("--metrics-every", type=float, default=60.0,
+                        help="seconds between metrics dumps (default: 60)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scanners.SCAN_INTERVAL_SEC = args.interval
+    scanners.STREAMING_MODE = args.stream
+
+    listeners = []
+    if args.jsonl:
+        listeners.append(JsonlSink(args.jsonl, tables=args.tables))
+    if args.log_file:
+        listeners.append(LogSink(args.log_file))
+    if args.record_dir:
+        listeners.append(ColumnarRecorder(args.record_dir))
+    if args.telegram:
+        listeners.append(TelegramSink())
+    if args.desktop:
+        listeners.append(DesktopSink())
+
+    intervals = {"spot": args.spot_interval, "futures": args.futures_interval}
+    service = ScannerService(args.markets, listeners, intervals)
+    done = threading.Event()
+
+    def shutdown(signum, frame):
+        service.stop()
+        done.set()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    service.start()
+    next_dump = time.monotonic() + args.metrics_every
+    while not done.is_set() and service.is_alive():
+        done.wait(1.0)
+        if args.metrics_file and time.monotonic() >= next_dump:
+            metrics.dump(args.metrics_file)
+            next_dump += args.metrics_every
+    service.join(timeout=5.0)
+
+    if args.metrics_file:
+        metrics.dump(args.metrics_file)
+
+    for listener in listeners:
+        if hasattr(listener, "close"):
+            listener.close()
+
+
+if __name__ == "__main__":
+    main()
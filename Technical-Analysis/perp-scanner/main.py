@@ -1,23 +1,22 @@
 import sys
 import time
-import workers
 from workers import SpotWorker, FuturesWorker
-from utils.screenshot.chart_api.get_charts import fetch_chart_bytes
+from service.sinks import DesktopSink
+from service.recorder import ColumnarRecorder
 import os
+import re
 from settings import load_settings, save_settings
-from PyQt5.QtCore import QThread, Qt, QSize, QSettings
-from PyQt5.QtGui import QColor, QFont, QCursor, QPixmap
+from PyQt5.QtCore import QThread, Qt, QSize, QSettings, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QImage, QPixmap
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QHBoxLayout,
     QWidget,
     QLabel,
     QSpinBox,
-    QGridLayout,
     QToolButton,
     QStyle,
     QPushButton,
@@ -33,23 +32,23 @@ from PyQt5.QtWidgets import (
     QFormLayout,
 )
 
-import io
-from PIL import Image
-from PIL.ImageQt import toqpixmap
-
-from concurrent.futures import ThreadPoolExecutor
-from utils.indicators.rsi import fetch_rsi_intervals
+from utils.indicators import rsi
+from utils.indicators.rsi_service import RsiMatrixService
+from utils.ui.alert_table_model import AlertTableModel, VOLUME_COLUMN
+from utils.ui.rsi_popup import RsiFetcher, RsiPopup
+from utils.ui.chart_capture import ChartCapture
+from utils.metrics.scan_metrics import metrics
 
 # ─── CONFIGURATION ────────────────────────────────────────────────────────────
 SCAN_INTERVAL_SEC = 60  # default scan interval (seconds)
-
-# ─── COLOR CONSTANTS ──────────────────────────────────────────────────────────
-NEW_COLOR = QColor(173, 216, 230)      # light blue
-POS_COLOR = QColor(144, 238, 144)      # light green
-NEG_COLOR = QColor(250, 128, 114)      # light red
-RANGE_BREAK_COLOR = QColor(142, 68, 191)  # light purple
+DEBUG_REFRESH_MS  = 2000  # metrics table refresh while the Debug tab is visible
+SHOW_RSI_COLUMNS  = True  # RSI 1h/4h/1d columns in the alert tables, kept warm in the background
+RSI_REFRESH_MS    = 5000  # repaint of the RSI columns
+RECORD_DIR        = None  # e.g. "~/Total/.snapshots": keep a columnar history of every scan for replay.py
 
 class MainWindow(QMainWindow):
+    background_log = pyqtSignal(str)    # log lines from non-Qt threads, queued to the GUI thread
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Kraken USD Alerts")
@@ -86,9 +85,17 @@ class MainWindow(QMainWindow):
         self.settings_button.clicked.connect(self.on_settings_clicked)
         ctrl.addWidget(self.settings_button)
 
-        workers.MUTE_NOTIFICATIONS = True
+        # desktop notifications start muted, matching the unchecked mute button
+        self.desktop_sink = DesktopSink(muted=True)
         main_layout.addLayout(ctrl)
 
+        # RSI for every alerted symbol, refreshed off the GUI thread
+        self.background_log.connect(self.log)
+        rsi.log = self.background_log.emit
+        self.rsi_service = RsiMatrixService()
+        self.rsi_service.start()
+        self.rsi_fetcher = RsiFetcher(self)
+
         # Tabs
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
@@ -96,8 +103,15 @@ class MainWindow(QMainWindow):
         self._init_fut_tab()
         self._init_screenshots_tab()
         self._init_log_tab()
+        self._init_debug_tab()
         self._start_workers()
 
+        if SHOW_RSI_COLUMNS:
+            self.rsi_timer = QTimer(self)
+            self.rsi_timer.timeout.connect(self.spot_model.refresh_rsi)
+            self.rsi_timer.timeout.connect(self.fut_model.refresh_rsi)
+            self.rsi_timer.start(RSI_REFRESH_MS)
+
     def on_settings_clicked(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Telegram Alert Settings")
@@ -142,7 +156,7 @@ class MainWindow(QMainWindow):
         row = QHBoxLayout()
         row.addWidget(QLabel("Pair:"))
         self.pair_input = QLineEdit()
-        self.pair_input.setPlaceholderText("e.g. BTCUSDT")
+        self.pair_input.setPlaceholderText("e.g. BTCUSDT, or BTCUSDT ETHUSDT SOLUSDT for a batch")
         row.addWidget(self.pair_input)
 
         btn = QPushButton("Capture")
@@ -174,6 +188,15 @@ class MainWindow(QMainWindow):
         self.chart_label.setFixedSize(QSize(800, 400))
         layout.addWidget(self.chart_label, stretch=1)
 
+        # charts are fetched and decoded concurrently off the GUI thread, see on_image_ready()
+        self.chart_capture = ChartCapture(self, display_size=self.chart_label.size())
+        self.chart_capture.image_ready.connect(self.on_image_ready)
+        self.chart_capture.chart_saved.connect(self.on_chart_saved)
+        self.chart_capture.chart_failed.connect(self.on_chart_failed)
+        self.chart_capture.pair_finished.connect(self.on_pair_captured)
+        self._capture_id = None
+        self._capture_pending = set()
+
         self.tabs.addTab(self.screenshots_tab, "Screenshots")
 
     def on_browse_folder(self):
@@ -182,62 +205,45 @@ class MainWindow(QMainWindow):
             self.save_dir_input.setText(folder)
 
     def on_capture_clicked(self):
-        base = self.pair_input.text().strip().upper()
-        if not base:
+        bases = [b for b in re.split(r"[\s,;]+", self.pair_input.text().strip().upper()) if b]
+        if not bases:
             self.status_label.setText("Status: Please enter a valid pair")
             self.log("⚠️ Please enter a pair like BTCUSDT")
             return
 
-        pair = f"BINANCE:{base}"
-        self.status_label.setText(f"Status: Capturing charts for {pair}…")
-        self.log(f"Capturing charts for {pair}…")
-        
-        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
-        
-        try:
-            
-            intervals = ["1h", "4h", "1D"]
-            first_pix = None
-            out_dir = self.save_dir_input.text() or "charts"
-            if self.save_checkbox.isChecked():
-                os.makedirs(out_dir, exist_ok=True)
-
-            for idx, interval in enumerate(intervals):
-                raw_png = fetch_chart_bytes(pair, interval=interval)
-                if idx == 0:
-                    img = Image.open(io.BytesIO(raw_png)).convert("RGBA")
-                    try:
-                        first_pix = toqpixmap(img)
-                    except Exception:
-                        import tempfile
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-                            img.save(tmp, format="PNG")
-                            tmp_path = tmp.name
-                        first_pix = QPixmap(tmp_path)
-                        os.unlink(tmp_path)
-                if self.save_checkbox.isChecked():
-                    fname = f"{pair.replace(':','_')}_{interval}.png"
-                    path = os.path.join(out_dir, fname)
-                    with open(path, "wb") as f:
-                        f.write(raw_png)
-                    self.status_label.setText(f"Status: Saved {interval} chart: {path}")
-                    self.log(f"Saved {interval} chart: {path}")
-
-            if first_pix:
-                self.chart_label.setPixmap(
-                    first_pix.scaled(
-                        self.chart_label.size(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                )
-                self.status_label.setText(f"Status: Screenshot updated for {pair}")
-                self.log(f"Screenshot updated for {pair} (1h)")
-        except Exception as e:
+        pairs = [f"BINANCE:{base}" for base in bases]
+        label = pairs[0] if len(pairs) == 1 else f"{len(pairs)} pairs"
+        self.status_label.setText(f"Status: Capturing charts for {label}…")
+        self.log(f"Capturing charts for {', '.join(pairs)}…")
+
+        save_dir = (self.save_dir_input.text() or "charts") if self.save_checkbox.isChecked() else None
+        self._capture_id = self.chart_capture.capture(pairs, save_dir=save_dir)
+        self._capture_pending = set(pairs)
+
+    def on_image_ready(self, capture_id: int, pair: str, interval: str, image: QImage):
+        # decoded and scaled by ChartCapture on its worker; only the pixmap is made here
+        if capture_id != self._capture_id:
+            return
+        self.chart_label.setPixmap(QPixmap.fromImage(image))
+        self.status_label.setText(f"Status: Screenshot updated for {pair}")
+        self.log(f"Screenshot updated for {pair} ({interval})")
+
+    def on_chart_saved(self, capture_id: int, pair: str, interval: str, path: str):
+        if capture_id == self._capture_id:
+            self.status_label.setText(f"Status: Saved {interval} chart: {path}")
+        self.log(f"Saved {interval} chart: {path}")
+
+    def on_chart_failed(self, capture_id: int, pair: str, interval: str, error: str):
+        if capture_id == self._capture_id:
             self.status_label.setText(f"Status: Error capturing charts: {pair}")
-            self.log(f"Error capturing chart: {e}")
-        finally:
-            QApplication.restoreOverrideCursor()
+        self.log(f"Error capturing {pair} {interval} chart: {error}")
+
+    def on_pair_captured(self, capture_id: int, pair: str, failed: int):
+        if capture_id != self._capture_id:
+            return
+        self._capture_pending.discard(pair)
+        if not self._capture_pending:
+            self.log("Chart capture finished")
 
     def _init_spot_tab(self):
         self.spot_tab = QWidget()
@@ -257,13 +263,11 @@ class MainWindow(QMainWindow):
         h.addWidget(self.spot_status_label)
         layout.addLayout(h)
         # Spot table
-        self.spot_table = QTableWidget()
-        self.spot_table.setColumnCount(7)
-        self.spot_table.setHorizontalHeaderLabels([
-            "Symbol", "Initial %", "Prev %", "Now %", "Volume ($)", "Price", "Prev Day Range"
-        ])
+        self.spot_model = AlertTableModel(self, rsi_source=self.rsi_service.get if SHOW_RSI_COLUMNS else None)
+        self.spot_table = QTableView()
+        self.spot_table.setModel(self.spot_model)
         self._format_table(self.spot_table)
-        self.spot_table.cellDoubleClicked.connect(lambda r, c: self.show_rsi_popup(r, c, is_future=False))
+        self.spot_table.doubleClicked.connect(lambda index: self.show_rsi_popup(index, is_future=False))
         layout.addWidget(self.spot_table)
         self.tabs.addTab(self.spot_tab, "Spot Alerts")
 
@@ -285,13 +289,11 @@ class MainWindow(QMainWindow):
         h.addWidget(self.fut_status_label)
         layout.addLayout(h)
         # Futures table
-        self.fut_table = QTableWidget()
-        self.fut_table.setColumnCount(7)
-        self.fut_table.setHorizontalHeaderLabels([
-            "Symbol", "Initial %", "Prev %", "Now %", "Volume ($)", "Price", "Prev Day Range"
-        ])
+        self.fut_model = AlertTableModel(self, rsi_source=self.rsi_service.get if SHOW_RSI_COLUMNS else None)
+        self.fut_table = QTableView()
+        self.fut_table.setModel(self.fut_model)
         self._format_table(self.fut_table)
-        self.fut_table.cellDoubleClicked.connect(lambda r, c: self.show_rsi_popup(r, c, is_future=True))
+        self.fut_table.doubleClicked.connect(lambda index: self.show_rsi_popup(index, is_future=True))
         layout.addWidget(self.fut_table)
         self.tabs.addTab(self.fut_tab, "Futures Alerts")
 
@@ -304,17 +306,57 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.log_view)
         self.tabs.addTab(self.log_tab, "Log")
 
-    def _format_table(self, table: QTableWidget):
+    def _init_debug_tab(self):
+        self.debug_tab = QWidget()
+        layout = QVBoxLayout(self.debug_tab)
+        btns = QHBoxLayout()
+        dump_btn = QPushButton("Dump Metrics…")
+        dump_btn.clicked.connect(self.on_dump_metrics)
+        btns.addWidget(dump_btn)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(metrics.reset)
+        btns.addWidget(reset_btn)
+        btns.addStretch()
+        layout.addLayout(btns)
+        self.metrics_view = QTextEdit()
+        self.metrics_view.setReadOnly(True)
+        self.metrics_view.setFont(QFont("Courier", 9))
+        self.metrics_view.setLineWrapMode(QTextEdit.NoWrap)
+        layout.addWidget(self.metrics_view)
+        self.tabs.addTab(self.debug_tab, "Debug")
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.refresh_metrics)
+        self.metrics_timer.start(DEBUG_REFRESH_MS)
+
+    def refresh_metrics(self):
+        if self.tabs.currentWidget() is self.debug_tab:
+            self.metrics_view.setPlainText(metrics.format_text())
+
+    def on_dump_metrics(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump Metrics", "scanner-metrics.json", "JSON (*.json)")
+        if path:
+            metrics.dump(path)
+            self.log(f"Metrics written to {path}")
+
+    def _format_table(self, table: QTableView):
         table.setSortingEnabled(True)
+        table.sortByColumn(VOLUME_COLUMN, Qt.DescendingOrder)
         table.setAlternatingRowColors(True)
         table.setFont(QFont("Arial", 10))
         hdr = table.horizontalHeader()
         hdr.setSectionResizeMode(QHeaderView.Stretch)
         hdr.setDefaultAlignment(Qt.AlignCenter)
+        # fixed row height instead of resizeRowsToContents() on every update
+        table.verticalHeader().setDefaultSectionSize(table.fontMetrics().height() + 8)
 
     def _start_workers(self):
         # Spot worker
-        self.spot_worker = SpotWorker()
+        listeners = [self.desktop_sink]
+        if RECORD_DIR:
+            self.recorder = ColumnarRecorder(os.path.expanduser(RECORD_DIR))
+            listeners.append(self.recorder)
+        self.spot_worker = SpotWorker(listeners=listeners, interval=self.spot_interval_spin.value())
         self.spot_thread = QThread()
         self.spot_worker.moveToThread(self.spot_thread)
         self.spot_worker.update_spot_table.connect(self.populate_spot_table)
@@ -324,7 +366,7 @@ class MainWindow(QMainWindow):
         self.spot_thread.started.connect(self.spot_worker.run)
         self.spot_thread.start()
         # Futures worker
-        self.fut_worker = FuturesWorker()
+        self.fut_worker = FuturesWorker(listeners=listeners, interval=self.fut_interval_spin.value())
         self.fut_thread = QThread()
         self.fut_worker.moveToThread(self.fut_thread)
         self.fut_worker.update_fut_table.connect(self.populate_fut_table)
@@ -339,22 +381,22 @@ class MainWindow(QMainWindow):
         self.log_view.append(f"[{ts}] {msg}")
 
     def apply_spot_interval(self):
-        global SCAN_INTERVAL_SEC
-        SCAN_INTERVAL_SEC = self.spot_interval_spin.value()
-        self.log(f"Spot interval changed to {SCAN_INTERVAL_SEC} seconds")
-        self.spot_status_label.setText(f"Status: Interval set to {SCAN_INTERVAL_SEC}s")
+        interval = self.spot_interval_spin.value()
+        self.spot_worker.set_interval(interval)
+        self.log(f"Spot interval changed to {interval} seconds")
+        self.spot_status_label.setText(f"Status: Interval set to {interval}s")
 
     def apply_fut_interval(self):
-        global SCAN_INTERVAL_SEC
-        SCAN_INTERVAL_SEC = self.fut_interval_spin.value()
-        self.log(f"Futures interval changed to {SCAN_INTERVAL_SEC} seconds")
-        self.fut_status_label.setText(f"Status: Interval set to {SCAN_INTERVAL_SEC}s")
+        interval = self.fut_interval_spin.value()
+        self.fut_worker.set_interval(interval)
+        self.log(f"Futures interval changed to {interval} seconds")
+        self.fut_status_label.setText(f"Status: Interval set to {interval}s")
 
     def toggle_mute(self, checked: bool):
         icon = QStyle.SP_MediaVolume if checked else QStyle.SP_MediaVolumeMuted
         self.mute_button.setIcon(self.style().standardIcon(icon))
         self.log("Notifications unmuted" if checked else "Notifications muted")
-        workers.MUTE_NOTIFICATIONS = not checked
+        self.desktop_sink.muted = not checked
 
 
     def on_spot_started(self):
@@ -369,141 +411,44 @@ class MainWindow(QMainWindow):
     def on_fut_finished(self):
         self.fut_status_label.setText(f"Status: Last futures update at {time.strftime('%H:%M:%S')}")
 
-    def show_rsi_popup(self, row: int, column: int, is_future: bool):
-        # Replace self.setOverrideCursor with QApplication.setOverrideCursor
-        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
-        table = self.fut_table if is_future else self.spot_table
-        token_item = table.item(row, 0)
-        token = token_item.text().replace(':', '/') if token_item else "Unknown"
-        self.log(f"Fetching RSI for {token}…")
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(fetch_rsi_intervals, token)
-            rsis = future.result()
-        QApplication.restoreOverrideCursor()  # Restore cursor after fetching RSI
-        r1 = rsis.get('1h') or float('nan')
-        r4 = rsis.get('4h') or float('nan')
-        rD = rsis.get('1d') or float('nan')
-
-        # Build dialog
-        dialog = QDialog(self)
-        dialog.setWindowTitle(f"RSI for {token}")
-        dialog.setModal(True)
-        dialog.resize(350, 220)
-
-        main_layout = QVBoxLayout()
-        main_layout.setContentsMargins(15, 15, 15, 15)
-        main_layout.setSpacing(10)
-
-        # Header label
-        header = QLabel(f"Relative Strength Index")
-        header.setFont(QFont("Arial", 14, QFont.Bold))
-        header.setAlignment(Qt.AlignCenter)
-        main_layout.addWidget(header)
-
-        # Grid: Interval | Value | Status
-        grid = QGridLayout()
-        grid.setHorizontalSpacing(20)
-        grid.setVerticalSpacing(8)
-
-        # Column titles
-        grid.addWidget(QLabel("Interval"), 0, 0)
-        grid.addWidget(QLabel("Value"),    0, 1)
-        grid.addWidget(QLabel("Status"),   0, 2)
-
-        # Helper to color-code
-        def styled_label(value: float):
-            lbl = QLabel(f"{value:.2f}")
-            if value < 30:
-                color = "green"
-                status = "Oversold"
-            elif value > 70:
-                color = "red"
-                status = "Overbought"
-            else:
-                color = "lightblue"
-                status = "Neutral"
-            lbl.setStyleSheet(f"color: {color}; font-weight: bold;")
-            return lbl, status
-
-        # Populate rows for each timeframe
-        for i, tf in enumerate(["1h", "4h", "1d"], start=1):
-            val = {"1h": r1, "4h": r4, "1d": rD}[tf]
-            # Interval cell
-            tf_lbl = QLabel(tf)
-            tf_lbl.setFont(QFont("Arial", 12, QFont.Bold))
-            grid.addWidget(tf_lbl, i, 0)
-
-            # Value + Status
-            val_lbl, status = styled_label(val)
-            grid.addWidget(val_lbl, i, 1)
-            grid.addWidget(QLabel(status), i, 2)
-
-        main_layout.addLayout(grid)
-
-        # OK button
-        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
-        buttons.accepted.connect(dialog.accept)
-        main_layout.addWidget(buttons)
-
-        dialog.setLayout(main_layout)
-        dialog.exec_()
-
-    def populate_spot_table(self, rows):
-        self._populate_table(self.spot_table, rows)
-
-    def populate_fut_table(self, rows):
-        self._populate_table(self.fut_table, rows)
-
-    def _populate_table(self, table: QTableWidget, rows):
-        unique = {}
-        for r in rows:
-            sym = r[0]
-            if sym not in unique:
-                unique[sym] = r
-        deduped = list(unique.values())
-        table.setRowCount(len(deduped))
-        for i, (sym, init_s, prev_s, now_s, vol_s, price_s, ph, pl) in enumerate(deduped):
-            items = [self._make_item(sym),
-                     self._make_item(init_s, True),
-                     self._make_item(prev_s, True),
-                     self._make_item(now_s, True),
-                     self._make_item(vol_s, True),
-                     self._make_item(price_s, True),
-                     self._make_item(f"{ph:.2f}-{pl:.2f}")]
-            color = None
-            try:
-                prev_pct = float(prev_s.rstrip("%"))
-                now_pct = float(now_s.rstrip("%"))
-                price_val = float(str(price_s).replace(",", ""))
-            except:
-                pass
+    def show_rsi_popup(self, index, is_future: bool):
+        symbol = index.sibling(index.row(), 0).data()
+        if not symbol:
+            return
+        token = symbol.replace(':', '/')
+        popup = RsiPopup(token, parent=self)
+        popup.setModal(True)
+        self.rsi_fetcher.value_ready.connect(popup.on_value)
+        # the popup deletes itself on close; drop its connection with it
+        popup.finished.connect(lambda _: self.rsi_fetcher.value_ready.disconnect(popup.on_value))
+        # precomputed values show at once; the rest arrive through value_ready
+        missing = []
+        for tf, value in self.rsi_service.get(symbol).items():
+            if value is None:
+                missing.append(tf)
             else:
-                if prev_pct == float(init_s.rstrip("%")):
-                    color = NEW_COLOR
-                elif now_pct > 0:
-                    color = POS_COLOR
-                elif now_pct < 0:
-                    color = NEG_COLOR
-                if price_val > ph or price_val < pl:
-                    color = RANGE_BREAK_COLOR
-            if color:
-                for it in items:
-                    it.setBackground(color)
-            for col, it in enumerate(items):
-                table.setItem(i, col, it)
-        table.resizeRowsToContents()
-
-    def _make_item(self, text, numeric=False):
-        it = QTableWidgetItem(str(text))
-        it.setTextAlignment(Qt.AlignCenter)
-        it.setFont(QFont("Courier", 9))
-        it.setFlags(it.flags() & ~Qt.ItemIsEditable)
-        if numeric:
-            try:
-                it.setData(Qt.DisplayRole, float(str(text).replace(",", "")))
-            except:
-                pass
-        return it
+                popup.set_value(tf, value)
+        if missing:
+            self.rsi_service.prioritize(symbol)
+            self.log(f"Fetching RSI for {token}…")
+            self.rsi_fetcher.request(token, missing)
+        popup.show()
+
+    def populate_spot_table(self, rows, snapshot_ts):
+        self._render_rows("spot", self.spot_model, rows, snapshot_ts)
+
+    def populate_fut_table(self, rows, snapshot_ts):
+        self._render_rows("futures", self.fut_model, rows, snapshot_ts)
+
+    def _render_rows(self, market: str, model: AlertTableModel, rows, snapshot_ts: float):
+        with metrics.timer(f"{market}.render"):
+            model.apply_rows(rows)
+        if SHOW_RSI_COLUMNS:
+            self.rsi_service.watch(market, {r[0]: r[5] for r in rows})
+        # the repaint is queued; a zero-timeout timer fires once it has been processed
+        QTimer.singleShot(0, lambda: metrics.observe(
+            f"{market}.staleness_paint", (time.time() - snapshot_ts) * 1000.0
+        ))
 
 
 def main():
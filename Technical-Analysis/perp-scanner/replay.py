@@ -0,0 +1,66 @@
+"""
+Replay recorded ticker snapshots through the alert state engine, offline and
+as fast as the CPU allows, to see which alerts given thresholds would fire.
+
+    python daemon.py --record-dir ~/snapshots          # record a day first
+    python replay.py ~/snapshots --market spot         # alert events, current thresholds
+    python replay.py ~/snapshots --market futures --percent 5 8 10 12 --deviation 2 3 5
+"""
+import argparse
+import json
+import sys
+import time
+
+from service import scanners
+from service.replay import load_snapshots, replay, sweep, DEFAULT_WORKERS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay recorded snapshots through the alert logic")
+    parser.add_argument("recording", help="daemon.py --record-dir directory")
+    parser.add_argument("--market", choices=["spot", "futures"], default="spot")
+    parser.add_argument("--percent", type=float, nargs="+", default=[scanners.PERCENT_THRESHOLD],
+                        help=f"alert threshold(s) in %% (default: {scanners.PERCENT_THRESHOLD})")
+    parser.add_argument("--deviation", type=float, nargs="+", default=[scanners.DEVIATION_THRESHOLD],
+                        help=f"removal deviation(s) in %% points (default: {scanners.DEVIATION_THRESHOLD})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"processes for a threshold grid (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--events", default="-",
+                        help="single threshold pair: write alert events as JSONL here, '-' for stdout, '' to skip")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    t0 = time.perf_counter()
+    try:
+        snapshots = load_snapshots(args.recording, args.market)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    t_load = time.perf_counter() - t0
+    if not snapshots:
+        sys.exit(f"no {args.market} snapshots in {args.recording}")
+    span_h = (snapshots[-1][0] - snapshots[0][0]) / 3600
+
+    t0 = time.perf_counter()
+    if len(args.percent) == 1 and len(args.deviation) == 1:
+        results = [replay(snapshots, args.market, args.percent[0], args.deviation[0], keep_events=bool(args.events))]
+        if args.events:
+            out = sys.stdout if args.events == "-" else open(args.events, "w", encoding="utf-8")
+            for event in results[0].events:
+                out.write(json.dumps(event) + "\n")
+            if out is not sys.stdout:
+                out.close()
+    else:
+        results = sweep(snapshots, args.market, args.percent, args.deviation, args.workers)
+    t_replay = time.perf_counter() - t0
+
+    print(f"{len(snapshots)} {args.market} snapshots ({span_h:.1f} h) loaded in {t_load:.2f}s, "
+          f"{len(results)} replay(s) in {t_replay:.2f}s", file=sys.stderr)
+    print(f"{'percent':>8} {'deviation':>9} {'added':>7} {'removed':>8} {'peak':>6}", file=sys.stderr)
+    for r in results:
+        print(f"{r.percent:>8.2f} {r.deviation:>9.2f} {r.added:>7} {r.removed:>8} {r.peak:>6}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
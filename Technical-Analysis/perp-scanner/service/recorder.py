@@ -0,0 +1,181 @@
+"""
+Columnar on-disk history of every scan snapshot.
+
+    <root>/<market>/<segment>/          segment = UTC start, e.g. 20250601T000000
+        ts.f8  symbol.u4  pct.f8  volume.f8  price.f8  high.f8  low.f8
+        symbols.json                    ["BTC/USD", ...], index = symbol id
+
+Each column file is a raw little-endian array with one value per ticker row,
+appended with ndarray.tofile(), so a write is a few small buffered appends.
+Segments roll over every ROLLOVER_SEC and carry their own symbol dictionary.
+Readers np.memmap the columns, so nothing is copied until it is used; a
+column left longer than the others by a crash mid-write is ignored past the
+common length, and cut back to it when a writer resumes the segment so new
+rows stay aligned across columns.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils.metrics.scan_metrics import metrics
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+ROLLOVER_SEC = 24 * 3600    # start a new segment at every UTC day boundary
+COLUMNS = {                 # column → on-disk dtype (also the file suffix)
+    "ts":     "<f8",
+    "symbol": "<u4",
+    "pct":    "<f8",
+    "volume": "<f8",
+    "price":  "<f8",
+    "high":   "<f8",
+    "low":    "<f8",
+}
+SYMBOLS_FILE = "symbols.json"
+
+
+def _suffix(dtype: str) -> str:
+    return dtype[1:]
+
+
+class _SegmentWriter:
+    """Append handle on one segment directory (resumes an existing one)."""
+    def __init__(self, path: Path):
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        symbols_path = path / SYMBOLS_FILE
+        self.symbols = json.loads(symbols_path.read_text(encoding="utf-8")) if symbols_path.exists() else []
+        self.ids = {name: i for i, name in enumerate(self.symbols)}
+        self.files = {name: open(path / f"{name}.{_suffix(dtype)}", "ab") for name, dtype in COLUMNS.items()}
+        self._truncate_torn_rows()
+
+    def _truncate_torn_rows(self):
+        """Cut every column back to the shortest one, dropping a row a crash left half-written."""
+        rows = min(fh.tell() // np.dtype(dtype).itemsize for fh, dtype in zip(self.files.values(), COLUMNS.values()))
+        for fh, dtype in zip(self.files.values(), COLUMNS.values()):
+            size = rows * np.dtype(dtype).itemsize
+            if fh.tell() != size:
+                fh.truncate(size)
+                fh.seek(size)
+
+    def _save_symbols(self):
+        tmp = self.path / (SYMBOLS_FILE + ".tmp")
+        tmp.write_text(json.dumps(self.symbols), encoding="utf-8")
+        tmp.replace(self.path / SYMBOLS_FILE)
+
+    def append(self, rows, ts: float):
+        symbol, pct, volume, price, high, low = zip(*rows)
+        known = len(self.symbols)
+        ids = np.empty(len(symbol), dtype=COLUMNS["symbol"])
+        for i, name in enumerate(symbol):
+            sid = self.ids.get(name)
+            if sid is None:
+                sid = self.ids[name] = len(self.symbols)
+                self.symbols.append(name)
+            ids[i] = sid
+        if len(self.symbols) != known:
+            # the dictionary goes to disk before rows that reference it
+            self._save_symbols()
+
+        columns = {
+            "ts": np.full(len(symbol), ts, dtype=COLUMNS["ts"]),
+            "symbol": ids,
+            "pct": np.asarray(pct, dtype=COLUMNS["pct"]),
+            "volume": np.asarray(volume, dtype=COLUMNS["volume"]),
+            "price": np.asarray(price, dtype=COLUMNS["price"]),
+            "high": np.asarray(high, dtype=COLUMNS["high"]),
+            "low": np.asarray(low, dtype=COLUMNS["low"]),
+        }
+        for name, values in columns.items():
+            values.tofile(self.files[name])
+        for fh in self.files.values():
+            fh.flush()
+
+    def close(self):
+        for fh in self.files.values():
+            fh.close()
+
+
+class ColumnarRecorder:
+    """
+    Scanner listener that appends every snapshot to `root` in the layout
+    above. Safe to share between the spot and futures scanner threads.
+    """
+    def __init__(self, root: str, rollover_sec: float = ROLLOVER_SEC):
+        self.root = Path(root)
+        self.rollover_sec = rollover_sec
+        self._writers = {}      # market → (segment start, _SegmentWriter)
+        self._lock = threading.Lock()
+
+    def _writer(self, market: str, ts: float) -> _SegmentWriter:
+        start = ts // self.rollover_sec * self.rollover_sec
+        current = self._writers.get(market)
+        if current is None or current[0] != start:
+            if current is not None:
+                current[1].close()
+            name = time.strftime("%Y%m%dT%H%M%S", time.gmtime(start))
+            current = self._writers[market] = (start, _SegmentWriter(self.root / market / name))
+        return current[1]
+
+    def snapshot(self, market, rows, snapshot_ts):
+        if not rows:
+            return
+        with metrics.timer(f"{market}.record"):
+            with self._lock:
+                self._writer(market, snapshot_ts).append(rows, snapshot_ts)
+
+    def close(self):
+        with self._lock:
+            for _, writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+
+# ── reading ──────────────────────────────────────────────────────────────────
+class Segment:
+    """
+    Read-only view of one segment: `columns` maps each column name to a
+    np.memmap (zero-copy), `symbols` maps symbol ids to names.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        symbols_path = self.path / SYMBOLS_FILE
+        names = json.loads(symbols_path.read_text(encoding="utf-8")) if symbols_path.exists() else []
+        self.symbols = np.array(names, dtype=str)
+        self.columns = {}
+        for name, dtype in COLUMNS.items():
+            file = self.path / f"{name}.{_suffix(dtype)}"
+            size = file.stat().st_size // np.dtype(dtype).itemsize if file.exists() else 0
+            self.columns[name] = np.memmap(file, dtype=dtype, mode="r", shape=(size,)) if size else np.empty(0, dtype)
+        rows = min(len(c) for c in self.columns.values())
+        self.columns = {name: c[:rows] for name, c in self.columns.items()}
+
+    def __len__(self):
+        return len(self.columns["ts"])
+
+    def snapshots(self):
+        """Yield (ts, (symbol, pct, volume, price, high, low)) per recorded snapshot."""
+        ts = self.columns["ts"]
+        if not len(ts):
+            return
+        cuts = np.concatenate(([0], np.flatnonzero(np.diff(ts)) + 1, [len(ts)]))
+        c = self.columns
+        for a, b in zip(cuts[:-1], cuts[1:]):
+            yield float(ts[a]), (self.symbols[c["symbol"][a:b]], c["pct"][a:b], c["volume"][a:b],
+                                 c["price"][a:b], c["high"][a:b], c["low"][a:b])
+
+
+def segments(root: str, market: str) -> list:
+    """Segment directories of `market` under `root`, oldest first."""
+    base = Path(root) / market
+    return sorted(p for p in base.iterdir() if p.is_dir()) if base.is_dir() else []
+
+
+def iter_snapshots(root: str, market: str, start: float = None, end: float = None):
+    """Every recorded snapshot of `market` with start <= ts < end, in order."""
+    for path in segments(root, market):
+        for ts, columns in Segment(path).snapshots():
+            if (start is None or ts >= start) and (end is None or ts < end):
+                yield ts, columns
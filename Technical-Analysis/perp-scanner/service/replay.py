@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from service import scanners, recorder
+from utils.alerts.state_engine import AlertStateEngine
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+class ReplayResult:
+    """
+    Outcome of replaying one market's snapshots at one threshold pair.
+
+    - added / removed: number of alert adds and removes
+    - peak:            most alerts live at once
+    - events:          [{"ts", "market", "event", "symbol", ...}, ...] in the
+                       JsonlSink alert_added / alert_removed shape (empty when
+                       the replay was run with keep_events=False)
+    """
+    def __init__(self, market, percent, deviation, snapshots=0, added=0, removed=0, peak=0, events=None):
+        self.market = market
+        self.percent = percent
+        self.deviation = deviation
+        self.snapshots = snapshots
+        self.added = added
+        self.removed = removed
+        self.peak = peak
+        self.events = events if events is not None else []
+
+
+def load_snapshots(path: str, market: str) -> list:
+    """
+    Read a ColumnarRecorder directory and return [(ts, columns), ...] for
+    `market`, with columns = (symbol, pct, vol, price, high, low) arrays
+    ready for AlertStateEngine.update().
+    """
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"{path} is not a recorder directory (daemon.py --record-dir)")
+    return list(recorder.iter_snapshots(path, market))
+
+
+def make_engine(market: str, percent: float, deviation: float) -> AlertStateEngine:
+    """A fresh engine with the live scanner's top-N / proximity settings for `market`."""
+    live = {"spot": scanners.spot_alerts, "futures": scanners.fut_alerts}[market]
+    return AlertStateEngine(percent, deviation, top_n=live.top_n, proximity=live.proximity)
+
+
+def replay(snapshots, market: str, percent: float = scanners.PERCENT_THRESHOLD,
+           deviation: float = scanners.DEVIATION_THRESHOLD, keep_events: bool = True) -> ReplayResult:
+    """Feed `snapshots` (from load_snapshots) through a fresh engine as fast as it runs."""
+    engine = make_engine(market, percent, deviation)
+    result = ReplayResult(market, percent, deviation, snapshots=len(snapshots))
+    for ts, columns in snapshots:
+        update = engine.update(*columns)
+        result.added += len(update.added)
+        result.removed += len(update.removed)
+        result.peak = max(result.peak, len(engine))
+        if keep_events:
+            for symbol, pct, notional, price in update.added:
+                result.events.append({"ts": ts, "market": market, "event": "alert_added",
+                                      "symbol": symbol, "pct": pct, "notional": notional, "price": price})
+            for symbol, initial, pct in update.removed:
+                result.events.append({"ts": ts, "market": market, "event": "alert_removed",
+                                      "symbol": symbol, "initial": initial, "pct": pct})
+    return result
+
+
+# ── parallel threshold sweep ────────────────────────────────────────────────
+_worker_snapshots = None
+
+def _init_worker(snapshots):
+    global _worker_snapshots
+    _worker_snapshots = snapshots
+
+def _replay_point(args) -> ReplayResult:
+    market, percent, deviation = args
+    return replay(_worker_snapshots, market, percent, deviation, keep_events=False)
+
+
+def sweep(snapshots, market: str, percents, deviations, workers: int = DEFAULT_WORKERS) -> list:
+    """
+    Replay every (percent, deviation) pair of the grid, one process per core.
+    The snapshots are handed to each worker once, not per grid point.
+    """
+    grid = [(market, p, d) for p in percents for d in deviations]
+    workers = max(1, min(workers, len(grid)))
+    if workers == 1:
+        return [replay(snapshots, market, p, d, keep_events=False) for _, p, d in grid]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshots,)) as pool:
+        return list(pool.map(_replay_point, grid))
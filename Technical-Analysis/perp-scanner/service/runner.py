@@ -0,0 +1,42 @@
+import threading
+
+from service.scanners import SpotScanner, FuturesScanner
+
+SCANNERS = {
+    "spot":    SpotScanner,
+    "futures": FuturesScanner,
+}
+
+
+class ScannerService:
+    """
+    Runs one scanner per market on its own thread, reporting to `listeners`.
+    `intervals` optionally maps a market to its own scan interval.
+    Used by the headless daemon; the GUI drives the scanners through its Qt
+    workers instead.
+    """
+    def __init__(self, markets=("spot", "futures"), listeners=(), intervals=None):
+        self.markets = list(markets)
+        self.listeners = list(listeners)
+        self.intervals = dict(intervals or {})
+        self.scanners = []
+        self._threads = []
+
+    def start(self):
+        for market in self.markets:
+            scanner = SCANNERS[market](listeners=self.listeners, interval=self.intervals.get(market))
+            thread = threading.Thread(target=scanner.run, name=f"{market}-scanner", daemon=True)
+            self.scanners.append(scanner)
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self):
+        for scanner in self.scanners:
+            scanner.stop()
+
+    def join(self, timeout: float = None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
@@ -0,0 +1,518 @@
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from service.scheduler import DeadlineScheduler
+from utils.net import http_client
+from utils.metrics.scan_metrics import metrics
+from utils.net.async_engine import FetchEngine
+from utils.alerts.state_engine import AlertStateEngine
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+SPOT_API_BASE       = "https://api.kraken.com/0/public"
+FUTURES_API_BASE    = "https://futures.kraken.com/derivatives/api/v3"
+PERCENT_THRESHOLD   = 10.0            # only alert if |24h change| ≥ 10%
+DEVIATION_THRESHOLD = 5.0             # remove only if change from initial ≥ 5%
+TOP_N_BY_VOLUME     = 100             # consider top 100 USD pairs by 24h volume
+SCAN_INTERVAL_SEC   = 60              # default scan interval (seconds), per scanner
+FETCH_CONCURRENCY   = 50              # max ticker requests in flight on the fetch engine
+REQUEST_DEADLINE_SEC = 10.0           # per-request budget, retries included
+SPOT_BULK_SNAPSHOT  = True            # fetch spot tickers in multi-pair requests
+SPOT_TICKER_CHUNK   = 100             # pairs per multi-pair /Ticker request
+FUTURES_BULK_SNAPSHOT = True          # build futures scans from a single /tickers call
+STREAMING_MODE      = False           # use WebSocket ticker feeds instead of polling
+SPOT_WS_URL         = "wss://ws.kraken.com"
+FUTURES_WS_URL      = "wss://futures.kraken.com/ws/v1"
+STREAM_FLUSH_SEC    = 0.25            # coalesce pushes arriving within this window (0 = every push)
+FUTURES_RANGE_PROXIMITY = 0.01       # new futures alerts must trade within 1% of the 24h high/low
+SPOT_RATE_LIMIT_ERRORS = ("EAPI:Rate limit exceeded", "EGeneral:Too many requests", "EService:Throttled")
+FUTURES_RATE_LIMIT_ERRORS = ("apiLimitExceeded",)
+# ─── GLOBAL STATE ──────────────────────────────────────────────────────────────
+spot_alerts          = AlertStateEngine(PERCENT_THRESHOLD, DEVIATION_THRESHOLD, top_n=TOP_N_BY_VOLUME)
+spot_pair_wsname_map = {}
+
+fut_alerts           = AlertStateEngine(PERCENT_THRESHOLD, DEVIATION_THRESHOLD, proximity=FUTURES_RANGE_PROXIMITY)
+
+# futures ticker feed field → /tickers field it refreshes
+FUTURES_STREAM_FIELDS = {
+    "last":    "last",
+    "change":  "change24h",
+    "volume":  "vol24h",
+    "high":    "high24h",
+    "low":     "low24h",
+    "tag":     "tag",
+    "pair":    "pair",
+}
+
+
+# ─── SCANNER BASE ────────────────────────────────────────────────────────────────
+class BaseScanner:
+    """
+    Qt-free scan loop shared by the spot and futures scanners.
+
+    Results are reported to `listeners`, plain objects implementing any of:
+        scan_started(market)
+        scan_finished(market)
+        snapshot(market, rows, snapshot_ts)
+                                     the raw (symbol, pct, vol, price, high, low) rows
+                                     fed to the alert engine, e.g. for recording/replay
+        table(market, rows, snapshot_ts)
+                                     rows as in AlertUpdate.rows; snapshot_ts is the
+                                     exchange (or receipt) time of the data, epoch seconds
+        alert_added(market, symbol, pct, notional, price)
+        alert_removed(market, symbol, initial, pct)
+        log(market, message)
+    The GUI workers, the JSONL/log/notification sinks and the daemon are all
+    just listeners.
+    """
+    market        = None
+    added_label   = None
+    removed_label = None
+
+    def __init__(self, alerts: AlertStateEngine, listeners=(), interval: float = None):
+        self.alerts = alerts
+        self.listeners = list(listeners)
+        self.engine = FetchEngine(concurrency=FETCH_CONCURRENCY, deadline=REQUEST_DEADLINE_SEC)
+        self.scheduler = DeadlineScheduler(interval or SCAN_INTERVAL_SEC)
+        self._stop_event = threading.Event()
+        self._stream = None
+        self._snapshot_ts = None    # exchange/receipt time of the data being processed
+        self._rate_limited = False  # set by the fetch code when the exchange pushes back
+
+    def _emit(self, event: str, *args):
+        for listener in self.listeners:
+            handler = getattr(listener, event, None)
+            if handler is None:
+                continue
+            try:
+                handler(self.market, *args)
+            except Exception as e:
+                if event != "log":
+                    self._log(f"{type(listener).__name__}.{event} failed: {e}")
+
+    def _log(self, message: str):
+        self._emit("log", message)
+
+    def api_host(self) -> str:
+        raise NotImplementedError
+
+    def fetch_snapshot(self):
+        raise NotImplementedError
+
+    def run_stream(self):
+        raise NotImplementedError
+
+    def set_interval(self, seconds: float):
+        """Change the scan interval; safe to call from another thread."""
+        self.scheduler.set_interval(seconds)
+
+    def process_snapshot(self, all_data):
+        """
+        Run the alert add/update/remove logic over one snapshot of
+        (symbol, pct, vol, price, high, low) rows and report the table.
+        """
+        snapshot_ts = self._snapshot_ts or time.time()
+        self._emit("snapshot", all_data, snapshot_ts)
+        with metrics.timer(f"{self.market}.state"):
+            update = self.alerts.update(*zip(*all_data))
+
+        with metrics.timer(f"{self.market}.emit"):
+            for symbol, new_pct, notional, price in update.added:
+                self._emit("alert_added", symbol, new_pct, notional, price)
+                self._log(f"{self.added_label}: {symbol} at {new_pct:.2f}%")
+            for symbol, initial, pct in update.removed:
+                self._emit("alert_removed", symbol, initial, pct)
+                verb = "dropped" if initial >= self.alerts.percent_threshold else "rose"
+                self._log(f"{self.removed_label}: {symbol} ({verb} {initial:.2f}%→{pct:.2f}%)")
+
+            metrics.observe(f"{self.market}.staleness_emit", (time.time() - snapshot_ts) * 1000.0)
+            self._emit("table", update.rows, snapshot_ts)
+
+    def run(self):
+        """
+        Blocks until stop() is called, scanning on the scheduler's deadlines.
+        A scan that hits HTTP 429 or an exchange rate-limit error stretches
+        the period; clean scans bring it back down. The fetch engine is
+        closed on the way out.
+        """
+        try:
+            if STREAMING_MODE:
+                self.run_stream()
+                return
+
+            skipped_seen = self.scheduler.skipped
+            while self.scheduler.wait(self._stop_event):
+                # wait() counts the deadlines the previous scan overran
+                if self.scheduler.skipped > skipped_seen:
+                    metrics.incr(f"{self.market}.skipped_deadlines", self.scheduler.skipped - skipped_seen)
+                    skipped_seen = self.scheduler.skipped
+                rate_limit_key = f"rate_limit.{self.api_host()}"
+                hits_before = metrics.count(rate_limit_key)
+                self._rate_limited = False
+
+                self._emit("scan_started")
+                with metrics.timer(f"{self.market}.cycle"):
+                    all_data = self.fetch_snapshot()
+                    if all_data:
+                        self.process_snapshot(all_data)
+                if all_data:
+                    self._emit("scan_finished")
+                else:
+                    metrics.incr(f"{self.market}.empty_scans")
+
+                if self._rate_limited or metrics.count(rate_limit_key) > hits_before:
+                    period = self.scheduler.back_off()
+                    self._log(f"{self.market} scan rate limited; backing off to every {period:.0f}s")
+                elif self.scheduler.factor > 1:
+                    self.scheduler.recover()
+                    if self.scheduler.factor == 1:
+                        self._log(f"{self.market} scan back to every {self.scheduler.period:.0f}s")
+        finally:
+            # the engine's aiohttp session and event loop belong to this thread
+            self.engine.close()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._stream is not None:
+            self._stream.stop()
+
+
+# ─── SPOT SCANNER ────────────────────────────────────────────────────────────────
+class SpotScanner(BaseScanner):
+    market        = "spot"
+    added_label   = "Spot coin added"
+    removed_label = "Spot coin removed"
+
+    def __init__(self, listeners=(), interval: float = None):
+        super().__init__(spot_alerts, listeners, interval)
+        self.usd_pairs = self.get_usd_pairs()
+        if not self.usd_pairs:
+            self._log("⚠️  No active USD spot pairs found. Spot worker exiting.")
+
+    def api_host(self) -> str:
+        return urlsplit(SPOT_API_BASE).hostname
+
+    @staticmethod
+    def is_rate_limit(payload) -> bool:
+        """True for a 429 from the fetch engine or a Kraken rate-limit error body."""
+        if isinstance(payload, aiohttp.ClientResponseError):
+            return payload.status == 429
+        if isinstance(payload, Exception):
+            return False
+        return any(err.startswith(SPOT_RATE_LIMIT_ERRORS) for err in payload.get("error", []))
+
+    def get_usd_pairs(self):
+        url = f"{SPOT_API_BASE}/AssetPairs"
+        try:
+            resp = http_client.get(url)
+            resp.raise_for_status()
+        except Exception as e:
+            self._log(f"Error fetching AssetPairs (spot): {e}")
+            return []
+        data = resp.json().get("result", {})
+        usd_pairs = []
+        for pair_code, info in data.items():
+            if info.get("isFrozen") == "1":
+                continue
+            wsname = info.get("wsname")
+            if not wsname or not wsname.endswith("/USD"):
+                continue
+            if ".d" in wsname or ".s" in wsname:
+                continue
+            spot_pair_wsname_map[pair_code] = wsname
+            usd_pairs.append(pair_code)
+        return usd_pairs
+
+    def parse_ticker(self, pair_code: str, info: dict):
+        """
+        Convert a raw /Ticker entry into (wsname, pct, vol, price, high, low).
+        Returns a tuple of Nones when any required field is missing.
+        """
+        if not info:
+            return None, None, None, None, None, None
+
+        last_price_str = info.get("c", [None])[0]
+        open_price_str = info.get("o")
+        volume_24h_str = info.get("v", [None, None])[1]
+        high_24h_str   = info.get("h", [None, None])[1]
+        low_24h_str    = info.get("l", [None, None])[1]
+
+        if not (last_price_str and open_price_str and volume_24h_str and high_24h_str and low_24h_str):
+            return None, None, None, None, None, None
+
+        last_price = float(last_price_str)
+        open_price = float(open_price_str)
+        volume_24h  = float(volume_24h_str)
+        high_24h    = float(high_24h_str)
+        low_24h     = float(low_24h_str)
+        pct_change  = ((last_price - open_price) / open_price) * 100.0
+        wsname      = spot_pair_wsname_map[pair_code]
+
+        return wsname, pct_change, volume_24h, last_price, high_24h, low_24h
+
+    def fetch_snapshot(self):
+        """
+        Fetch every USD pair and return [(wsname, pct, vol, price, high, low), ...].
+        With SPOT_BULK_SNAPSHOT the universe is split into SPOT_TICKER_CHUNK-sized
+        multi-pair requests, otherwise one request per pair; either way they all
+        run concurrently on the worker's fetch engine. Kraken rejects a whole
+        multi-pair request if any pair is unknown, so failed chunks are retried
+        one pair at a time.
+        """
+        if SPOT_BULK_SNAPSHOT:
+            batches = [
+                self.usd_pairs[i:i + SPOT_TICKER_CHUNK]
+                for i in range(0, len(self.usd_pairs), SPOT_TICKER_CHUNK)
+            ]
+        else:
+            batches = [[p] for p in self.usd_pairs]
+
+        all_tickers, retry = self._fetch_batches(batches)
+        if retry and not self._rate_limited:
+            self._log(f"Bulk spot ticker request failed; retrying {len(retry)} pairs individually")
+            fallback, _ = self._fetch_batches([[p] for p in retry])
+            all_tickers.extend(fallback)
+        return all_tickers
+
+    def _fetch_batches(self, batches: list):
+        """
+        Returns (rows, pairs_to_retry) for one round of /Ticker requests.
+        """
+        url = f"{SPOT_API_BASE}/Ticker"
+        with metrics.timer("spot.fetch"):
+            payloads = self.engine.get_json_many([(url, {"pair": ",".join(batch)}) for batch in batches])
+        self._snapshot_ts = time.time()     # /Ticker carries no server timestamp
+
+        rows, retry = [], []
+        with metrics.timer("spot.filter"):
+            for batch, payload in zip(batches, payloads):
+                if isinstance(payload, Exception) or payload.get("error"):
+                    if self.is_rate_limit(payload):
+                        if not isinstance(payload, Exception):
+                            metrics.incr("errors.rate_limit")   # 429s are counted by the client
+                        self._rate_limited = True
+                        continue
+                    if not isinstance(payload, Exception):
+                        metrics.incr("errors.exchange")
+                    if len(batch) > 1:
+                        retry.extend(batch)
+                    continue
+                result = payload.get("result", {})
+                for pair_code in batch:
+                    try:
+                        row = self.parse_ticker(pair_code, result.get(pair_code))
+                    except Exception:
+                        metrics.incr("errors.parse")
+                        continue
+                    if row[0] is not None:
+                        rows.append(row)
+        return rows, retry
+
+    def parse_stream_message(self, message):
+        """
+        Turn a ws.kraken.com ticker push ([channelID, ticker, "ticker", wsname])
+        into [(wsname, row)] using the same fields as the REST /Ticker call.
+        Heartbeats and status events (dicts) yield nothing.
+        """
+        if not isinstance(message, list) or len(message) < 4 or message[-2] != "ticker":
+            return []
+        wsname = message[-1]
+        pair_code = self._wsname_pair_map.get(wsname)
+        if pair_code is None:
+            return []
+        info = dict(message[1])
+        # the feed sends [today, last 24h] for the open; REST sends today's only
+        if isinstance(info.get("o"), list):
+            info["o"] = info["o"][0]
+        try:
+            row = self.parse_ticker(pair_code, info)
+        except (TypeError, ValueError):
+            return []
+        if row[0] is None:
+            return []
+        return [(wsname, row)]
+
+    def run_stream(self):
+        """
+        Seed the universe from one REST snapshot, then keep it current from the
+        WebSocket ticker feed and rerun the alert logic on every flushed batch.
+        """
+        from utils.streaming.ticker_stream import TickerStream
+
+        self._wsname_pair_map = {spot_pair_wsname_map[p]: p for p in self.usd_pairs}
+        wsnames = list(self._wsname_pair_map)
+        latest = {row[0]: row for row in self.fetch_snapshot()}
+
+        def subscriptions():
+            return [
+                {"event": "subscribe", "pair": wsnames[i:i + SPOT_TICKER_CHUNK], "subscription": {"name": "ticker"}}
+                for i in range(0, len(wsnames), SPOT_TICKER_CHUNK)
+            ]
+
+        def on_batch(changed):
+            latest.update(changed)
+            self._snapshot_ts = time.time()     # spot ticker pushes carry no timestamp
+            self.process_snapshot(list(latest.values()))
+            self._emit("scan_finished")
+
+        self._stream = TickerStream(
+            SPOT_WS_URL, subscriptions, self.parse_stream_message, on_batch,
+            log=self._log, flush_interval=STREAM_FLUSH_SEC,
+        )
+        self._stream.run_forever()
+
+
+# ─── FUTURES SCANNER ─────────────────────────────────────────────────────────────
+class FuturesScanner(BaseScanner):
+    market        = "futures"
+    added_label   = "Futures added"
+    removed_label = "Futures removed"
+
+    def __init__(self, listeners=(), interval: float = None):
+        super().__init__(fut_alerts, listeners, interval)
+        self.symbols = self.fetch_all_symbols()
+        if not self.symbols:
+            self._log("⚠️  No futures symbols found. Futures worker exiting.")
+
+    def api_host(self) -> str:
+        return urlsplit(FUTURES_API_BASE).hostname
+
+    def fetch_all_symbols(self):
+        url = f"{FUTURES_API_BASE}/tickers"
+        try:
+            resp = http_client.get(url)
+            resp.raise_for_status()
+        except Exception as e:
+            self._log(f"Error fetching futures tickers: {e}")
+            return []
+        data = resp.json().get("tickers", [])
+        return [entry.get("symbol") for entry in data if entry.get("symbol")]
+
+    def parse_ticker(self, info: dict):
+        """
+        Convert a futures ticker entry into
+        (last_price, pct_change, volume24h, high24h, low24h, pair).
+        Non-perpetual contracts yield a tuple of Nones.
+        """
+        if info.get("tag") != "perpetual":
+            return None, None, None, None, None, None
+
+        last_price  = info.get("last")
+        pct_change  = info.get("change24h")
+        volume_24h  = info.get("vol24h")
+        high_24h    = info.get("high24h")
+        low_24h     = info.get("low24h")
+        pair        = info.get("pair")
+        return last_price, pct_change, volume_24h, high_24h, low_24h, pair
+
+    def fetch_raw_tickers(self):
+        """
+        Return the raw entries of one /tickers response ([] on error).
+        """
+        url = f"{FUTURES_API_BASE}/tickers"
+        try:
+            with metrics.timer("futures.fetch"):
+                resp = http_client.get(url)
+                resp.raise_for_status()
+                payload = resp.json()
+        except Exception as e:
+            self._log(f"Error fetching futures tickers: {e}")
+            return []
+        if payload.get("error") in FUTURES_RATE_LIMIT_ERRORS:
+            metrics.incr("errors.rate_limit")
+            self._rate_limited = True
+            self._log(f"Futures tickers rate limited: {payload['error']}")
+            return []
+        self._snapshot_ts = self.parse_server_time(payload.get("serverTime")) or time.time()
+        return payload.get("tickers", [])
+
+    @staticmethod
+    def parse_server_time(value):
+        """ISO-8601 serverTime of a futures response as epoch seconds, or None."""
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except (AttributeError, ValueError):
+            return None
+
+    def fetch_snapshot(self):
+        """
+        Return [(pair, pct, vol, last, high24h, low24h), ...] for every perpetual.
+        With FUTURES_BULK_SNAPSHOT the whole dataset comes from one /tickers
+        response, otherwise each symbol is queried via /tickers/{symbol}
+        concurrently on the worker's fetch engine.
+        """
+        if FUTURES_BULK_SNAPSHOT:
+            details = [self.parse_ticker(entry) for entry in self.fetch_raw_tickers()]
+        else:
+            with metrics.timer("futures.fetch"):
+                payloads = self.engine.get_json_many(
+                    [(f"{FUTURES_API_BASE}/tickers/{symbol}", None) for symbol in self.symbols]
+                )
+            self._snapshot_ts = time.time()
+            details = [
+                self.parse_ticker(payload.get("ticker", {}))
+                for payload in payloads
+                if not isinstance(payload, Exception)
+            ]
+
+        all_data = []
+        with metrics.timer("futures.filter"):
+            for lp, pct, vol, high24, low24, pair in details:
+                if None in (lp, pct, vol, high24, low24):
+                    continue
+                all_data.append((pair, pct, vol, lp, high24, low24))
+        return all_data
+
+    def run_stream(self):
+        """
+        Seed every contract from one /tickers call, then merge pushes from the
+        futures ticker feed into those entries and rerun the alert logic on
+        every flushed batch. Fields a push omits keep their last known value.
+        """
+        from utils.streaming.ticker_stream import TickerStream
+
+        raw = {entry["symbol"]: entry for entry in self.fetch_raw_tickers() if entry.get("symbol")}
+        product_ids = [sym for sym, entry in raw.items() if entry.get("tag") == "perpetual"]
+
+        def subscriptions():
+            return [{"event": "subscribe", "feed": "ticker", "product_ids": product_ids}]
+
+        batch_times = []    # exchange timestamps (ms) of the pushes in the current batch
+
+        def parse_message(message):
+            if not isinstance(message, dict) or message.get("feed") != "ticker":
+                return []
+            symbol = message.get("product_id")
+            if symbol not in raw:
+                return []
+            if message.get("time"):
+                batch_times.append(message["time"])
+            entry = dict(raw[symbol])
+            for feed_key, rest_key in FUTURES_STREAM_FIELDS.items():
+                if message.get(feed_key) is not None:
+                    entry[rest_key] = message[feed_key]
+            return [(symbol, entry)]
+
+        def on_batch(changed):
+            raw.update(changed)
+            # staleness is measured from the oldest push in the batch
+            self._snapshot_ts = min(batch_times) / 1000.0 if batch_times else time.time()
+            batch_times.clear()
+            details = [self.parse_ticker(entry) for entry in raw.values()]
+            all_data = [
+                (pair, pct, vol, lp, high24, low24)
+                for lp, pct, vol, high24, low24, pair in details
+                if None not in (lp, pct, vol, high24, low24)
+            ]
+            if all_data:
+                self.process_snapshot(all_data)
+                self._emit("scan_finished")
+
+        self._stream = TickerStream(
+            FUTURES_WS_URL, subscriptions, parse_message, on_batch,
+            log=self._log, flush_interval=STREAM_FLUSH_SEC,
+        )
+        self._stream.run_forever()
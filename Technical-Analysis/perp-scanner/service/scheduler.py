@@ -0,0 +1,86 @@
+import math
+import threading
+import time
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+ALIGN_TO_WALL_CLOCK = True     # deadlines fall on multiples of the period (e.g. :00, :30 for 30s)
+MAX_BACKOFF_FACTOR  = 8        # rate limiting stretches the period up to this many intervals
+MAX_PERIOD_SEC      = 600      # ...but never beyond this (unless the interval itself is longer)
+
+
+class DeadlineScheduler:
+    """
+    Fixed-deadline pacing for one scanner loop.
+
+    The first scan runs immediately; after that scans start on a grid of
+    deadlines `period` seconds apart (multiples of the period on the wall
+    clock, or counted from the last start when ALIGN_TO_WALL_CLOCK is off),
+    so the cadence does not drift with scan time. Deadlines that pass while
+    a scan is still running are skipped rather than run back to back.
+
+    back_off() doubles the period after a rate-limited scan, up to
+    MAX_BACKOFF_FACTOR × interval; recover() halves it after each clean one.
+    set_interval() may be called from any thread and takes effect at once.
+    """
+    def __init__(self, interval: float):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.interval = float(interval)
+        self.factor = 1
+        self.skipped = 0             # deadlines skipped because a scan overran them
+        self._last_start = None
+        self._next = None            # wall-clock time of the next scan, None = not scheduled yet
+
+    @property
+    def period(self) -> float:
+        return min(self.interval * self.factor, max(MAX_PERIOD_SEC, self.interval))
+
+    def set_interval(self, seconds: float):
+        with self._lock:
+            self.interval = float(seconds)
+            if self._next is not None:
+                self._next = self._deadline_after(time.time())
+        self._wake.set()
+
+    def back_off(self) -> float:
+        """Stretch the period after a rate-limited scan; returns the new period."""
+        with self._lock:
+            self.factor = min(self.factor * 2, MAX_BACKOFF_FACTOR)
+            return self.period
+
+    def recover(self):
+        """Shrink a backed-off period by half after a clean scan."""
+        with self._lock:
+            self.factor = max(self.factor // 2, 1)
+
+    def _deadline_after(self, now: float, count_skipped: bool = False) -> float:
+        """First grid deadline after `now`, optionally counting those missed since the last start."""
+        period = self.period
+        anchor = 0.0 if ALIGN_TO_WALL_CLOCK else self._last_start
+        k_now = math.floor((now - anchor) / period)
+        if count_skipped:
+            k_start = math.floor((self._last_start - anchor) / period)
+            self.skipped += max(0, k_now - k_start)
+        return anchor + (k_now + 1) * period
+
+    def wait(self, stop_event: threading.Event) -> bool:
+        """
+        Block until the next deadline. Returns True when it is time to scan,
+        False if `stop_event` was set while waiting.
+        """
+        with self._lock:
+            if self._last_start is not None and self._next is None:
+                self._next = self._deadline_after(time.time(), count_skipped=True)
+
+        while not stop_event.is_set():
+            with self._lock:
+                now = time.time()
+                if self._next is None or now >= self._next:
+                    self._last_start = now
+                    self._next = None
+                    return True
+                remaining = self._next - now
+                self._wake.clear()
+            # set_interval() wakes this early; stop_event is polled at least once a second
+            self._wake.wait(min(remaining, 1.0))
+        return False
@@ -0,0 +1,134 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+from utils.notifications.dispatcher import DigestCollector, NotificationDispatcher
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+DESKTOP_DIGEST_SYMBOLS = 5     # symbols named in a multi-alert desktop notification
+
+
+class JsonlSink:
+    """
+    Writes scanner events as JSON lines ({"ts", "market", "event", ...}) to a
+    file, or to stdout when `path` is "-". Table snapshots are large, so they
+    are only written when `tables=True`.
+    """
+    def __init__(self, path: str = "-", tables: bool = False):
+        self.tables = tables
+        self._own = path != "-"
+        self._fh = open(path, "a", encoding="utf-8") if self._own else sys.stdout
+        self._lock = threading.Lock()
+
+    def _write(self, market: str, event: str, **fields):
+        record = {"ts": round(time.time(), 3), "market": market, "event": event, **fields}
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def scan_finished(self, market):
+        self._write(market, "scan_finished")
+
+    def table(self, market, rows, snapshot_ts):
+        if self.tables:
+            keys = ("symbol", "initial", "prev", "now", "notional", "price", "high", "low")
+            self._write(market, "table", snapshot_ts=snapshot_ts, rows=[dict(zip(keys, row)) for row in rows])
+
+    def alert_added(self, market, symbol, pct, notional, price):
+        self._write(market, "alert_added", symbol=symbol, pct=pct, notional=notional, price=price)
+
+    def alert_removed(self, market, symbol, initial, pct):
+        self._write(market, "alert_removed", symbol=symbol, initial=initial, pct=pct)
+
+    def log(self, market, message):
+        self._write(market, "log", message=message)
+
+    def close(self):
+        if self._own:
+            self._fh.close()
+
+
+class LogSink:
+    """
+    Forwards scanner log lines and alert changes to the `logging` module,
+    optionally into a file of its own.
+    """
+    def __init__(self, path: str = None, logger_name: str = "perp-scanner"):
+        self.logger = logging.getLogger(logger_name)
+        self.logger.setLevel(logging.INFO)
+        if path:
+            handler = logging.FileHandler(path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            self.logger.addHandler(handler)
+
+    def log(self, market, message):
+        self.logger.info("[%s] %s", market, message)
+
+
+class TelegramSink:
+    """
+    Sends each scan's new alerts through the Telegram notifier as one digest.
+    Messages go out from the notifier's background dispatcher, so a slow or
+    rate-limited Telegram never holds up a scan. The notifier reads its token
+    from settings at import, so it is only loaded when this sink is used.
+    """
+    def __init__(self):
+        from utils.notifications import telegram_notifier
+        self._notifier = telegram_notifier
+        self._digests = DigestCollector(telegram_notifier.alert_digest)
+
+    def alert_added(self, market, symbol, pct, notional, price):
+        self._digests.alert_added(market, symbol, pct, notional, price)
+
+    def scan_finished(self, market):
+        self._digests.scan_finished(market)
+
+    def close(self):
+        self._digests.flush()
+        self._notifier.notifier.dispatcher.close()
+
+
+class DesktopSink:
+    """
+    Pops a desktop notification for each scan's new alerts unless `muted`:
+    one per alert for a single alert, one summary for several. plyer runs on
+    a background dispatcher, off the scanner threads.
+    """
+    def __init__(self, muted: bool = False):
+        self.muted = muted
+        self._dispatcher = NotificationDispatcher("desktop")
+        self._digests = DigestCollector(self._queue)
+
+    def alert_added(self, market, symbol, pct, notional, price):
+        if not self.muted:
+            self._digests.alert_added(market, symbol, pct, notional, price)
+
+    def scan_finished(self, market):
+        self._digests.scan_finished(market)
+
+    def _queue(self, market, alerts):
+        if len(alerts) == 1:
+            symbol, pct, notional, _ = alerts[0]
+            if market == "futures":
+                title, message = "New Futures Alert", f"{symbol} at {pct:.2f}% (Vol: ${notional:,.1f})"
+            else:
+                title, message = "New Spot Alert", f"{symbol} changed by {pct:.2f}% with volume ${notional:,.1f}"
+        else:
+            shown = ", ".join(f"{symbol} {pct:+.1f}%" for symbol, pct, _, _ in alerts[:DESKTOP_DIGEST_SYMBOLS])
+            more = len(alerts) - DESKTOP_DIGEST_SYMBOLS
+            title = f"{len(alerts)} New {'Futures' if market == 'futures' else 'Spot'} Alerts"
+            message = shown + (f" and {more} more" if more > 0 else "")
+        self._dispatcher.submit(self._notify, title, message)
+
+    @staticmethod
+    def _notify(title, message):
+        from plyer import notification
+        notification.notify(title=title, message=message, timeout=5)
+
+    def close(self):
+        self._digests.flush()
+        self._dispatcher.close()
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "utils" / "screenshot" / "chart_api" / "get_charts.py"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 32
+
+
+class _ChartImg(BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(PNG)))
+        self.end_headers()
+        self.wfile.write(PNG)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_cli(tmp_path, *args, url="http://127.0.0.1:9/"):
+    # run as a script from an unrelated directory, so only the script's own directory is on sys.path
+    env = {**os.environ, "HOME": str(tmp_path), "CHART_IMG_API_KEY": "test", "CHART_IMG_API_URL": url}
+    env.pop("PYTHONPATH", None)
+    return subprocess.run([sys.executable, str(SCRIPT), *args], cwd=tmp_path, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+
+def test_cli_starts_when_run_directly(tmp_path):
+    result = run_cli(tmp_path, "--help")
+    assert result.returncode == 0, result.stderr
+    assert "--no-cache" in result.stdout
+
+
+def test_cli_cache_and_no_cache(tmp_path):
+    _ChartImg.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChartImg)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        for _ in range(2):
+            result = run_cli(tmp_path, "KRAKEN:BTCUSD", "-i", "4h", url=url)
+            assert result.returncode == 0, result.stderr
+        assert _ChartImg.requests == 1              # the second run is served from the disk cache
+
+        for _ in range(2):
+            result = run_cli(tmp_path, "KRAKEN:BTCUSD", "-i", "4h", "--no-cache", url=url)
+            assert result.returncode == 0, result.stderr
+        assert _ChartImg.requests == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert (tmp_path / "charts" / "chart-KRAKEN_BTCUSD-4h.png").read_bytes() == PNG
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from indicators import kernels, streaming
+from utils.indicators.rsi import compute_rsi
+
+RTOL = 1e-9
+SIZES = (15, 300, 5_000)     # just past the RSI warm-up, a typical history, a long one
+
+
+def random_walk(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    return pd.DataFrame({"high": close + spread, "low": close - spread, "close": close})
+
+
+def assert_same(actual, expected):
+    """Same warm-up (NaN) positions, values equal within RTOL of the series' scale."""
+    actual, expected = np.asarray(actual, dtype=float), np.asarray(expected, dtype=float)
+    assert actual.shape == expected.shape
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    ok = ~np.isnan(expected)
+    if ok.any():
+        scale = max(np.max(np.abs(expected[ok])), 1e-12)
+        assert np.max(np.abs(actual[ok] - expected[ok])) <= RTOL * scale
+
+
+def streamed(indicator, *series) -> np.ndarray:
+    """Feed the series to a streaming indicator one candle at a time; None → NaN."""
+    out = [indicator.update(*candle) for candle in zip(*series)]
+    return np.array([np.nan if v is None else v for v in out], dtype=float)
+
+
+def wilder_rsi_loop(closes: pd.Series, period: int = 14) -> float:
+    """compute_rsi as it was before the kernels: simple-mean seed, then a Python loop."""
+    delta = closes.diff().dropna()
+    gains, losses = delta.clip(lower=0), -delta.clip(upper=0)
+    avg_gain, avg_loss = gains.iloc[:period].mean(), losses.iloc[:period].mean()
+    for g, l in zip(gains.iloc[period:], losses.iloc[period:]):
+        avg_gain = (avg_gain * (period - 1) + g) / period
+        avg_loss = (avg_loss * (period - 1) + l) / period
+    rs = avg_gain / avg_loss if avg_loss != 0 else float("inf")
+    return 100 - (100 / (1 + rs))
+
+
+@pytest.fixture(params=SIZES)
+def bars(request):
+    return random_walk(request.param)
+
+
+# ── RSI ──────────────────────────────────────────────────────────────────────
+def test_rsi_matches_compute_rsi(bars):
+    closes = bars["close"]
+    expected = wilder_rsi_loop(closes)
+    assert kernels.rsi(closes.to_numpy())[-1] == pytest.approx(expected, rel=RTOL)
+    assert compute_rsi(closes) == pytest.approx(expected, rel=RTOL)
+
+
+def test_rsi_matches_streaming(bars):
+    close = bars["close"].to_numpy()
+    assert_same(kernels.rsi(close), streamed(streaming.RSI(14), close))
+
+
+def test_rsi_without_losses_is_100():
+    close = np.arange(1.0, 31.0)
+    assert kernels.rsi(close)[-1] == 100.0
+    assert compute_rsi(pd.Series(close)) == 100.0
+
+
+# ── moving averages ──────────────────────────────────────────────────────────
+@pytest.mark.parametrize("length", [9, 21, 200])
+def test_ema_matches_pandas_ewm(bars, length):
+    close = bars["close"]
+    assert_same(kernels.ema(close.to_numpy(), length), close.ewm(span=length, adjust=False).mean())
+
+
+@pytest.mark.parametrize("length", [9, 200])
+def test_sma_seeded_ema_matches_streaming(bars, length):
+    close = bars["close"].to_numpy()
+    assert_same(kernels.ema(close, length, sma_seed=True), streamed(streaming.EMA(length, sma_seed=True), close))
+
+
+def test_rma_matches_pandas_and_streaming(bars):
+    close = bars["close"]
+    expected = close.ewm(alpha=1 / 14, adjust=True, min_periods=14).mean()
+    assert_same(kernels.rma(close.to_numpy(), 14), expected)
+    assert_same(kernels.rma(close.to_numpy(), 14), streamed(streaming.RMA(14), close.to_numpy()))
+
+
+def test_sma_matches_streaming(bars):
+    close = bars["close"].to_numpy()
+    assert_same(kernels.sma(close, 20), streamed(streaming.SMA(20), close))
+
+
+# ── oscillators / volatility ─────────────────────────────────────────────────
+def test_stochrsi_matches_streaming(bars):
+    close = bars["close"].to_numpy()
+    k, d = kernels.stochrsi(close)
+    stream = streaming.StochRSI()
+    pairs = [stream.update(c) for c in close]
+    assert_same(k, [np.nan if kv is None else kv for kv, _ in pairs])
+    assert_same(d, [np.nan if dv is None else dv for _, dv in pairs])
+
+
+def test_atr_matches_streaming(bars):
+    high, low, close = (bars[c].to_numpy() for c in ("high", "low", "close"))
+    assert_same(kernels.atr(high, low, close), streamed(streaming.ATR(14), high, low, close))
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from service import recorder
+from service.recorder import ColumnarRecorder, Segment
+
+ROWS = [("BTC/USD", 12.0, 1e6, 100.0, 110.0, 90.0), ("ETH/USD", -11.0, 5e5, 10.0, 12.0, 9.0)]
+LATER = [("SOL/USD", 15.0, 2e5, 1.0, 1.1, 0.9)]
+
+
+def test_resume_after_torn_write_keeps_columns_aligned(tmp_path):
+    ts = 1_750_000_000.0
+    rec = ColumnarRecorder(tmp_path)
+    rec.snapshot("spot", ROWS, ts)
+    rec.close()
+
+    (segment_dir,) = recorder.segments(tmp_path, "spot")
+    # a crash after the pct column got one more row than the others
+    with open(segment_dir / "pct.f8", "ab") as fh:
+        np.array([99.0]).tofile(fh)
+
+    rec = ColumnarRecorder(tmp_path)
+    rec.snapshot("spot", LATER, ts + 60)
+    rec.close()
+
+    segment = Segment(segment_dir)
+    assert len(segment) == 3
+    sizes = {name: len(col) for name, col in segment.columns.items()}
+    assert set(sizes.values()) == {3}
+    snapshots = list(segment.snapshots())
+    assert [t for t, _ in snapshots] == [ts, ts + 60]
+    symbol, pct, volume, price, high, low = snapshots[1][1]
+    assert list(symbol) == ["SOL/USD"]
+    assert list(pct) == [15.0]
+    assert list(price) == [1.0]
+    first = snapshots[0][1]
+    assert list(first[0]) == ["BTC/USD", "ETH/USD"]
+    assert list(first[1]) == [12.0, -11.0]
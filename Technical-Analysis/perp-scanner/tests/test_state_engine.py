@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from utils.alerts.state_engine import AlertStateEngine
+
+# (symbol, pct, volume, price, high, low); the PI_ and PF_ perpetuals both report pair "XBT:USD"
+INVERSE = ("XBT:USD", 12.0, 1_000.0, 100.0, 101.0, 80.0)
+LINEAR  = ("XBT:USD", 12.5, 9_000.0, 100.5, 101.0, 80.0)
+ETH     = ("ETH:USD", 15.0, 5_000.0, 10.0, 10.1, 8.0)
+
+
+def update(engine, rows):
+    return engine.update(*zip(*rows))
+
+
+def test_duplicate_symbols_keep_the_highest_volume_row():
+    for rows in ([INVERSE, LINEAR, ETH], [LINEAR, ETH, INVERSE]):
+        engine = AlertStateEngine(percent_threshold=10.0, deviation_threshold=5.0)
+        result = update(engine, rows)
+        assert [row[0] for row in result.rows] == ["XBT:USD", "ETH:USD"]
+        assert [a[0] for a in result.added].count("XBT:USD") == 1
+        xbt = result.rows[0]
+        assert xbt[3] == 12.5 and xbt[5] == 100.5
+        assert engine.as_map()["XBT:USD"] == {"initial": 12.5, "prev": 12.5}
+
+
+def test_duplicate_symbols_share_one_alert_state():
+    engine = AlertStateEngine(percent_threshold=10.0, deviation_threshold=5.0)
+    update(engine, [INVERSE, LINEAR])
+    # the low-volume contract retracing alone does not remove the alert
+    result = update(engine, [INVERSE[:1] + (1.0,) + INVERSE[2:], LINEAR[:1] + (11.0,) + LINEAR[2:]])
+    assert result.removed == []
+    assert engine.as_map()["XBT:USD"] == {"initial": 12.5, "prev": 11.0}
@@ -0,0 +1,141 @@
+import numpy as np
+
+
+class AlertUpdate:
+    """
+    Result of one AlertStateEngine.update() call.
+
+    - added:   [(symbol, pct, notional_volume, price), ...] newly alerted symbols
+    - removed: [(symbol, initial, pct), ...] alerts dropped this cycle, where
+               `pct` is the change that triggered the removal
+    - rows:    [(symbol, initial, prev, now, notional_volume, price, high, low), ...]
+               for every alert present in the snapshot, sorted by notional
+               volume then symbol, both descending
+    """
+    def __init__(self, added, removed, rows):
+        self.added = added
+        self.removed = removed
+        self.rows = rows
+
+
+class AlertStateEngine:
+    """
+    Exchange-agnostic alert bookkeeping over columnar ticker snapshots.
+
+    A symbol is added once |pct| reaches `percent_threshold` (and, when
+    `proximity` is set, its price sits within that fraction of the 24h high
+    or low). It is removed once it retraces `deviation_threshold` points from
+    the pct it was first alerted at. `top_n` restricts each snapshot to the
+    N highest-volume symbols; alerted symbols that fall outside it are checked
+    against their last seen pct instead.
+
+    Rows are keyed by symbol, one per symbol per snapshot. When a snapshot
+    holds a symbol more than once (e.g. Kraken's PI_ and PF_ perpetuals
+    share the display pair "XBT:USD") only the highest-volume row is used,
+    whatever order the exchange lists them in.
+
+    State is kept as arrays sorted by symbol so every step of update() is a
+    handful of vectorized passes rather than a per-row Python loop.
+    """
+    def __init__(self, percent_threshold: float, deviation_threshold: float,
+                 top_n: int = None, proximity: float = None):
+        self.percent_threshold = percent_threshold
+        self.deviation_threshold = deviation_threshold
+        self.top_n = top_n
+        self.proximity = proximity
+        self._symbol = np.empty(0, dtype=str)
+        self._initial = np.empty(0, dtype=float)
+        self._prev = np.empty(0, dtype=float)
+
+    def __len__(self):
+        return len(self._symbol)
+
+    def __contains__(self, symbol):
+        i = np.searchsorted(self._symbol, symbol)
+        return i < len(self._symbol) and self._symbol[i] == symbol
+
+    def as_map(self) -> dict:
+        """Current state as {symbol: {'initial': float, 'prev': float}}."""
+        return {
+            str(s): {'initial': float(i), 'prev': float(p)}
+            for s, i, p in zip(self._symbol, self._initial, self._prev)
+        }
+
+    def _removal_mask(self, initial, pct):
+        t, d = self.percent_threshold, self.deviation_threshold
+        return ((initial >= t) & (pct <= initial - d)) | ((initial <= -t) & (pct >= initial + d))
+
+    def update(self, symbol, pct, volume, price, high, low) -> AlertUpdate:
+        """
+        Apply one snapshot (equal-length sequences or arrays) and return the
+        added/removed alerts plus the sorted table rows.
+        """
+        symbol = np.asarray(symbol, dtype=str)
+        pct    = np.asarray(pct, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        price  = np.asarray(price, dtype=float)
+        high   = np.asarray(high, dtype=float)
+        low    = np.asarray(low, dtype=float)
+
+        # one row per symbol: the highest-volume duplicate, original order preserved
+        by_volume = np.argsort(-volume, kind="stable")
+        _, first = np.unique(symbol[by_volume], return_index=True)
+        keep = np.sort(by_volume[first])
+        if self.top_n is not None:
+            keep = keep[np.argsort(-volume[keep], kind="stable")[:self.top_n]]
+        symbol, pct, volume, price, high, low = (
+            a[keep] for a in (symbol, pct, volume, price, high, low)
+        )
+
+        # match snapshot rows against alerted state
+        n_state = len(self._symbol)
+        pos = np.searchsorted(self._symbol, symbol)
+        pos_c = np.minimum(pos, max(n_state - 1, 0))
+        alerted = (pos < n_state) & (self._symbol[pos_c] == symbol) if n_state else np.zeros(len(symbol), bool)
+
+        # retained / removed among alerted symbols present in the snapshot
+        initial = np.where(alerted, self._initial[pos_c] if n_state else 0.0, pct)
+        prev    = np.where(alerted, self._prev[pos_c] if n_state else 0.0, pct)
+        drop_seen = alerted & self._removal_mask(initial, pct)
+        retained = alerted & ~drop_seen
+
+        # new alerts among symbols not yet alerted
+        new = ~alerted & (np.abs(pct) >= self.percent_threshold)
+        if self.proximity is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                near_high = (high > 0) & (np.abs(high - price) / high <= self.proximity)
+                near_low  = (low > 0) & (np.abs(price - low) / low <= self.proximity)
+            new &= near_high | near_low
+
+        # alerted symbols missing from the snapshot are judged on their last pct
+        seen = np.zeros(n_state, dtype=bool)
+        seen[pos_c[alerted]] = True
+        drop_missing = ~seen & self._removal_mask(self._initial, self._prev)
+
+        notional = volume * price
+        added = list(zip(symbol[new].tolist(), pct[new].tolist(), notional[new].tolist(), price[new].tolist()))
+        removed = list(zip(
+            np.concatenate([symbol[drop_seen], self._symbol[drop_missing]]).tolist(),
+            np.concatenate([initial[drop_seen], self._initial[drop_missing]]).tolist(),
+            np.concatenate([pct[drop_seen], self._prev[drop_missing]]).tolist(),
+        ))
+
+        # next state: retained rows take the new pct as prev, new rows start fresh
+        self._prev[pos_c[retained]] = pct[retained]
+        keep_state = ~(drop_missing | np.isin(np.arange(n_state), pos_c[drop_seen]))
+        sym_next = np.concatenate([self._symbol[keep_state], symbol[new]])
+        order = np.argsort(sym_next, kind="stable")
+        self._symbol = sym_next[order]
+        self._initial = np.concatenate([self._initial[keep_state], pct[new]])[order]
+        self._prev = np.concatenate([self._prev[keep_state], pct[new]])[order]
+
+        # table rows for every live alert in the snapshot
+        shown = new | retained
+        idx = np.flatnonzero(shown)
+        order = np.lexsort((symbol[idx], np.round(notional[idx], 1)))[::-1]
+        idx = idx[order]
+        rows = list(zip(
+            symbol[idx].tolist(), initial[idx].tolist(), prev[idx].tolist(), pct[idx].tolist(),
+            notional[idx].tolist(), price[idx].tolist(), high[idx].tolist(), low[idx].tolist(),
+        ))
+        return AlertUpdate(added, removed, rows)
@@ -1,30 +1,58 @@
-import ccxt
 import pandas as pd
+import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from utils.net import http_client
+from utils.markets.market_cache import MarketCache
+
+# the shared candle store lives in Technical-Analysis/marketdata
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from marketdata.candle_store import store as candle_store
+from marketdata import resample
+from indicators.streaming import RSI
+from indicators import kernels
 
 # ─── CONFIG ──────────────────────────────────────────────────────────────────
 EXCHANGE_ID   = "kraken"
 RSI_PERIOD    = 14
 HISTORY_BARS  = 500    # fetch this many candles to let smoothing converge
 CCXT_TIMEOUT  = 30000  # in ms
+TIMEFRAMES    = ("1h", "4h", "1d")
+POOL_WORKERS  = 6      # one bounded pool for every RSI download (popups and rsi_service)
+CACHE_TTL_SEC = 30     # a looked-up RSI is reused this long, and never past its candle's close
+TIMEFRAME_SEC = {"1h": 3600, "4h": 4 * 3600, "1d": 24 * 3600}
+
+pool = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix="rsi")
+
+def _make_exchange():
+    import ccxt
+    return getattr(ccxt, EXCHANGE_ID)({
+        "enableRateLimit": True,
+        "options": {"defaultType": "spot"},
+        "timeout": CCXT_TIMEOUT,
+        "session": http_client.get_session(),
+    })
 
-# Initialize Kraken
-exchange = getattr(ccxt, EXCHANGE_ID)({
-    "enableRateLimit": True,
-    "options": {"defaultType": "spot"},
-    "timeout": CCXT_TIMEOUT,
-})
-exchange.load_markets()
+def log(message: str) -> None:
+    """Background failures (e.g. a market refresh); the GUI points this at its log panel."""
+    print(message, file=sys.stderr)
+
+# Kraken client, built on first use with its markets from the on-disk snapshot
+markets = MarketCache(EXCHANGE_ID, _make_exchange, log=lambda message: log(message))
+
+def get_exchange():
+    return markets.exchange()
 
 def fetch_ohlc_ccxt(symbol: str, timeframe: str, limit: int = HISTORY_BARS):
     """
-    Fetch `limit` OHLCV bars via CCXT and return a pandas Series of closes 
-    (oldest first) so smoothing has enough history to match TradingView.
+    Return the last `limit` closes (oldest first) from the shared candle
+    store, topping it up via CCXT, so smoothing has enough history to match
+    TradingView.
     """
-    ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-    df = pd.DataFrame(ohlcv, columns=["ts","open","high","low","close","vol"])
-    df = df.sort_values("ts")
+    df = candle_store.ohlcv(get_exchange(), symbol, timeframe, limit=limit)
     return df["close"].astype(float).reset_index(drop=True)
 
 def compute_rsi(closes: pd.Series, period: int = RSI_PERIOD) -> float:
@@ -32,46 +60,138 @@ def compute_rsi(closes: pd.Series, period: int = RSI_PERIOD) -> float:
     Compute Wilder’s RSI over the full `closes` history and return the final value.
     This matches TradingView’s native indicator exactly.
     """
-    delta = closes.diff().dropna()
-    gains = delta.clip(lower=0)
-    losses = -delta.clip(upper=0)
+    values = kernels.rsi(closes.to_numpy(dtype=float), period)
+    return float(values[-1]) if len(values) and values[-1] == values[-1] else None
 
-    # initial average gain/loss (simple mean over first `period` deltas)
-    avg_gain = gains.iloc[:period].mean()
-    avg_loss = losses.iloc[:period].mean()
+# (symbol, timeframe) → (RSI state over closed candles, ts of the last closed candle fed)
+_rsi_states = {}
+_rsi_states_lock = threading.Lock()
 
-    # Wilder smoothing across the rest of the data
-    gains_rest  = gains.iloc[period:]
-    losses_rest = losses.iloc[period:]
-    for g, l in zip(gains_rest, losses_rest):
-        avg_gain = (avg_gain * (period - 1) + g) / period
-        avg_loss = (avg_loss * (period - 1) + l) / period
+def advance_rsi_state(key, ts, closes, period: int = RSI_PERIOD) -> None:
+    """
+    Advance the Wilder state for `key` over closed candles (ts, closes).
+    Only candles newer than the last one fed are consumed; the state is
+    reseeded from the given history when there is none yet or the history
+    no longer overlaps it.
+    """
+    ts, closes = list(ts), [float(c) for c in closes]
+    if not ts:
+        return
+    with _rsi_states_lock:
+        state = _rsi_states.get(key)
+        if state is None or state[0].period != period or not (ts[0] <= state[1] <= ts[-1]):
+            rsi = RSI(period)
+            rsi.seed(closes)
+        else:
+            rsi, last_ts = state
+            rsi.seed([c for t, c in zip(ts, closes) if t > last_ts])
+        _rsi_states[key] = (rsi, ts[-1])
+
+def peek_rsi(key, close: float) -> float:
+    """RSI for `key` if the open candle closed at `close` (None without a state)."""
+    with _rsi_states_lock:
+        state = _rsi_states.get(key)
+        return state[0].peek(float(close)) if state else None
+
+def closed_rsi(key) -> float:
+    """RSI as of the last closed candle fed for `key` (None without a state)."""
+    with _rsi_states_lock:
+        state = _rsi_states.get(key)
+        return state[0].value if state else None
+
+def streaming_rsi(key, ts, closes, period: int = RSI_PERIOD) -> float:
+    """
+    RSI of the newest candle in (ts, closes), treating it as still open and
+    everything before it as closed.
+    """
+    ts, closes = list(ts), list(closes)
+    if len(ts) < 2:
+        return None
+    advance_rsi_state(key, ts[:-1], closes[:-1], period)
+    return peek_rsi(key, closes[-1])
 
-    rs  = avg_gain / avg_loss if avg_loss != 0 else float("inf")
-    return 100 - (100 / (1 + rs))
+def fetch_ohlcv_df(symbol: str, tf: str, limit: int = HISTORY_BARS) -> pd.DataFrame:
+    """Stored candles for `symbol`; 4h and 1d are derived from the 1h sync where verified."""
+    return resample.ohlcv(get_exchange(), symbol, tf, limit=limit)
 
 def _rsi_for(symbol: str, tf: str) -> float:
-    closes = fetch_ohlc_ccxt(symbol, tf)
-    return compute_rsi(closes)
+    df = fetch_ohlcv_df(symbol, tf)
+    return streaming_rsi((symbol, tf), df["ts"], df["close"])
+
+# (symbol, timeframe, close time of the candle it was computed in) → (RSI, expiry)
+_rsi_cache = {}
+_rsi_cache_lock = threading.Lock()
+
+def _cache_key(symbol: str, tf: str, now: float):
+    tf_sec = TIMEFRAME_SEC[tf]
+    close = (now // tf_sec + 1) * tf_sec
+    return (symbol, tf, close), min(now + CACHE_TTL_SEC, close)
+
+def cached_rsi(symbol: str, tf: str) -> float:
+    """The cached RSI for `symbol` on `tf` if still fresh, else None. Never blocks."""
+    now = time.time()
+    key, _ = _cache_key(symbol, tf, now)
+    with _rsi_cache_lock:
+        entry = _rsi_cache.get(key)
+    return entry[0] if entry and entry[1] > now else None
+
+def rsi_for(symbol: str, tf: str) -> float:
+    """RSI for `symbol` on `tf`, from the TTL cache or computed (and cached)."""
+    value = cached_rsi(symbol, tf)
+    if value is None:
+        value = _rsi_for(symbol, tf)
+        now = time.time()
+        key, expiry = _cache_key(symbol, tf, now)
+        with _rsi_cache_lock:
+            for k in [k for k, (_, exp) in _rsi_cache.items() if exp <= now]:
+                del _rsi_cache[k]
+            if value is not None:
+                _rsi_cache[key] = (value, expiry)
+    return value
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+def submit_timeframes(symbol: str, timeframes=TIMEFRAMES, fn=None) -> dict:
+    """
+    Submit `fn(symbol, tf)` (default rsi_for) for every timeframe on `pool`
+    and return {tf: Future}. A timeframe derived from another one in the
+    list (4h, 1d from 1h) is only submitted once that base has finished, so
+    it resamples the fresh base candles instead of racing their sync.
+    """
+    fn = fn or rsi_for
+    timeframes = tuple(timeframes)
+    futures = {tf: pool.submit(fn, symbol, tf) for tf in timeframes
+               if resample.RESAMPLE_FROM.get(tf) not in timeframes}
+    for tf in timeframes:
+        if tf in futures:
+            continue
+        futures[tf] = chained = Future()
+
+        def start(_, tf=tf, chained=chained):
+            try:
+                inner = pool.submit(fn, symbol, tf)
+            except RuntimeError as e:       # pool shut down
+                chained.set_exception(e)
+                return
+            inner.add_done_callback(lambda f: _copy_outcome(f, chained))
+        futures[resample.RESAMPLE_FROM[tf]].add_done_callback(start)
+    return futures
 
 def fetch_rsi_intervals(symbol: str) -> dict:
     """
-    Concurrently fetch RSI for 1h, 4h, and 1d for `symbol`.
+    Fetch RSI for 1h, 4h, and 1d for `symbol` on the shared pool. The base
+    timeframe is synced first so the others can be derived from it.
     """
-    funcs = {
-        "1h": lambda s: _rsi_for(s, "1h"),
-        "4h": lambda s: _rsi_for(s, "4h"),
-        "1d": lambda s: _rsi_for(s, "1d"),
-    }
     results = {}
-    with ThreadPoolExecutor(max_workers=3) as ex:
-        futures = { ex.submit(fn, symbol): tf for tf, fn in funcs.items() }
-        for f in as_completed(futures):
-            tf = futures[f]
-            try:
-                results[tf] = f.result()
-            except Exception:
-                results[tf] = None
+    for tf, future in submit_timeframes(symbol).items():
+        try:
+            results[tf] = future.result()
+        except Exception:
+            results[tf] = None
     return results
 
 # ─── EXAMPLE USAGE ────────────────────────────────────────────────────────────
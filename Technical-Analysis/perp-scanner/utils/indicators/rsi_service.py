@@ -0,0 +1,145 @@
+import threading
+import time
+
+from utils.indicators import rsi
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+CLOSE_GRACE_SEC = 5      # refresh this long after a candle closes, once the exchange has finalised it
+RETRY_SEC       = 60     # retry a failed refresh after this long
+TICK_SEC        = 1.0    # how often due refreshes are checked for
+
+
+def to_token(symbol: str) -> str:
+    """Table symbol (spot "XBT/USD", futures "XBT:USD") → ccxt symbol."""
+    return symbol.replace(":", "/")
+
+
+class RsiMatrixService:
+    """
+    Keeps RSI for every watched symbol × timeframe up to date in the background.
+
+    Each (symbol, timeframe) is downloaded once, then refreshed only when its
+    candle closes; between closes the live value is the cached closed-candle
+    state peeked with the latest price from the alert tables, so it costs no
+    requests. Downloads run on rsi.pool, the bounded pool popups also use,
+    with at most rsi.POOL_WORKERS of them queued at a time so a popup never
+    waits behind the whole backlog. A timeframe derived from another (4h, 1d
+    from 1h) waits while its base is due or downloading, so it is resampled
+    from the fresh base candles instead of fetched natively.
+    """
+    def __init__(self, timeframes=rsi.TIMEFRAMES):
+        self.timeframes = tuple(timeframes)
+        self._lock = threading.Lock()
+        self._sources = {}      # source name → {token: last price}
+        self._due = {}          # (token, tf) → epoch seconds of the next refresh
+        self._values = {}       # (token, tf) → RSI at the last refresh
+        self._inflight = set()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # ── control ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rsi-service", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def watch(self, source: str, prices: dict):
+        """
+        Replace the symbols watched for `source` (e.g. "spot") with the keys of
+        `prices` ({table symbol: last price}). New symbols are scheduled at
+        once; symbols no source watches any more stop being refreshed.
+        """
+        tokens = {to_token(sym): price for sym, price in prices.items()}
+        with self._lock:
+            self._sources[source] = tokens
+            watched = set().union(*self._sources.values())
+            for token in watched:
+                for tf in self.timeframes:
+                    self._due.setdefault((token, tf), 0.0)
+            for key in [k for k in self._due if k[0] not in watched]:
+                del self._due[key]
+                self._values.pop(key, None)
+        self._wake.set()
+
+    def prioritize(self, symbol: str):
+        """Refresh `symbol` now, e.g. when a popup finds it missing."""
+        token = to_token(symbol)
+        with self._lock:
+            for tf in self.timeframes:
+                if (token, tf) in self._due:
+                    self._due[(token, tf)] = 0.0
+        self._wake.set()
+
+    # ── reads ────────────────────────────────────────────────────────────────
+    def get(self, symbol: str) -> dict:
+        """{timeframe: RSI or None} for `symbol`, live against the latest known price."""
+        token = to_token(symbol)
+        with self._lock:
+            price = next((p[token] for p in self._sources.values() if token in p), None)
+            cached = {tf: self._values.get((token, tf)) for tf in self.timeframes}
+        out = {}
+        for tf, value in cached.items():
+            live = rsi.peek_rsi((token, tf), price) if price and value is not None else None
+            out[tf] = live if live is not None else value
+        return out
+
+    def matrix(self) -> dict:
+        with self._lock:
+            tokens = {token for token, _ in self._due}
+        return {token: self.get(token) for token in tokens}
+
+    # ── background loop ──────────────────────────────────────────────────────
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                free = rsi.POOL_WORKERS - len(self._inflight)
+                due = sorted((t, k) for k, t in self._due.items() if t <= now and k not in self._inflight)
+                for _, key in due:
+                    if free <= 0:
+                        break
+                    if self._waits_for_base(key, now):
+                        continue
+                    self._inflight.add(key)
+                    free -= 1
+                    rsi.pool.submit(self._refresh, key)
+            self._wake.wait(TICK_SEC)
+            self._wake.clear()
+
+    def _waits_for_base(self, key, now: float) -> bool:
+        """True while the timeframe `key` is resampled from is downloading or due (caller holds the lock)."""
+        token, tf = key
+        base = rsi.resample.RESAMPLE_FROM.get(tf)
+        if base is None or (token, base) not in self._due:
+            return False
+        return (token, base) in self._inflight or self._due[(token, base)] <= now
+
+    def _refresh(self, key):
+        token, tf = key
+        try:
+            tf_sec = rsi.get_exchange().parse_timeframe(tf)
+            df = rsi.fetch_ohlcv_df(token, tf)
+            ts, closes = df["ts"].tolist(), df["close"].tolist()
+            now = time.time()
+            if ts and ts[-1] / 1000 + tf_sec > now:
+                # newest candle still open: keep it out of the state, peek it instead
+                rsi.advance_rsi_state(key, ts[:-1], closes[:-1])
+                value = rsi.peek_rsi(key, closes[-1])
+            else:
+                rsi.advance_rsi_state(key, ts, closes)
+                value = rsi.closed_rsi(key)
+            next_due = (now // tf_sec + 1) * tf_sec + CLOSE_GRACE_SEC
+        except Exception:
+            value, next_due = None, time.time() + RETRY_SEC
+        with self._lock:
+            self._inflight.discard(key)
+            if key in self._due:
+                self._due[key] = next_due
+                if value is not None:
+                    self._values[key] = value
+        self._wake.set()
@@ -0,0 +1,97 @@
+"""
+Lazily built ccxt clients whose market metadata comes from an on-disk snapshot.
+
+`load_markets()` is a multi-second round-trip (and fails offline), so nothing
+here touches the network at import. The first `exchange()` call builds the
+client and fills its markets from the snapshot. Every call checks the age of
+the markets it hands out; once they are older than the TTL they are still
+used, and refreshed on a background thread, so long-running processes pick
+up new and delisted pairs. Only when there is no snapshot at all does the
+first caller wait for the exchange.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+from utils.metrics.scan_metrics import metrics
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+CACHE_DIR        = Path.home() / "Total" / ".kraken_usd_alerts" / "markets"
+MARKETS_TTL_SEC  = 6 * 3600    # refresh markets older than this in the background
+RETRY_SEC        = 10 * 60     # after a failed refresh, try again this much later
+
+
+class MarketCache:
+    """
+    One ccxt client per cache, created on first use by `factory()`, with its
+    markets loaded from `CACHE_DIR/<name>.json` when possible. A failed
+    background refresh is counted as "markets.<name>.refresh_failed" and
+    passed to `log(message)` when given.
+    """
+    def __init__(self, name: str, factory, ttl: float = MARKETS_TTL_SEC, cache_dir: Path = CACHE_DIR,
+                 log=None):
+        self.name = name
+        self.factory = factory
+        self.log = log
+        self.ttl = ttl
+        self.path = Path(cache_dir) / f"{name}.json"
+        self._exchange = None
+        self._refresh_at = 0.0      # epoch seconds after which exchange() starts a refresh
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def exchange(self):
+        """The client, with markets loaded (from disk if a snapshot exists)."""
+        exchange = self._exchange
+        if exchange is None:
+            with self._lock:
+                if self._exchange is None:
+                    exchange = self.factory()
+                    saved_at = self._load_snapshot(exchange)
+                    if saved_at is None:
+                        self._fetch(exchange)
+                    else:
+                        self._refresh_at = saved_at + self.ttl
+                    self._exchange = exchange
+                exchange = self._exchange
+        if time.time() >= self._refresh_at:
+            self.refresh_async(exchange)
+        return exchange
+
+    def refresh_async(self, exchange=None):
+        """Reload the markets from the exchange on a daemon thread (no-op if one is running)."""
+        if not self._refreshing.acquire(blocking=False):
+            return
+        def run():
+            try:
+                self._fetch(exchange or self.exchange())
+            except Exception as exc:
+                self._refresh_at = time.time() + RETRY_SEC
+                metrics.incr(f"markets.{self.name}.refresh_failed")
+                if self.log is not None:
+                    self.log(f"{self.name} markets refresh failed: {exc}")
+            finally:
+                self._refreshing.release()
+        threading.Thread(target=run, name=f"markets-{self.name}", daemon=True).start()
+
+    # ── snapshot ─────────────────────────────────────────────────────────────
+    def _load_snapshot(self, exchange):
+        """Fill `exchange` from the snapshot; returns its save time, or None if unusable."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            exchange.set_markets(snap["markets"], snap.get("currencies"))
+            return snap["saved_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _fetch(self, exchange):
+        exchange.load_markets(reload=True)
+        self._refresh_at = time.time() + self.ttl
+        snap = {"saved_at": time.time(), "markets": exchange.markets, "currencies": exchange.currencies}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snap, f)
+        tmp.replace(self.path)
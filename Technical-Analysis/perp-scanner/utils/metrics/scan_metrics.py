@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+WINDOW_SIZE = 1000                 # samples kept per timing for the rolling percentiles
+PERCENTILES = (50, 90, 99)
+
+
+class RollingStat:
+    """
+    Last WINDOW_SIZE samples of one timing (milliseconds), plus a lifetime count.
+    """
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.last = None
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.last = value
+
+    def summary(self) -> dict:
+        values = np.fromiter(self.samples, dtype=float, count=len(self.samples))
+        out = {"count": self.count, "last": self.last}
+        if len(values):
+            for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                out[f"p{p}"] = float(v)
+            out["max"] = float(values.max())
+        return out
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of rolling timings and counters.
+
+    Timings are in milliseconds and named "<scope>.<stage>", e.g.
+    "spot.fetch", "futures.staleness_paint" or "request.api.kraken.com".
+    Counters count events such as "errors.rate_limit" or "retries".
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+        self.started = time.time()
+
+    def observe(self, name: str, ms: float):
+        with self._lock:
+            stat = self._timings.get(name)
+            if stat is None:
+                stat = self._timings[name] = RollingStat()
+            stat.add(ms)
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000.0)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            timings = {name: stat.summary() for name, stat in sorted(self._timings.items())}
+            counters = dict(sorted(self._counters.items()))
+        return {"ts": time.time(), "uptime_sec": time.time() - self.started,
+                "timings_ms": timings, "counters": counters}
+
+    def dump(self, path: str):
+        """Write the current snapshot as JSON to `path`."""
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.snapshot(), fh, indent=2)
+
+    def format_text(self) -> str:
+        """Fixed-width table of the current snapshot, for logs and the debug tab."""
+        snap = self.snapshot()
+        cols = ["count", "last"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+        lines = [f"uptime {snap['uptime_sec']:.0f}s", "",
+                 f"{'timing (ms)':<36}" + "".join(f"{c:>12}" for c in cols)]
+        for name, s in snap["timings_ms"].items():
+            cells = []
+            for c in cols:
+                v = s.get(c)
+                cells.append(f"{'-':>12}" if v is None else f"{v:>12}" if c == "count" else f"{v:>12.1f}")
+            lines.append(f"{name:<36}" + "".join(cells))
+        lines += ["", f"{'counter':<36}{'total':>12}"]
+        for name, v in snap["counters"].items():
+            lines.append(f"{name:<36}{v:>12}")
+        return "\n".join(lines)
+
+
+# process-wide registry shared by the scanners, HTTP clients and the GUI
+metrics = MetricsRegistry()
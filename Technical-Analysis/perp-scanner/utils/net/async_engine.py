@@ -0,0 +1,94 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from utils.net import http_client
+from utils.metrics.scan_metrics import metrics
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+DEFAULT_CONCURRENCY  = 50     # requests in flight at once
+DEFAULT_DEADLINE_SEC = 10.0   # wall-clock budget per request, retries included
+
+
+class FetchEngine:
+    """
+    Drives many HTTP GETs on a single asyncio event loop.
+
+    Each scanner thread owns one engine and calls `get_json_many()` from its
+    own (blocking) run loop; the event loop only runs while that call is in
+    progress, so no extra threads are created. The aiohttp connection pool
+    persists between calls, so keep-alive connections survive across scans.
+    """
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, deadline: float = DEFAULT_DEADLINE_SEC):
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self._loop = asyncio.new_event_loop()
+        self._session = None
+
+    def get_json_many(self, requests: list) -> list:
+        """
+        Fetch every (url, params) in `requests` and return the decoded JSON
+        bodies in the same order. Failed requests (HTTP error, timeout,
+        deadline exceeded, bad JSON) come back as the exception instance.
+        """
+        return self._loop.run_until_complete(self._gather(requests))
+
+    def close(self):
+        """Close the aiohttp session and the event loop; safe to call more than once."""
+        if self._loop.is_closed():
+            return
+        if self._session is not None:
+            self._loop.run_until_complete(self._session.close())
+            self._session = None
+        self._loop.close()
+
+    async def _gather(self, requests: list) -> list:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=http_client.CONNECT_TIMEOUT,
+                sock_read=http_client.READ_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        sem = asyncio.Semaphore(self.concurrency)
+        tasks = [self._fetch(sem, url, params) for url, params in requests]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch(self, sem, url: str, params: dict):
+        async with sem:
+            start = time.perf_counter()
+            try:
+                return await asyncio.wait_for(self._get_with_retries(url, params), self.deadline)
+            except asyncio.TimeoutError:
+                # socket timeouts on the last attempt are already counted as errors.timeout
+                if time.perf_counter() - start >= self.deadline:
+                    metrics.incr("errors.deadline")
+                raise
+            except ValueError:
+                metrics.incr("errors.bad_json")
+                raise
+            finally:
+                metrics.observe(f"request.{urlsplit(url).hostname}", (time.perf_counter() - start) * 1000.0)
+
+    async def _get_with_retries(self, url: str, params: dict):
+        for attempt in range(http_client.MAX_RETRIES + 1):
+            last = attempt == http_client.MAX_RETRIES
+            try:
+                async with self._session.get(url, params=params) as resp:
+                    retry = resp.status in http_client.RETRY_STATUSES and not last
+                    http_client.record_status(resp.status, final=not retry, host=resp.url.host)
+                    if retry:
+                        metrics.incr("retries")
+                        retry_after = http_client.retry_after_seconds(resp.headers)
+                        await asyncio.sleep(http_client.backoff_delay(attempt, retry_after))
+                        continue
+                    resp.raise_for_status()
+                    return await resp.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                metrics.incr("errors.timeout" if isinstance(e, asyncio.TimeoutError) else "errors.connection")
+                if last:
+                    raise
+                metrics.incr("retries")
+                await asyncio.sleep(http_client.backoff_delay(attempt))
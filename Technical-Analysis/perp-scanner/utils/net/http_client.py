@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.metrics.scan_metrics import metrics
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+POOL_HOSTS        = 10      # per-host pools kept alive (Kraken spot/futures, Telegram, chart-img…)
+POOL_MAXSIZE      = 50      # keep-alive connections per host; matches scanners.FETCH_CONCURRENCY
+CONNECT_TIMEOUT   = 5.0     # seconds to establish a connection
+READ_TIMEOUT      = 10.0    # seconds to wait for a response
+MAX_RETRIES       = 2       # extra attempts after the first one
+BACKOFF_BASE_SEC  = 0.5     # first retry waits up to this long
+BACKOFF_MAX_SEC   = 8.0     # cap for any single retry wait
+RETRY_STATUSES    = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session, creating it on first use.
+    Also handed to ccxt so indicator downloads reuse the same connections.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(POOL_MAXSIZE)
+    return _session
+
+
+def configure(pool_maxsize: int = None) -> None:
+    """
+    Resizes the per-host pools, e.g. when the worker concurrency changes.
+    Connections in the old session are closed.
+    """
+    global _session, POOL_MAXSIZE
+    with _session_lock:
+        if pool_maxsize:
+            POOL_MAXSIZE = pool_maxsize
+        old, _session = _session, _build_session(POOL_MAXSIZE)
+    if old is not None:
+        old.close()
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """
+    Full-jitter exponential backoff for retry number `attempt` (0-based).
+    A server-provided Retry-After takes precedence, capped at BACKOFF_MAX_SEC.
+    """
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX_SEC)
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** attempt)))
+
+
+def retry_after_seconds(headers) -> float:
+    """Returns the Retry-After header in seconds, or None if absent/unparseable."""
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def record_status(status: int, final: bool, host: str = None) -> None:
+    """
+    Counts rate-limit hits on every attempt (also per host, as
+    "rate_limit.<host>", so each scanner can tell its own apart), and other
+    HTTP errors only for the response that is finally handed back to the caller.
+    """
+    if status == 429:
+        metrics.incr("errors.rate_limit")
+        if host:
+            metrics.incr(f"rate_limit.{host}")
+    elif final and status >= 500:
+        metrics.incr("errors.http_5xx")
+    elif final and status >= 400:
+        metrics.incr("errors.http_4xx")
+
+
+def request(method: str, url: str, timeout=None, retries: int = None, **kwargs) -> requests.Response:
+    """
+    Issues a request on the shared session.
+
+    Connection errors, timeouts and RETRY_STATUSES are retried with jittered
+    backoff. After the last attempt the final response is returned (callers
+    still call raise_for_status()) or the final exception is raised.
+    Latency (retries included) is recorded as "request.<host>".
+    """
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    retries = MAX_RETRIES if retries is None else retries
+    session = get_session()
+
+    host = urlsplit(url).hostname
+    with metrics.timer(f"request.{host}"):
+        for attempt in range(retries + 1):
+            try:
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.incr("errors.timeout" if isinstance(e, requests.Timeout) else "errors.connection")
+                if attempt == retries:
+                    raise
+                metrics.incr("retries")
+                time.sleep(backoff_delay(attempt))
+                continue
+            retry = resp.status_code in RETRY_STATUSES and attempt < retries
+            record_status(resp.status_code, final=not retry, host=host)
+            if retry:
+                metrics.incr("retries")
+                time.sleep(backoff_delay(attempt, retry_after_seconds(resp.headers)))
+                continue
+            return resp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -0,0 +1,197 @@
+import heapq
+import itertools
+import threading
+import time
+
+from utils.metrics.scan_metrics import metrics
+from utils.net.http_client import backoff_delay
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+QUEUE_MAXSIZE    = 500      # pending deliveries per dispatcher; the oldest is dropped beyond this
+MAX_ATTEMPTS     = 5        # deliveries are given up after this many transient failures
+
+
+class RetryLater(Exception):
+    """
+    Raised by a delivery function for a transient failure (timeout, 5xx,
+    rate limit). `delay` is the server-requested wait in seconds, if any;
+    otherwise the dispatcher backs off exponentially.
+    """
+    def __init__(self, message: str = "", delay: float = None):
+        super().__init__(message)
+        self.delay = delay
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second, holding at most `burst`. Buckets may be shared
+    between dispatchers (e.g. Telegram's global limit); see take_all().
+    """
+    _lock = threading.Lock()    # one lock for all buckets, so take_all() is atomic
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._stamp = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def _wait(self) -> float:
+        return 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self.rate
+
+    @classmethod
+    def take_all(cls, buckets) -> float:
+        """
+        Take one token from every bucket and return 0, or take none and
+        return the seconds until all of them could give one.
+        """
+        with cls._lock:
+            now = time.monotonic()
+            for bucket in buckets:
+                bucket._refill(now)
+            wait = max((bucket._wait() for bucket in buckets), default=0.0)
+            if wait == 0.0:
+                for bucket in buckets:
+                    bucket._tokens -= 1.0
+            return wait
+
+
+class _Job:
+    __slots__ = ("send", "args", "buckets", "attempts", "label")
+
+    def __init__(self, send, args, buckets, label):
+        self.send = send
+        self.args = args
+        self.buckets = buckets
+        self.attempts = 0
+        self.label = label
+
+
+class NotificationDispatcher:
+    """
+    Background delivery queue for notifications.
+
+    submit() never blocks: it schedules `send(*args)` on the dispatcher's own
+    thread (started on first use) and returns. Before each attempt one token
+    is taken from every bucket in `buckets`, waiting on the schedule rather
+    than sleeping, so a rate-limited job does not hold up jobs due earlier.
+    RetryLater reschedules the job with backoff up to MAX_ATTEMPTS; any other
+    exception drops it. Timings go to metrics as "notify.<name>", failures
+    are counted as "notify.<name>.retries" / ".dropped" / ".failed".
+    """
+    def __init__(self, name: str, maxsize: int = QUEUE_MAXSIZE, max_attempts: int = MAX_ATTEMPTS):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_attempts = max_attempts
+        self._heap = []                 # (due monotonic time, seq, job)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+    def submit(self, send, *args, buckets=(), label: str = None) -> bool:
+        """Queue `send(*args)`; returns False once the dispatcher is closed."""
+        job = _Job(send, args, tuple(buckets), label or getattr(send, "__name__", "send"))
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._heap) >= self.maxsize:
+                # drop whatever is due first, i.e. the oldest notification
+                heapq.heappop(self._heap)
+                metrics.incr(f"notify.{self.name}.dropped")
+            self._push(time.monotonic(), job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"notify-{self.name}", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def _push(self, due: float, job: _Job):
+        heapq.heappush(self._heap, (due, next(self._seq), job))
+
+    def _next_job(self):
+        """Block until a job is due; None once closed and drained."""
+        with self._cond:
+            while True:
+                if not self._heap:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                due, _, job = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                wait = TokenBucket.take_all(job.buckets)
+                if wait > 0:
+                    heapq.heapreplace(self._heap, (time.monotonic() + wait, next(self._seq), job))
+                    continue
+                heapq.heappop(self._heap)
+                return job
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            job.attempts += 1
+            try:
+                with metrics.timer(f"notify.{self.name}"):
+                    job.send(*job.args)
+            except RetryLater as e:
+                if job.attempts >= self.max_attempts:
+                    metrics.incr(f"notify.{self.name}.failed")
+                    continue
+                metrics.incr(f"notify.{self.name}.retries")
+                delay = e.delay if e.delay is not None else backoff_delay(job.attempts - 1)
+                with self._cond:
+                    self._push(time.monotonic() + delay, job)
+            except Exception:
+                metrics.incr(f"notify.{self.name}.failed")
+
+    def close(self, timeout: float = 5.0):
+        """Stop accepting jobs and give the queued ones up to `timeout` seconds to go out."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+class DigestCollector:
+    """
+    Scanner listener that gathers the alerts added during one scan and hands
+    them to `deliver(market, alerts)` as a single digest when the scan
+    finishes, with alerts = [(symbol, pct, notional, price), ...].
+    Pending alerts are also flushed by close().
+    """
+    def __init__(self, deliver):
+        self._deliver = deliver
+        self._pending = {}              # market → [(symbol, pct, notional, price), ...]
+        self._lock = threading.Lock()
+
+    def alert_added(self, market, symbol, pct, notional, price):
+        with self._lock:
+            self._pending.setdefault(market, []).append((symbol, pct, notional, price))
+
+    def scan_finished(self, market):
+        with self._lock:
+            alerts = self._pending.pop(market, None)
+        if alerts:
+            self._deliver(market, alerts)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for market, alerts in pending.items():
+            if alerts:
+                self._deliver(market, alerts)
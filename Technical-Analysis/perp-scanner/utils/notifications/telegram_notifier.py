@@ -1,6 +1,15 @@
 import requests
 from typing import Optional
 from settings import load_settings
+from utils.net import http_client
+from utils.notifications.dispatcher import NotificationDispatcher, RetryLater, TokenBucket
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+CHAT_RATE_PER_SEC   = 1.0       # Telegram: about one message per second per chat
+CHAT_BURST          = 3
+GLOBAL_RATE_PER_SEC = 30.0      # Telegram: about 30 messages per second per bot
+MAX_MESSAGE_CHARS   = 4096      # sendMessage text limit
+DIGEST_MAX_LINES    = 40        # alerts listed per digest message before it is split
 
 
 class TelegramNotifier:
@@ -14,6 +23,17 @@ class TelegramNotifier:
         self.chat_id: str = config.get("telegram_chat_id", "")
         self.threshold: float = config.get("alert_threshold", 0.0)
         self.base_url: str = f"https://api.telegram.org/bot{self.token}/"
+        self.global_bucket = TokenBucket(GLOBAL_RATE_PER_SEC, GLOBAL_RATE_PER_SEC)
+        self._chat_buckets = {}
+        self.dispatcher = NotificationDispatcher("telegram")
+
+    def buckets(self, chat_id: str = None) -> tuple:
+        """Token buckets a message to `chat_id` (default: the configured chat) has to pass."""
+        chat_id = chat_id or self.chat_id
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(CHAT_RATE_PER_SEC, CHAT_BURST)
+        return self.global_bucket, bucket
 
     def is_configured(self) -> bool:
         """Returns True if both token and chat_id are set."""
@@ -25,13 +45,11 @@ class TelegramNotifier:
         """
         return abs(change) >= self.threshold
 
-    def send_message(self, text: str) -> bool:
+    def deliver(self, text: str) -> None:
         """
-        Sends a text message to the configured Telegram chat.
-        Returns True on success, False otherwise.
+        Sends one message, once. Raises RetryLater for timeouts, 5xx and
+        429 (with Telegram's retry_after), requests.HTTPError otherwise.
         """
-        if not self.is_configured():
-            return False
         url = self.base_url + "sendMessage"
         payload = {
             "chat_id": self.chat_id,
@@ -39,22 +57,87 @@ class TelegramNotifier:
             "parse_mode": "Markdown"
         }
         try:
-            resp = requests.post(url, json=payload, timeout=10)
-            resp.raise_for_status()
+            resp = http_client.post(url, json=payload, retries=0)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise RetryLater(str(e))
+        if resp.status_code == 429:
+            try:
+                delay = resp.json().get("parameters", {}).get("retry_after")
+            except ValueError:
+                delay = None
+            raise RetryLater("rate limited", delay if delay is not None else http_client.retry_after_seconds(resp.headers))
+        if resp.status_code >= 500:
+            raise RetryLater(f"HTTP {resp.status_code}")
+        resp.raise_for_status()
+
+    def send_message(self, text: str) -> bool:
+        """
+        Sends a text message to the configured Telegram chat, blocking.
+        Returns True on success, False otherwise.
+        """
+        if not self.is_configured():
+            return False
+        try:
+            self.deliver(text)
             return True
-        except requests.RequestException:
+        except (RetryLater, requests.RequestException):
             return False
 
+    def enqueue(self, text: str) -> bool:
+        """
+        Queues a message for the background dispatcher, which keeps to the
+        per-chat and global send rates and retries transient failures.
+        Returns immediately; False if Telegram is not configured.
+        """
+        if not self.is_configured():
+            return False
+        return self.dispatcher.submit(self.deliver, text, buckets=self.buckets(), label="sendMessage")
+
 
 # module-level notifier instance
 notifier = TelegramNotifier()
 
 
+def format_alert(symbol: str, change: float, price: float) -> str:
+    direction = "up" if change > 0 else "down"
+    return f"*{symbol}* moved *{change:.2f}%* {direction}, current price: ${price:.2f}"
+
+
 def alert_change(symbol: str, change: float, price: float) -> None:
     """
-    If the change exceeds threshold, formats and sends a Telegram alert.
+    If the change exceeds threshold, formats and queues a Telegram alert.
     """
     if notifier.should_alert(change):
-        direction = "up" if change > 0 else "down"
-        message = f"*{symbol}* moved *{change:.2f}%* {direction}, current price: ${price:.2f}"
-        notifier.send_message(message)
+        notifier.enqueue(format_alert(symbol, change, price))
+
+
+def format_digest(market: str, alerts: list) -> list:
+    """
+    Messages for one scan's alerts [(symbol, pct, notional, price), ...]:
+    a single alert keeps the alert_change() wording, several are listed
+    under one header, split to stay within DIGEST_MAX_LINES / MAX_MESSAGE_CHARS.
+    """
+    if len(alerts) == 1:
+        symbol, pct, _, price = alerts[0]
+        return [format_alert(symbol, pct, price)]
+    messages, chunk, size = [], [], 0
+    for symbol, pct, _, price in alerts:
+        line = f"{symbol} {pct:+.2f}% @ ${price:.2f}"
+        if chunk and (len(chunk) >= DIGEST_MAX_LINES or size + len(line) > MAX_MESSAGE_CHARS - 100):
+            messages.append(chunk)
+            chunk, size = [], 0
+        chunk.append(line)
+        size += len(line) + 1
+    messages.append(chunk)
+    header, total = f"*{len(alerts)} new {market} alerts*", len(messages)
+    return [header + (f" ({i}/{total})" if total > 1 else "") + "\n" + "\n".join(lines)
+            for i, lines in enumerate(messages, 1)]
+
+
+def alert_digest(market: str, alerts: list) -> None:
+    """
+    Queues one digest for the alerts of a scan that pass the threshold.
+    """
+    alerts = [a for a in alerts if notifier.should_alert(a[1])]
+    for message in format_digest(market, alerts) if alerts else ():
+        notifier.enqueue(message)
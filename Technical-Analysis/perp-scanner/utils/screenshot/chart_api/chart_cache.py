@@ -0,0 +1,192 @@
+"""
+Memory + disk cache of rendered chart PNGs.
+
+An entry is keyed by (symbol, interval, hash of the full request payload) and
+stays valid until the candle that was open when it was fetched closes, so a
+repeat capture within the same candle never goes back to chart-img. Disk
+entries live in CACHE_DIR/<key hash>.png; the fetch time is the file's mtime,
+the last use its atime (set explicitly, so noatime mounts do not matter), and
+the directory is trimmed least-recently-used first to DISK_MAX_BYTES.
+Concurrent requests for the same chart share one download. Hits, misses
+and failed disk writes are counted in metrics under "chart_cache.*".
+"""
+import calendar
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from pathlib import Path
+
+from utils.metrics.scan_metrics import metrics
+
+# ─── CONFIGURATION ────────────────────────────────────────────────────────────
+CACHE_DIR         = Path.home() / "Total" / ".kraken_usd_alerts" / "charts"
+MEMORY_MAX_BYTES  = 64 * 1024 * 1024     # PNGs kept in memory
+DISK_MAX_BYTES    = 512 * 1024 * 1024    # PNGs kept on disk
+INTERVAL_UNITS    = {"m": 60, "h": 3600, "D": 86400, "d": 86400, "W": 7 * 86400, "w": 7 * 86400}
+WEEK_OFFSET_SEC   = 4 * 86400            # the epoch was a Thursday; chart weeks start on Monday
+
+
+def next_close(interval: str, ts: float) -> float:
+    """
+    Epoch seconds at which the `interval` candle containing `ts` closes (UTC
+    sessions, as charts are requested with timezone Etc/UTC). Accepts the
+    chart-img codes 1m…45m, 1h…12h, 1D, 1W and 1M.
+    """
+    count, unit = int(interval[:-1] or 1), interval[-1]
+    if unit == "M":
+        dt = datetime.fromtimestamp(ts, timezone.utc)
+        month = dt.year * 12 + dt.month - 1 + count
+        return float(calendar.timegm((month // 12, month % 12 + 1, 1, 0, 0, 0)))
+    if unit not in INTERVAL_UNITS:
+        raise ValueError(f"unknown chart interval {interval!r}")
+    step = count * INTERVAL_UNITS[unit]
+    offset = WEEK_OFFSET_SEC if unit in "Ww" else 0
+    return (ts - offset) // step * step + step + offset
+
+
+def payload_hash(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class ChartCache:
+    """
+    get(symbol, interval, payload, fetch) returns the cached PNG, or calls
+    `fetch()` once (however many threads ask at the same time) and caches
+    its bytes. A failed fetch is raised to every waiter and not cached.
+    """
+    def __init__(self, cache_dir: Path = CACHE_DIR, memory_max_bytes: int = MEMORY_MAX_BYTES,
+                 disk_max_bytes: int = DISK_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()    # key → (expires, png), least recently used first
+        self._memory_bytes = 0
+        self._inflight = {}             # key → Future
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(symbol: str, interval: str, payload: dict) -> str:
+        return hashlib.sha256(f"{symbol}|{interval}|{payload_hash(payload)}".encode()).hexdigest()
+
+    def get(self, symbol: str, interval: str, payload: dict, fetch) -> bytes:
+        key = self.key(symbol, interval, payload)
+        now = time.time()
+        with self._lock:
+            png = self._memory_get(key, now)
+            if png is not None:
+                metrics.incr("chart_cache.hit_memory")
+                return png
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            metrics.incr("chart_cache.shared")
+            return future.result()
+
+        try:
+            png = self._disk_get(key, interval, now)
+            if png is None:
+                metrics.incr("chart_cache.miss")
+                fetched_at = time.time()
+                png = fetch()
+                self._disk_put(key, png, fetched_at)
+            else:
+                metrics.incr("chart_cache.hit_disk")
+                fetched_at = self._path(key).stat().st_mtime
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._memory_put(key, next_close(interval, fetched_at), png)
+            del self._inflight[key]
+        future.set_result(png)
+        return png
+
+    # ── memory tier ──
+    def _memory_get(self, key: str, now: float):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires, png = entry
+        if expires <= now:
+            self._memory_drop(key)
+            return None
+        self._memory.move_to_end(key)
+        return png
+
+    def _memory_put(self, key: str, expires: float, png: bytes):
+        if key in self._memory:
+            self._memory_drop(key)
+        if len(png) > self.memory_max_bytes:
+            return
+        self._memory[key] = (expires, png)
+        self._memory_bytes += len(png)
+        while self._memory_bytes > self.memory_max_bytes:
+            self._memory_drop(next(iter(self._memory)))
+
+    def _memory_drop(self, key: str):
+        _, png = self._memory.pop(key)
+        self._memory_bytes -= len(png)
+
+    # ── disk tier ──
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def _disk_get(self, key: str, interval: str, now: float):
+        path = self._path(key)
+        try:
+            fetched_at = path.stat().st_mtime
+            if next_close(interval, fetched_at) <= now:
+                path.unlink()
+                return None
+            png = path.read_bytes()
+            os.utime(path, (now, fetched_at))    # atime = last use, mtime = fetch time
+            return png
+        except OSError:
+            return None
+
+    def _disk_put(self, key: str, png: bytes, fetched_at: float):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(png)
+            os.utime(tmp, (time.time(), fetched_at))
+            tmp.replace(self._path(key))
+            self._trim()
+        except OSError:
+            # the chart is still served from memory; only the disk copy is lost
+            metrics.incr("chart_cache.write_failed")
+
+    def _trim(self):
+        """Delete least recently used PNGs until the directory fits DISK_MAX_BYTES."""
+        entries = []
+        for path in self.cache_dir.glob("*.png"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_atime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path in self.cache_dir.glob("*.png"):
+            path.unlink(missing_ok=True)
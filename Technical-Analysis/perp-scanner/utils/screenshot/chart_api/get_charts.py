@@ -3,6 +3,12 @@ from dotenv import load_dotenv
 import os
 import sys
 import requests
+from pathlib import Path
+
+# run directly, only this directory is on sys.path; the utils package lives in perp-scanner/
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from utils.net import http_client
+from utils.screenshot.chart_api.chart_cache import ChartCache
 
 # ─── Load .env ────────────────────────────────────────────────────────────────
 load_dotenv()  # pip install python-dotenv
@@ -50,13 +56,17 @@ COMMON = {
     ],
 }
 
-_API_URL = "https://api.chart-img.com/v2/tradingview/advanced-chart"
+_API_URL = os.getenv("CHART_IMG_API_URL", "https://api.chart-img.com/v2/tradingview/advanced-chart")
+
+# rendered charts, reused until the candle they show closes
+chart_cache = ChartCache()
 
 
-def fetch_chart_bytes(symbol: str, interval: str = "1h") -> bytes:
+def fetch_chart_bytes(symbol: str, interval: str = "1h", use_cache: bool = True) -> bytes:
     """
     Fetches a rendered chart PNG for the given symbol+interval.
-    Returns the raw bytes of the PNG.
+    Returns the raw bytes of the PNG, from chart_cache when the same chart
+    was already rendered during the current candle.
     """
     payload = {
         **COMMON,
@@ -68,18 +78,23 @@ def fetch_chart_bytes(symbol: str, interval: str = "1h") -> bytes:
         "Content-Type": "application/json",
     }
 
-    resp = requests.post(_API_URL, headers=headers, json=payload, timeout=15)
-    resp.raise_for_status()
-    return resp.content
+    def download() -> bytes:
+        resp = http_client.post(_API_URL, headers=headers, json=payload, timeout=(http_client.CONNECT_TIMEOUT, 15))
+        resp.raise_for_status()
+        return resp.content
+
+    if not use_cache:
+        return download()
+    return chart_cache.get(symbol, interval, payload, download)
 
 
-def save_chart(symbol: str, interval: str = "1h", out_dir: str = "charts") -> str:
+def save_chart(symbol: str, interval: str = "1h", out_dir: str = "charts", use_cache: bool = True) -> str:
     """
     Fetches and writes the PNG to disk.
     Returns the filepath.
     """
     os.makedirs(out_dir, exist_ok=True)
-    data = fetch_chart_bytes(symbol, interval)
+    data = fetch_chart_bytes(symbol, interval, use_cache)
     filename = f"chart-{symbol.replace(':','_')}-{interval}.png"
     path = os.path.join(out_dir, filename)
     with open(path, "wb") as f:
@@ -101,16 +116,19 @@ if __name__ == "__main__":
     parser.add_argument(
         "--out", "-o", default=None, help="Output PNG file (defaults to charts/…) "
     )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always render a fresh chart"
+    )
     args = parser.parse_args()
 
     try:
         if args.out:
             out_path = args.out
-            data = fetch_chart_bytes(args.symbol, args.interval)
+            data = fetch_chart_bytes(args.symbol, args.interval, use_cache=not args.no_cache)
             with open(out_path, "wb") as fp:
                 fp.write(data)
         else:
-            out_path = save_chart(args.symbol, args.interval)
+            out_path = save_chart(args.symbol, args.interval, use_cache=not args.no_cache)
         print(f"✅ {args.symbol} ({args.interval}) → {out_path}")
     except requests.HTTPError as e:
         print(
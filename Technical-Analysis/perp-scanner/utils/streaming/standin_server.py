@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Kraken spot (ws.kraken.com) and futures (/ws/v1)
+ticker feeds, for exercising the streaming mode without touching the exchange.
+
+It accepts either subscribe format, then pushes random-walk tickers for every
+subscribed symbol. `--drop-after` closes each connection after N seconds so
+reconnect/resubscribe can be observed.
+
+    python utils/streaming/standin_server.py --port 8765 --rate 20
+    # then point service.scanners.SPOT_WS_URL / FUTURES_WS_URL at ws://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import random
+
+import websockets
+
+
+def spot_push(channel_id: int, wsname: str, price: float, open_price: float) -> list:
+    """Ticker message in the ws.kraken.com (v1) array layout."""
+    p = f"{price:.5f}"
+    return [
+        channel_id,
+        {
+            "a": [p, 1, "1.0"],
+            "b": [p, 1, "1.0"],
+            "c": [p, "0.1"],
+            "v": ["1000.0", f"{random.uniform(1e3, 1e6):.2f}"],
+            "p": [p, p],
+            "t": [100, 1000],
+            "l": [f"{min(price, open_price) * 0.99:.5f}"] * 2,
+            "h": [f"{max(price, open_price) * 1.01:.5f}"] * 2,
+            "o": [f"{open_price:.5f}"] * 2,
+        },
+        "ticker",
+        wsname,
+    ]
+
+
+def futures_push(product_id: str, price: float, open_price: float) -> dict:
+    """Ticker message in the futures /ws/v1 layout."""
+    return {
+        "feed": "ticker",
+        "product_id": product_id,
+        "last": price,
+        "change": (price - open_price) / open_price * 100.0,
+        "volume": random.uniform(1e3, 1e6),
+        "tag": "perpetual",
+    }
+
+
+async def handler(ws, path=None, rate: float = 10.0, drop_after: float = 0.0):
+    spot, futures = [], []
+    prices = {}
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def read_subscriptions():
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg.get("event") != "subscribe":
+                continue
+            if "pair" in msg:
+                spot.extend(msg["pair"])
+                await ws.send(json.dumps({"event": "subscriptionStatus", "status": "subscribed"}))
+            else:
+                futures.extend(msg.get("product_ids", []))
+                await ws.send(json.dumps({"event": "subscribed", "feed": msg.get("feed")}))
+
+    reader = asyncio.ensure_future(read_subscriptions())
+    try:
+        while not reader.done():
+            await asyncio.sleep(1.0 / rate)
+            if drop_after and loop.time() - started >= drop_after:
+                break
+            symbols = [("spot", s) for s in spot] + [("futures", s) for s in futures]
+            if not symbols:
+                continue
+            kind, sym = random.choice(symbols)
+            open_price = prices.setdefault(sym, (100.0, 100.0))[0]
+            price = prices[sym][1] * (1 + random.gauss(0, 0.01))
+            prices[sym] = (open_price, price)
+            if kind == "spot":
+                msg = spot_push(spot.index(sym), sym, price, open_price)
+            else:
+                msg = futures_push(sym, price, open_price)
+            await ws.send(json.dumps(msg))
+    except websockets.exceptions.ConnectionClosed:
+        pass
+    finally:
+        reader.cancel()
+        await ws.close()
+
+
+async def serve(host: str, port: int, rate: float, drop_after: float):
+    async def _handler(ws, path=None):
+        await handler(ws, path, rate=rate, drop_after=drop_after)
+
+    async with websockets.serve(_handler, host, port):
+        print(f"Stand-in ticker feed on ws://{host}:{port}")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Kraken ticker WebSockets")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=10.0, help="pushes per second")
+    parser.add_argument("--drop-after", type=float, default=0.0, help="close each connection after N seconds")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.rate, args.drop_after))
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+
+import websockets
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+RECONNECT_MIN_SEC = 1.0     # first reconnect delay after a drop
+RECONNECT_MAX_SEC = 30.0    # cap for the exponential reconnect delay
+PING_INTERVAL_SEC = 20.0    # keep-alive pings so dead sockets are noticed
+STOP_POLL_SEC     = 1.0     # longest a quiet socket or a reconnect delay goes without checking stop()
+
+
+class TickerStream:
+    """
+    Keeps one WebSocket ticker subscription alive and hands parsed updates
+    to a callback.
+
+    - `subscriptions()` returns the JSON messages to send after every
+      (re)connect, so the feed is resubscribed automatically.
+    - `parse_message(msg)` turns one decoded message into [(key, update), ...].
+    - `on_batch(changed)` receives {key: update} with the latest update per key.
+      Pushes arriving within `flush_interval` seconds are coalesced into one
+      batch; 0 flushes on every push.
+    """
+    def __init__(self, url, subscriptions, parse_message, on_batch, log=print, flush_interval=0.0):
+        self.url = url
+        self.subscriptions = subscriptions
+        self.parse_message = parse_message
+        self.on_batch = on_batch
+        self.log = log
+        self.flush_interval = flush_interval
+        self._stopped = False
+
+    def run_forever(self):
+        """Blocks the calling thread, reconnecting until stop() is called."""
+        asyncio.run(self._run())
+
+    def stop(self):
+        self._stopped = True
+
+    async def _run(self):
+        delay = RECONNECT_MIN_SEC
+        while not self._stopped:
+            try:
+                async with websockets.connect(self.url, ping_interval=PING_INTERVAL_SEC, max_size=None) as ws:
+                    for message in self.subscriptions():
+                        await ws.send(json.dumps(message))
+                    self.log(f"Stream connected: {self.url}")
+                    delay = RECONNECT_MIN_SEC
+                    await self._consume(ws)
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                self.log(f"Stream dropped ({e}); reconnecting in {delay:.0f}s")
+            # sleep in short steps so stop() is honoured during a long reconnect delay
+            resume_at = time.monotonic() + delay
+            while not self._stopped and time.monotonic() < resume_at:
+                await asyncio.sleep(min(STOP_POLL_SEC, resume_at - time.monotonic()))
+            delay = min(delay * 2, RECONNECT_MAX_SEC)
+
+    async def _consume(self, ws):
+        pending = {}
+        last_flush = time.monotonic()
+        while not self._stopped:
+            timeout = STOP_POLL_SEC
+            if pending:
+                timeout = min(timeout, max(0.0, self.flush_interval - (time.monotonic() - last_flush)))
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout)
+            except asyncio.TimeoutError:
+                raw = None
+
+            if raw is not None:
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    continue
+                try:
+                    for key, update in self.parse_message(message):
+                        pending[key] = update
+                except Exception as e:
+                    self.log(f"Stream message skipped ({type(e).__name__}: {e})")
+
+            if pending and time.monotonic() - last_flush >= self.flush_interval:
+                batch, pending = pending, {}
+                last_flush = time.monotonic()
+                try:
+                    self.on_batch(batch)
+                except Exception as e:
+                    self.log(f"Stream batch handler failed ({type(e).__name__}: {e})")
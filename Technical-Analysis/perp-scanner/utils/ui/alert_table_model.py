@@ -0,0 +1,221 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QFont
+
+# ─── COLOR CONSTANTS ──────────────────────────────────────────────────────────
+NEW_COLOR = QColor(173, 216, 230)      # light blue
+POS_COLOR = QColor(144, 238, 144)      # light green
+NEG_COLOR = QColor(250, 128, 114)      # light red
+RANGE_BREAK_COLOR = QColor(142, 68, 191)  # light purple
+
+COLUMNS = ["Symbol", "Initial %", "Prev %", "Now %", "Volume ($)", "Price", "Prev Day Range"]
+VOLUME_COLUMN = 4
+RSI_TIMEFRAMES = ("1h", "4h", "1d")    # optional trailing columns, see AlertTableModel(rsi_source=...)
+
+# row layout: [symbol, initial, prev, now, notional_volume, price, prev_high, prev_low]
+SYMBOL, INITIAL, PREV, NOW, VOLUME, PRICE, HIGH, LOW = range(8)
+
+
+def _runs(rows: list) -> list:
+    """Collapse sorted row numbers into [(first, last), ...] contiguous runs."""
+    runs = []
+    for r in rows:
+        if runs and r == runs[-1][1] + 1:
+            runs[-1][1] = r
+        else:
+            runs.append([r, r])
+    return runs
+
+
+class AlertTableModel(QAbstractTableModel):
+    """
+    Holds the numeric alert rows emitted by a scanner worker.
+
+    apply_rows() diffs each scan against the current rows by symbol and only
+    signals the rows that were removed, inserted or changed; text and colors
+    are produced lazily in data() for the rows actually painted. Sorting is
+    done here on the raw values (a stable list sort, so ties keep their
+    order) rather than through a proxy calling back into data().
+
+    With `rsi_source` (symbol → {timeframe: value}) the model grows one RSI
+    column per RSI_TIMEFRAMES entry, read from the source when painted;
+    call refresh_rsi() to repaint them.
+    """
+    def __init__(self, parent=None, rsi_source=None):
+        super().__init__(parent)
+        self._rsi_source = rsi_source
+        self._columns = COLUMNS + ([f"RSI {tf}" for tf in RSI_TIMEFRAMES] if rsi_source else [])
+        self._rows = []
+        self._index = {}    # symbol → row number
+        self._font = QFont("Courier", 9)
+        self._sort_column = VOLUME_COLUMN
+        self._sort_order = Qt.DescendingOrder
+
+    # ── Qt model interface ───────────────────────────────────────────────────
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._columns[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col >= len(COLUMNS):
+                value = self._rsi(row, col)
+                return "" if value is None else f"{value:.1f}"
+            return self._display(row, col)
+        if role == Qt.BackgroundRole:
+            return self._color(row)
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.FontRole:
+            return self._font
+        return None
+
+    # ── updates ──────────────────────────────────────────────────────────────
+    def apply_rows(self, rows):
+        """
+        Replace the contents with `rows`, emitting only the minimal
+        remove/insert/dataChanged notifications: new rows are inserted at
+        their sorted position, and the table is only re-sorted when a changed
+        row's sort value breaks the current order. Duplicate symbols keep the
+        first occurrence.
+        """
+        incoming = {}
+        for r in rows:
+            if r[SYMBOL] not in incoming:
+                incoming[r[SYMBOL]] = list(r)
+
+        gone = sorted(i for sym, i in self._index.items() if sym not in incoming)
+        for first, last in reversed(_runs(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+
+        changed = []
+        for i, current in enumerate(self._rows):
+            new = incoming.pop(current[SYMBOL])
+            if new != current:
+                self._rows[i] = new
+                changed.append(i)
+
+        key, reverse = self._sort_key()
+        if changed and not self._in_order(key, reverse):
+            # a changed sort value moved some row: re-sort (this repaints everything)
+            self._relayout()
+        else:
+            last_col = len(self._columns) - 1
+            for first, last in _runs(changed):
+                self.dataChanged.emit(self.index(first, 0), self.index(last, last_col))
+
+        if incoming:
+            self._insert_sorted(list(incoming.values()), key, reverse)
+        if gone or incoming:
+            self._index = {r[SYMBOL]: i for i, r in enumerate(self._rows)}
+
+    def _in_order(self, key, reverse) -> bool:
+        keys = [key(r) for r in self._rows]
+        if reverse:
+            return all(a >= b for a, b in zip(keys, keys[1:]))
+        return all(a <= b for a, b in zip(keys, keys[1:]))
+
+    def _insert_sorted(self, new_rows, key, reverse):
+        """Insert rows at their sorted positions (after equal keys), one insert per row."""
+        if not self._rows:
+            new_rows.sort(key=key, reverse=reverse)
+            self.beginInsertRows(QModelIndex(), 0, len(new_rows) - 1)
+            self._rows.extend(new_rows)
+            self.endInsertRows()
+            return
+        for row in new_rows:
+            k, lo, hi = key(row), 0, len(self._rows)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if (k > key(self._rows[mid])) if reverse else (k < key(self._rows[mid])):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            self.beginInsertRows(QModelIndex(), lo, lo)
+            self._rows.insert(lo, row)
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._relayout()
+
+    def _relayout(self):
+        """Re-sort the rows in place, keeping persistent indexes (selection) on their symbols."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        anchors = [(self._rows[p.row()][SYMBOL], p.column()) for p in persistent]
+
+        key, reverse = self._sort_key()
+        self._rows.sort(key=key, reverse=reverse)
+        self._index = {r[SYMBOL]: i for i, r in enumerate(self._rows)}
+
+        self.changePersistentIndexList(
+            persistent, [self.index(self._index[sym], c) for sym, c in anchors]
+        )
+        self.layoutChanged.emit()
+
+    def _sort_key(self):
+        """(key function, reverse) for the current sort column and order."""
+        reverse = self._sort_order == Qt.DescendingOrder
+        if self._sort_column >= len(COLUMNS):
+            # RSI columns: rows without a value yet always sort last
+            missing = float("-inf") if reverse else float("inf")
+            def key(r):
+                value = self._rsi(r, self._sort_column)
+                return missing if value is None else value
+            return key, reverse
+        col = HIGH if self._sort_column == len(COLUMNS) - 1 else self._sort_column
+        return (lambda r: r[col]), reverse
+
+    def refresh_rsi(self):
+        """Repaint the RSI columns (and re-sort if sorted by one)."""
+        if not self._rsi_source or not self._rows:
+            return
+        if self._sort_column >= len(COLUMNS):
+            self._relayout()
+        self.dataChanged.emit(
+            self.index(0, len(COLUMNS)), self.index(len(self._rows) - 1, len(self._columns) - 1)
+        )
+
+    def _rsi(self, row, col):
+        return self._rsi_source(row[SYMBOL]).get(RSI_TIMEFRAMES[col - len(COLUMNS)])
+
+    # ── formatting ───────────────────────────────────────────────────────────
+    @staticmethod
+    def _display(row, col):
+        if col == SYMBOL:
+            return row[SYMBOL]
+        if col in (INITIAL, PREV, NOW):
+            return f"{row[col]:.2f}%"
+        if col == VOLUME:
+            return f"{row[VOLUME]:,.1f}"
+        if col == PRICE:
+            return f"{row[PRICE]:.2f}"
+        return f"{row[HIGH]:.2f}-{row[LOW]:.2f}"
+
+    @staticmethod
+    def _color(row):
+        # compare at display precision, as the table shows them
+        price = round(row[PRICE], 2)
+        if price > row[HIGH] or price < row[LOW]:
+            return RANGE_BREAK_COLOR
+        if round(row[PREV], 2) == round(row[INITIAL], 2):
+            return NEW_COLOR
+        if row[NOW] > 0:
+            return POS_COLOR
+        if row[NOW] < 0:
+            return NEG_COLOR
+        return None
@@ -0,0 +1,105 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import Qt, QObject, QSize, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from utils.screenshot.chart_api.get_charts import fetch_chart_bytes
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+CAPTURE_INTERVALS = ("1h", "4h", "1D")
+CAPTURE_WORKERS   = 6       # chart-img requests in flight at once, across all captures
+
+pool = ThreadPoolExecutor(max_workers=CAPTURE_WORKERS, thread_name_prefix="chart")
+
+
+def chart_filename(pair: str, interval: str) -> str:
+    return f"{pair.replace(':', '_')}_{interval}.png"
+
+
+class _Capture:
+    """Bookkeeping for one capture() call: requests still outstanding per pair."""
+    def __init__(self, capture_id: int, pairs, intervals):
+        self.id = capture_id
+        self.remaining = {pair: len(intervals) for pair in pairs}
+        self.failed = {pair: 0 for pair in pairs}
+        self.shown = False
+        self.lock = threading.Lock()
+
+    def claim_display(self) -> bool:
+        """True for the first chart of the capture to arrive, which is the one displayed."""
+        with self.lock:
+            first, self.shown = not self.shown, True
+        return first
+
+    def done(self, pair: str, ok: bool):
+        """Record one finished request; returns (finished, failed) once the pair is complete."""
+        with self.lock:
+            self.remaining[pair] -= 1
+            self.failed[pair] += not ok
+            if self.remaining[pair] == 0:
+                return True, self.failed[pair]
+        return False, 0
+
+
+class ChartCapture(QObject):
+    """
+    Fetches chart images for one or more pairs on `pool`, every interval of
+    every pair concurrently, and reports each through signals as it lands,
+    so the GUI thread never waits on chart-img. With `save_dir` each PNG is
+    also written there from the worker thread.
+
+    The first chart of a capture to arrive is decoded straight from memory
+    into a QImage and scaled to `display_size` on the worker too, so the GUI
+    only wraps it in a QPixmap. Every capture() gets an id, carried by all
+    its signals, so the GUI can ignore results of a capture it has replaced.
+    """
+    image_ready   = pyqtSignal(int, str, str, QImage)  # capture id, pair, interval, display image
+    chart_saved   = pyqtSignal(int, str, str, str)     # capture id, pair, interval, path
+    chart_failed  = pyqtSignal(int, str, str, str)     # capture id, pair, interval, error
+    pair_finished = pyqtSignal(int, str, int)          # capture id, pair, failed requests
+
+    def __init__(self, parent=None, display_size: QSize = None):
+        super().__init__(parent)
+        self.display_size = display_size
+        self._next_id = 0
+
+    def capture(self, pairs, intervals=CAPTURE_INTERVALS, save_dir: str = None) -> int:
+        self._next_id += 1
+        job = _Capture(self._next_id, pairs, intervals)
+        for pair in pairs:
+            for interval in intervals:
+                pool.submit(self._fetch, job, pair, interval, save_dir, self.display_size)
+        return job.id
+
+    @staticmethod
+    def decode(png: bytes, size: QSize = None) -> QImage:
+        """PNG bytes → QImage, scaled to fit `size`; safe off the GUI thread (QPixmap is not)."""
+        image = QImage.fromData(png, "PNG")
+        if image.isNull():
+            raise ValueError("not a PNG image")
+        if size is not None:
+            image = image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # the format QPixmap.fromImage() uses as is, so the GUI thread does not convert
+        return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+    def _fetch(self, job: _Capture, pair: str, interval: str, save_dir: str, display_size: QSize):
+        # runs on a pool thread; the signals are queued to the receivers' thread
+        ok = False
+        try:
+            png = fetch_chart_bytes(pair, interval=interval)
+            if job.claim_display():
+                self.image_ready.emit(job.id, pair, interval, self.decode(png, display_size))
+            if save_dir:
+                os.makedirs(save_dir, exist_ok=True)
+                path = os.path.join(save_dir, chart_filename(pair, interval))
+                with open(path, "wb") as f:
+                    f.write(png)
+                self.chart_saved.emit(job.id, pair, interval, path)
+            ok = True
+        except Exception as e:
+            self.chart_failed.emit(job.id, pair, interval, str(e))
+        finished, failed = job.done(pair, ok)
+        if finished:
+            self.pair_finished.emit(job.id, pair, failed)
@@ -0,0 +1,100 @@
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QGridLayout, QLabel, QVBoxLayout
+
+from utils.indicators import rsi
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────────
+OVERSOLD   = 30
+OVERBOUGHT = 70
+
+
+class RsiFetcher(QObject):
+    """
+    Looks RSI values up on rsi.pool and delivers each one through
+    `value_ready(symbol, timeframe, value)` as soon as it is known, so the GUI
+    thread never waits on the network. Cached values are delivered at once.
+    """
+    value_ready = pyqtSignal(str, str, object)
+
+    def request(self, symbol: str, timeframes=rsi.TIMEFRAMES):
+        missing = []
+        for tf in timeframes:
+            cached = rsi.cached_rsi(symbol, tf)
+            if cached is not None:
+                self.value_ready.emit(symbol, tf, cached)
+            else:
+                missing.append(tf)
+        # 4h/1d start once 1h has synced, so they are resampled from it
+        for tf, future in rsi.submit_timeframes(symbol, missing).items():
+            # emitted from the pool thread; Qt queues it to the receivers' thread
+            future.add_done_callback(lambda f, tf=tf: self.value_ready.emit(
+                symbol, tf, None if f.exception() else f.result()
+            ))
+
+
+class RsiPopup(QDialog):
+    """RSI per timeframe for one symbol; rows show "…" until set_value() fills them."""
+    def __init__(self, symbol: str, timeframes=rsi.TIMEFRAMES, parent=None):
+        super().__init__(parent)
+        self.symbol = symbol
+        self.setWindowTitle(f"RSI for {symbol}")
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.resize(350, 220)
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(15, 15, 15, 15)
+        main_layout.setSpacing(10)
+
+        header = QLabel("Relative Strength Index")
+        header.setFont(QFont("Arial", 14, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(header)
+
+        # Grid: Interval | Value | Status
+        grid = QGridLayout()
+        grid.setHorizontalSpacing(20)
+        grid.setVerticalSpacing(8)
+        grid.addWidget(QLabel("Interval"), 0, 0)
+        grid.addWidget(QLabel("Value"),    0, 1)
+        grid.addWidget(QLabel("Status"),   0, 2)
+
+        self._cells = {}
+        for i, tf in enumerate(timeframes, start=1):
+            tf_lbl = QLabel(tf)
+            tf_lbl.setFont(QFont("Arial", 12, QFont.Bold))
+            grid.addWidget(tf_lbl, i, 0)
+            value_lbl, status_lbl = QLabel("…"), QLabel("Loading")
+            grid.addWidget(value_lbl, i, 1)
+            grid.addWidget(status_lbl, i, 2)
+            self._cells[tf] = (value_lbl, status_lbl)
+        main_layout.addLayout(grid)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
+        buttons.accepted.connect(self.accept)
+        main_layout.addWidget(buttons)
+        self.setLayout(main_layout)
+
+    def on_value(self, symbol: str, tf: str, value):
+        """Slot for RsiFetcher.value_ready; ignores other symbols."""
+        if symbol == self.symbol:
+            self.set_value(tf, value)
+
+    def set_value(self, tf: str, value):
+        if tf not in self._cells:
+            return
+        value_lbl, status_lbl = self._cells[tf]
+        if value is None:
+            value_lbl.setText("n/a")
+            value_lbl.setStyleSheet("")
+            status_lbl.setText("Unavailable")
+            return
+        if value < OVERSOLD:
+            color, status = "green", "Oversold"
+        elif value > OVERBOUGHT:
+            color, status = "red", "Overbought"
+        else:
+            color, status = "lightblue", "Neutral"
+        value_lbl.setText(f"{value:.2f}")
+        value_lbl.setStyleSheet(f"color: {color}; font-weight: bold;")
+        status_lbl.setText(status)
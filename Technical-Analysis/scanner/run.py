@@ -7,20 +7,20 @@ author: Jaydon Lynch – 2025-05-23
 """
 
 from __future__ import annotations
-import math, os, time
+import math, os, sys, time
 from datetime import datetime, timezone
+from pathlib import Path
 
 # --- third-party ------------------------------------------------------------
 import numpy as np
-# NumPy ≥2.0 no longer exports NaN (capital N).  Patch it back if needed.
-if not hasattr(np, "NaN"):
-    np.NaN = np.nan
-
 import pandas as pd
-import pandas_ta as ta
 import ccxt
 from tabulate import tabulate
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from marketdata.candle_store import store as candle_store
+from indicators import kernels
+
 # ---------------------------------------------------------------------------#
 #                              CONFIGURATION                                 #
 # ---------------------------------------------------------------------------#
@@ -40,30 +40,21 @@ exchange = getattr(ccxt, EXCHANGE_ID)({"enableRateLimit": True})
 
 # ------------------------------ helpers ------------------------------------#
 def ohlcv_df(symbol: str, tf: str, limit: int = 500) -> pd.DataFrame:
-    """Fetch OHLCV and return as a typed DataFrame indexed by UTC timestamp."""
-    raw = exchange.fetch_ohlcv(symbol, timeframe=tf, limit=limit)
-    df  = pd.DataFrame(
-        raw, columns=["ts", "open", "high", "low", "close", "volume"]
-    )
+    """Load OHLCV from the candle store and return a typed DataFrame indexed by UTC timestamp."""
+    df = candle_store.ohlcv(exchange, symbol, tf, limit=limit)
     df["ts"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
     return df.set_index("ts")
 
-def stoch_rsi(series: pd.Series, length: int = 14) -> pd.DataFrame:
-    """Return DataFrame with standard 'k' and 'd' columns (robust to version)."""
-    df = ta.stochrsi(series, length=length, rsi_length=length, k=3, d=3)
-    mapper = {}
-    for col in df.columns:
-        if "k" in col.lower():
-            mapper[col] = "k"
-        if "d" in col.lower():
-            mapper[col] = "d"
-    return df.rename(columns=mapper)
+def stoch_rsi_k(series: pd.Series, length: int = 14) -> np.ndarray:
+    """%K line of Stoch-RSI(length, length, 3, 3), same values as pandas_ta's stochrsi."""
+    k, _ = kernels.stochrsi(series.to_numpy(dtype=float), length=length, rsi_length=length, k=3, d=3)
+    return k
 
-def last_cross_up(k: pd.Series) -> bool:
-    return k.iat[-2] < 20 and k.iat[-1] > 20
+def last_cross_up(k: np.ndarray) -> bool:
+    return k[-2] < 20 and k[-1] > 20
 
-def last_cross_dn(k: pd.Series) -> bool:
-    return k.iat[-2] > 80 and k.iat[-1] < 80
+def last_cross_dn(k: np.ndarray) -> bool:
+    return k[-2] > 80 and k[-1] < 80
 
 def fit_score(dist_pct: float, cross: bool) -> int:
     """Rough 0-100 heuristic for prioritising the cleanness of the setup."""
@@ -106,7 +97,7 @@ for sym in pairs:
     if len(d1) < EMA_DAILY_LEN + 5:
         continue
 
-    d1["ema200"] = ta.ema(d1["close"], length=EMA_DAILY_LEN)
+    d1["ema200"] = kernels.ema(d1["close"].to_numpy(dtype=float), EMA_DAILY_LEN, sma_seed=True)
     if pd.isna(d1["ema200"].iat[-1]) or pd.isna(d1["close"].iat[-1]):
         continue
 
@@ -116,26 +107,26 @@ for sym in pairs:
     bias_short = close_last < ema_last
 
     # momentum filter – 4 h Stoch-RSI
-    srsi4  = stoch_rsi(h4["close"])
-    srsi15 = stoch_rsi(m15["close"])
+    k4  = stoch_rsi_k(h4["close"])
+    k15 = stoch_rsi_k(m15["close"])
 
     # 15 m trigger – EMA-50 proximity & local Stoch-RSI
-    m15["ema50"] = ta.ema(m15["close"], length=EMA_FAST_15M)
+    m15["ema50"] = kernels.ema(m15["close"].to_numpy(dtype=float), EMA_FAST_15M, sma_seed=True)
     dist_pct     = (
         (m15["close"].iat[-1] - m15["ema50"].iat[-1]) / m15["close"].iat[-1] * 100
     )
 
     long_setup = (
         bias_long
-        and last_cross_up(srsi4["k"])
+        and last_cross_up(k4)
         and abs(dist_pct) <= PROXIMITY_PCT
-        and srsi15["k"].iat[-1] < 20
+        and k15[-1] < 20
     )
     short_setup = (
         bias_short
-        and last_cross_dn(srsi4["k"])
+        and last_cross_dn(k4)
         and abs(dist_pct) <= PROXIMITY_PCT
-        and srsi15["k"].iat[-1] > 80
+        and k15[-1] > 80
     )
 
     if not (long_setup or short_setup):
@@ -143,7 +134,8 @@ for sym in pairs:
 
     side  = "LONG" if long_setup else "SHORT"
     entry = float(m15["close"].iat[-1])
-    atr14 = ta.atr(m15["high"], m15["low"], m15["close"], length=14).iat[-1]
+    atr14 = kernels.atr(m15["high"].to_numpy(dtype=float), m15["low"].to_numpy(dtype=float),
+                        m15["close"].to_numpy(dtype=float), length=14)[-1]
 
     stop  = entry - 2 * atr14 if side == "LONG" else entry + 2 * atr14
     tgt   = (